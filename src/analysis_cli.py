@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+ResearchScope AI - Command Line
+Analyse one project description and stream progress as it happens, either
+in-process or against a running API server (see api_server.py).
+
+Progress and logs go to stderr; the final report (or JSON with --json) to
+stdout.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import sys
+from typing import Iterator, Optional
+from urllib.parse import urlsplit
+
+from analysis_events import ERROR, RESULT, STAGE_COMPLETED, STAGE_STARTED, TOKEN
+from analysis_result import AnalysisResult
+from keyword_extraction import MODES as KEYWORD_MODES
+from run_logging import configure_logging
+
+
+def local_events(description: str, mode: str, verbose: bool = False,
+                 keyword_mode: Optional[str] = None) -> Iterator[dict]:
+    """Run the analysis in this process and yield its events as dicts"""
+    from project_analysis_crew_fixed import iter_analysis_events
+
+    for event in iter_analysis_events(description, mode=mode, verbose=verbose or None,
+                                      keyword_mode=keyword_mode):
+        record = event.to_dict()
+        if event.type == RESULT:
+            record["result"] = event.data.to_dict()
+        yield record
+
+
+def remote_events(server: str, description: str, mode: str, timeout: float,
+                  keyword_mode: Optional[str] = None) -> Iterator[dict]:
+    """POST the analysis to an API server and yield the streamed events"""
+    url = urlsplit(server)
+    connection_class = http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+    connection = connection_class(url.hostname, url.port, timeout=timeout)
+    payload = {"description": description, "mode": mode}
+    if keyword_mode is not None:
+        payload["keyword_mode"] = keyword_mode
+    body = json.dumps(payload)
+    try:
+        connection.request("POST", url.path.rstrip("/") + "/analyze?stream=1", body=body,
+                           headers={"Content-Type": "application/json"})
+        response = connection.getresponse()
+        if response.status != 200:
+            detail = response.read().decode("utf-8", "replace")
+            retry = response.getheader("Retry-After")
+            hint = f" (retry after {retry}s)" if retry else ""
+            yield {"type": ERROR, "text": f"Server returned {response.status}{hint}: {detail}"}
+            return
+        for line in response:
+            if line.strip():
+                yield json.loads(line)
+    finally:
+        connection.close()
+
+
+def render(events: Iterator[dict], as_json: bool = False, show_tokens: bool = True) -> int:
+    """Print progress to stderr and the outcome to stdout; returns the exit code"""
+    streaming_tokens = False
+    for event in events:
+        kind = event.get("type")
+        if kind == TOKEN:
+            if show_tokens:
+                sys.stderr.write(event.get("text", ""))
+                sys.stderr.flush()
+                streaming_tokens = True
+            continue
+        if streaming_tokens:
+            sys.stderr.write("\n")
+            streaming_tokens = False
+
+        if kind == STAGE_STARTED:
+            print(f"🔄 {event.get('stage')}: {event.get('text')}", file=sys.stderr)
+        elif kind == STAGE_COMPLETED:
+            print(f"✅ {event.get('stage')} done", file=sys.stderr)
+        elif kind == ERROR:
+            print(f"❌ {event.get('text')}", file=sys.stderr)
+            return 1
+        elif kind == RESULT:
+            result = AnalysisResult.model_validate(event["result"])
+            print(result.to_json() if as_json else result.to_report())
+            return 0
+    print("❌ The analysis ended without a result", file=sys.stderr)
+    return 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyse a project description with ResearchScope AI")
+    parser.add_argument("description", nargs="?",
+                        help="Project description (default: read from --file or stdin)")
+    parser.add_argument("-f", "--file", help="Read the description from a file")
+    parser.add_argument("--mode", choices=("sequential", "parallel"), default="sequential",
+                        help="Analysis mode (default: sequential)")
+    parser.add_argument("--keyword-mode", choices=KEYWORD_MODES,
+                        help="Extract keywords with the LLM, locally, or locally when "
+                             "confident (default: KEYWORD_MODE or llm)")
+    parser.add_argument("--server", help="API server URL, e.g. http://127.0.0.1:8080; "
+                                         "runs in-process when omitted")
+    parser.add_argument("--timeout", type=float, default=900.0,
+                        help="Seconds to wait on the server connection (default: 900)")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    parser.add_argument("--quiet", action="store_true", help="Do not stream LLM tokens")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Log the agents' trace to stderr (in-process runs)")
+    args = parser.parse_args(argv)
+    # Plain lines suit a terminal; LOG_FORMAT=json still selects JSON
+    configure_logging(fmt=os.getenv("LOG_FORMAT", "text"))
+
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            description = f.read()
+    else:
+        description = args.description or sys.stdin.read()
+    if not description.strip():
+        parser.error("no project description given")
+
+    if args.server:
+        events = remote_events(args.server, description, args.mode, args.timeout,
+                               args.keyword_mode)
+    else:
+        events = local_events(description, args.mode, args.verbose, args.keyword_mode)
+    return render(events, as_json=args.json, show_tokens=not args.quiet)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+ResearchScope AI - Analysis Events
+Progress events emitted while an analysis runs: stage transitions, agent
+steps, tool results, LLM outputs and streamed tokens.
+
+Events are delivered through a LangChain callback handler registered on a
+context variable, so every chain, tool and LLM call made inside
+`emitting(on_event)` reports to that run's listener without touching the
+shared agents or LLM.
+"""
+
+import contextvars
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+
+STAGE_STARTED = "stage_started"
+STAGE_COMPLETED = "stage_completed"
+STEP = "step"
+TOOL_RESULT = "tool_result"
+LLM_OUTPUT = "llm_output"
+TOKEN = "token"
+RESULT = "result"
+ERROR = "error"
+
+# Stage names in pipeline order, with the agent that runs each of them
+STAGE_AGENTS = {
+    "keywords": "Keyword Extractor",
+    "research": "Research Agent",
+    "summary": "Summarization Expert",
+    "validation": "Validation Expert",
+}
+
+MAX_EVENT_TEXT = 2000
+
+
+@dataclass
+class AnalysisEvent:
+    type: str
+    stage: Optional[str] = None
+    text: str = ""
+    data: Any = None
+    timestamp: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict:
+        """JSON-friendly view of the event (data is included only if it is plain)"""
+        event = {"type": self.type, "stage": self.stage, "text": self.text,
+                 "timestamp": self.timestamp}
+        if isinstance(self.data, (dict, list, str, int, float, bool)):
+            event["data"] = self.data
+        return event
+
+
+class EventCallbackHandler(BaseCallbackHandler):
+    """Forwards LangChain agent, tool and LLM callbacks as AnalysisEvents"""
+
+    def __init__(self, on_event: Callable[[AnalysisEvent], None]):
+        self.on_event = on_event
+
+    def emit(self, type: str, text: str = "", data: Any = None,
+             stage: Optional[str] = None) -> None:
+        stage = stage or _current_stage.get()
+        try:
+            self.on_event(AnalysisEvent(type=type, stage=stage,
+                                        text=text[:MAX_EVENT_TEXT], data=data))
+        except Exception:
+            # A broken listener must never fail the analysis itself
+            pass
+
+    def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
+        self.emit(TOKEN, token)
+
+    def on_llm_end(self, response, **kwargs: Any) -> None:
+        generations = [g.text for gens in response.generations for g in gens]
+        self.emit(LLM_OUTPUT, "\n".join(generations))
+
+    def on_agent_action(self, action, **kwargs: Any) -> Any:
+        self.emit(STEP, action.log.strip(),
+                  data={"tool": action.tool, "tool_input": str(action.tool_input)})
+
+    def on_tool_end(self, output: Any, **kwargs: Any) -> None:
+        self.emit(TOOL_RESULT, str(output))
+
+    def on_agent_finish(self, finish, **kwargs: Any) -> None:
+        self.emit(STEP, str(finish.return_values.get("output", "")), data={"final": True})
+
+
+_event_handler: contextvars.ContextVar[Optional[EventCallbackHandler]] = contextvars.ContextVar(
+    "researchscope_event_handler", default=None
+)
+_current_stage: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "researchscope_current_stage", default=None
+)
+register_configure_hook(_event_handler, inheritable=True)
+
+
+@contextmanager
+def emitting(on_event: Optional[Callable[[AnalysisEvent], None]]):
+    """Deliver events for all work done in this context to on_event"""
+    if on_event is None:
+        yield None
+        return
+    token = _event_handler.set(EventCallbackHandler(on_event))
+    try:
+        yield _event_handler.get()
+    finally:
+        _event_handler.reset(token)
+
+
+@contextmanager
+def stage_scope():
+    """Keep stage changes made inside the block from outliving it"""
+    token = _current_stage.set(None)
+    try:
+        yield
+    finally:
+        _current_stage.reset(token)
+
+
+def emit(type: str, text: str = "", data: Any = None, stage: Optional[str] = None) -> None:
+    """Emit an event to the active listener, if any"""
+    handler = _event_handler.get()
+    if handler is not None:
+        handler.emit(type, text, data, stage)
+
+
+def current_stage() -> Optional[str]:
+    """The stage the calling context is working on, if any"""
+    return _current_stage.get()
+
+
+def start_stage(stage: str) -> None:
+    """Mark stage as the current stage for subsequent events and announce it"""
+    _current_stage.set(stage)
+    emit(STAGE_STARTED, STAGE_AGENTS.get(stage.split("[")[0], ""), stage=stage)
+
+
+def complete_stage(stage: str, output: str) -> None:
+    emit(STAGE_COMPLETED, str(output), stage=stage)
+
+
+def iter_events(fn: Callable[..., Any], *args, **kwargs) -> Iterator[AnalysisEvent]:
+    """Run fn(*args, on_event=..., **kwargs) on a thread and yield its events.
+
+    The last event is RESULT (with the return value in data) or ERROR.
+    """
+    events = queue.Queue()
+    done = object()
+
+    def run():
+        try:
+            result = fn(*args, on_event=events.put, **kwargs)
+            events.put(AnalysisEvent(type=RESULT, text=str(result)[:MAX_EVENT_TEXT], data=result))
+        except Exception as e:
+            events.put(AnalysisEvent(type=ERROR, text=str(e), data=e))
+        finally:
+            events.put(done)
+
+    thread = threading.Thread(target=run, name="analysis-events", daemon=True)
+    thread.start()
+    while True:
+        event = events.get()
+        if event is done:
+            break
+        yield event
+    thread.join()
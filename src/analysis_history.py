@@ -0,0 +1,264 @@
+"""
+ResearchScope AI - Analysis History
+Persistent store of every finished analysis: the result with its description
+hash, timings, cost and models, full-text indexed with SQLite FTS5 so earlier
+results can be found again instead of re-running the pipeline.
+"""
+
+import os
+import re
+import threading
+from typing import Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table, Text, func, select, text
+from sqlalchemy.exc import OperationalError
+
+from analysis_result import AnalysisResult
+from similarity_index import description_id
+from sqlite_store import SQLiteStore, env_flag
+
+DEFAULT_HISTORY_PATH = os.path.join(".cache", "history.db")
+DEFAULT_PAGE_SIZE = 10
+
+SEARCH_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+metadata = MetaData()
+
+analyses_table = Table(
+    "analyses",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("run_id", String(32), nullable=False, unique=True),
+    Column("description_hash", String(64), nullable=False, index=True),
+    Column("description", Text, nullable=False),
+    Column("mode", String(16), nullable=False),
+    Column("models", Text, nullable=False, default=""),
+    Column("created_at", Float, nullable=False, index=True),
+    Column("seconds", Float),
+    Column("cost_usd", Float),
+    Column("keywords", Text, nullable=False, default=""),
+    Column("papers", Integer, nullable=False, default=0),
+    Column("gaps", Integer, nullable=False, default=0),
+    Column("result", Text, nullable=False),
+)
+
+# Contentless: the text lives in analyses (and its result JSON), the FTS table
+# keeps only the index, keyed by analyses.id. Terms are not stemmed, so a
+# partial word typed into the search box is a prefix of the indexed word
+# ("optimiz" of "optimization"); prefix indexes keep short prefixes fast.
+FTS_SPEC = "description, keywords, summary, papers, content='', tokenize='unicode61', prefix='2 3'"
+FTS_DDL = f"CREATE VIRTUAL TABLE IF NOT EXISTS analyses_fts USING fts5({FTS_SPEC})"
+
+# What a history listing shows; the stored result is loaded on demand by get()
+LISTING_COLUMNS = [
+    analyses_table.c.run_id,
+    analyses_table.c.description_hash,
+    analyses_table.c.description,
+    analyses_table.c.mode,
+    analyses_table.c.models,
+    analyses_table.c.created_at,
+    analyses_table.c.seconds,
+    analyses_table.c.cost_usd,
+    analyses_table.c.keywords,
+    analyses_table.c.papers,
+    analyses_table.c.gaps,
+]
+
+
+class HistoryEntry(NamedTuple):
+    """One stored analysis, without its full result"""
+
+    run_id: str
+    description_hash: str
+    description: str
+    mode: str
+    models: str
+    created_at: float
+    seconds: Optional[float]
+    cost_usd: Optional[float]
+    keywords: str
+    papers: int
+    gaps: int
+
+
+class HistoryPage(NamedTuple):
+    entries: List[HistoryEntry]
+    total: int
+    offset: int
+    limit: int
+
+    @property
+    def has_more(self) -> bool:
+        return self.offset + len(self.entries) < self.total
+
+
+def match_expression(query: str) -> str:
+    """An FTS5 MATCH expression for free text: every word must match, the last as a prefix.
+
+    Words are quoted, so operators and punctuation in the input are never
+    interpreted as FTS5 syntax.
+    """
+    words = SEARCH_TOKEN.findall(query)
+    if not words:
+        return ""
+    quoted = [f'"{word}"' for word in words]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+class AnalysisHistory(SQLiteStore):
+    """Analysis results in SQLite with a full-text index over their content.
+
+    Descriptions, keywords, summaries and paper titles are searchable;
+    results are listed newest first, or by relevance when searching. Where
+    SQLite was built without FTS5, search falls back to substring matching
+    on descriptions and keywords.
+    """
+
+    metadata = metadata
+    pragmas = ("journal_mode=WAL",)
+
+    def __init__(self, path: str = DEFAULT_HISTORY_PATH, enabled: bool = True):
+        super().__init__(path, enabled)
+        self.fts = False
+        self._lock = threading.Lock()
+        if not enabled:
+            return
+        try:
+            with self.engine.begin() as conn:
+                self._create_fts(conn)
+            self.fts = True
+        except OperationalError:
+            self.fts = False
+
+    def _create_fts(self, conn) -> None:
+        """Create the full-text index, rebuilding one made with other options"""
+        existing = conn.exec_driver_sql(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'analyses_fts'"
+        ).scalar()
+        if existing is not None and FTS_SPEC in existing:
+            return
+        if existing is not None:
+            conn.exec_driver_sql("DROP TABLE analyses_fts")
+        conn.exec_driver_sql(FTS_DDL)
+        rows = conn.execute(select(analyses_table.c.id, analyses_table.c.description,
+                                   analyses_table.c.keywords, analyses_table.c.result))
+        for row in rows.all():
+            self._index(conn, row.id, row.description, row.keywords,
+                        AnalysisResult.from_stored(row.result))
+
+    @staticmethod
+    def _index(conn, row_id: int, description: str, keywords: str,
+               result: AnalysisResult) -> None:
+        conn.execute(
+            text("INSERT INTO analyses_fts(rowid, description, keywords, summary, papers) "
+                 "VALUES (:rowid, :description, :keywords, :summary, :papers)"),
+            {
+                "rowid": row_id,
+                "description": description,
+                "keywords": keywords,
+                "summary": result.summary,
+                "papers": "\n".join(paper.title for paper in result.papers),
+            },
+        )
+
+    @classmethod
+    def from_env(cls) -> "AnalysisHistory":
+        """Build a history store from the ANALYSIS_HISTORY_* environment variables"""
+        return cls(
+            path=os.getenv("ANALYSIS_HISTORY_PATH", DEFAULT_HISTORY_PATH),
+            enabled=not env_flag("ANALYSIS_HISTORY_BYPASS"),
+        )
+
+    def add(self, description: str, result: AnalysisResult, models: Iterable[str] = (),
+            seconds: Optional[float] = None, cost_usd: Optional[float] = None) -> None:
+        """Store a finished analysis (once per run id) and index it for search"""
+        if not self.enabled or not result.run_id:
+            return
+        keywords = ", ".join(result.keywords)
+        with self._lock, self.engine.begin() as conn:
+            exists = conn.execute(
+                select(analyses_table.c.id).where(analyses_table.c.run_id == result.run_id)
+            ).first()
+            if exists is not None:
+                return
+            row_id = conn.execute(analyses_table.insert().values(
+                run_id=result.run_id,
+                description_hash=description_id(description),
+                description=description,
+                mode=result.mode,
+                models=",".join(models),
+                created_at=result.created_at,
+                seconds=seconds,
+                cost_usd=cost_usd,
+                keywords=keywords,
+                papers=len(result.papers),
+                gaps=len(result.gaps),
+                result=result.to_json(),
+            )).inserted_primary_key[0]
+            if self.fts:
+                self._index(conn, row_id, description, keywords, result)
+
+    def get(self, run_id: str) -> Optional[AnalysisResult]:
+        """The stored result of a run, or None"""
+        if not self.enabled:
+            return None
+        with self.engine.connect() as conn:
+            stored = conn.execute(
+                select(analyses_table.c.result).where(analyses_table.c.run_id == run_id)
+            ).scalar()
+        return AnalysisResult.from_stored(stored) if stored is not None else None
+
+    def find(self, description: str, limit: int = 5) -> List[HistoryEntry]:
+        """Earlier analyses of this exact description (ignoring whitespace), newest first"""
+        if not self.enabled:
+            return []
+        statement = (
+            select(*LISTING_COLUMNS)
+            .where(analyses_table.c.description_hash == description_id(description))
+            .order_by(analyses_table.c.created_at.desc())
+            .limit(limit)
+        )
+        with self.engine.connect() as conn:
+            return [HistoryEntry(*row) for row in conn.execute(statement)]
+
+    def page(self, offset: int = 0, limit: int = DEFAULT_PAGE_SIZE,
+             query: Optional[str] = None) -> HistoryPage:
+        """One page of the history, newest first, or the best matches for query.
+
+        Only the listing columns are read; call get() for an entry's result.
+        """
+        if not self.enabled:
+            return HistoryPage([], 0, offset, limit)
+        statement = select(*LISTING_COLUMNS)
+        count = select(func.count()).select_from(analyses_table)
+        expression = match_expression(query or "")
+
+        if expression and self.fts:
+            matches = text("SELECT rowid, rank FROM analyses_fts WHERE analyses_fts MATCH :query") \
+                .columns(rowid=Integer, rank=Float).subquery("matches")
+            statement = statement.join(matches, matches.c.rowid == analyses_table.c.id) \
+                .order_by(matches.c.rank, analyses_table.c.created_at.desc())
+            count = select(func.count()).select_from(matches)
+            params = {"query": expression}
+        else:
+            if query and query.strip():
+                pattern = f"%{query.strip()}%"
+                condition = analyses_table.c.description.like(pattern) \
+                    | analyses_table.c.keywords.like(pattern)
+                statement = statement.where(condition)
+                count = count.where(condition)
+            statement = statement.order_by(analyses_table.c.created_at.desc(),
+                                           analyses_table.c.id.desc())
+            params = {}
+
+        with self.engine.connect() as conn:
+            total = conn.execute(count, params).scalar()
+            rows = conn.execute(statement.offset(offset).limit(limit), params).all()
+        return HistoryPage([HistoryEntry(*row) for row in rows], total, offset, limit)
+
+    def __len__(self) -> int:
+        if not self.enabled:
+            return 0
+        with self.engine.connect() as conn:
+            return conn.execute(select(func.count()).select_from(analyses_table)).scalar()
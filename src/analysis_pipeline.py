@@ -0,0 +1,165 @@
+"""
+ResearchScope AI - Analysis Pipeline
+Reusable entry point for running many analyses at once: a fixed pool of
+isolated agent sets, each with its crew tasks prebuilt, handed to one
+analysis at a time, with pool utilisation and queue wait statistics.
+"""
+
+import queue
+import statistics
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, NamedTuple, Optional
+
+from project_analysis_crew_fixed import analyze_project, build_task_templates, create_agents
+
+DEFAULT_POOL_SIZE = 2
+WAIT_HISTORY = 1000
+
+
+class PoolTimeout(RuntimeError):
+    """No agent set became free within the requested time"""
+
+
+class AgentSet(NamedTuple):
+    """One isolated set of crew agents and the tasks prebuilt for them"""
+
+    agents: Dict[str, Any]
+    templates: Dict[str, Any]
+
+
+class AnalysisPipeline:
+    """Runs analyses on a pool of isolated agent sets.
+
+    CrewAI agents keep executor state (current task, tools, callbacks) while
+    they run, so two analyses must never share a set. Each analysis checks
+    one set out for its whole run; callers beyond `size` wait in line for a
+    free one. Sets are built lazily up to `size` (or all at once by
+    prewarm()) and reused, with their tasks prebuilt, so a run only formats
+    prompts instead of rebuilding agents and tasks.
+
+    The pipeline is thread-safe. It is not shared across processes: give
+    each worker process its own, e.g. from a ProcessPoolExecutor initializer.
+
+    Args:
+        size: Number of agent sets, i.e. analyses that can run at once.
+        agents_factory: Builds one agent set (default: create_agents(), with
+            each agent's model routed by role).
+    """
+
+    def __init__(self, size: int = DEFAULT_POOL_SIZE,
+                 agents_factory: Optional[Callable[[], Dict[str, Any]]] = None):
+        if size < 1:
+            raise ValueError("AnalysisPipeline needs a pool size of at least 1")
+        self.size = size
+        self.agents_factory = agents_factory or create_agents
+        self._idle: "queue.LifoQueue[AgentSet]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._runs = 0
+        self._busy_seconds = 0.0
+        self._waits = deque(maxlen=WAIT_HISTORY)
+        self._started = time.monotonic()
+
+    def _build(self) -> AgentSet:
+        agents = self.agents_factory()
+        return AgentSet(agents, build_task_templates(agents))
+
+    def prewarm(self) -> "AnalysisPipeline":
+        """Build every agent set now instead of on first use"""
+        while True:
+            with self._lock:
+                if self._created >= self.size:
+                    return self
+                self._created += 1
+            try:
+                self._idle.put(self._build())
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+    def _acquire(self, timeout: Optional[float]) -> AgentSet:
+        with self._lock:
+            build = self._idle.empty() and self._created < self.size
+            if build:
+                self._created += 1
+        if build:
+            try:
+                return self._build()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        return self._idle.get(timeout=timeout)
+
+    @contextmanager
+    def agent_set(self, timeout: Optional[float] = None) -> Iterator[AgentSet]:
+        """Check out an agent set for the duration of the block.
+
+        Raises PoolTimeout if none is free within timeout seconds (None waits
+        as long as it takes).
+        """
+        requested = time.monotonic()
+        with self._lock:
+            self._waiting += 1
+        try:
+            agent_set = self._acquire(timeout)
+        except queue.Empty:
+            raise PoolTimeout(f"No agent set free within {timeout}s") from None
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+        acquired = time.monotonic()
+        with self._lock:
+            self._in_use += 1
+            self._waits.append(acquired - requested)
+        try:
+            yield agent_set
+        finally:
+            with self._lock:
+                self._in_use -= 1
+                self._runs += 1
+                self._busy_seconds += time.monotonic() - acquired
+            self._idle.put(agent_set)
+
+    def analyze(self, project_description: str, timeout: Optional[float] = None, **kwargs):
+        """analyze_project on a pooled agent set; kwargs are passed through"""
+        with self.agent_set(timeout) as agent_set:
+            return analyze_project(project_description, agents=agent_set.agents,
+                                   task_templates=agent_set.templates, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size and occupancy, utilisation since creation and queue wait times.
+
+        utilisation is the share of the pool's capacity (size x elapsed time)
+        spent running finished analyses. Queue waits include building a set
+        on first use unless the pipeline was prewarmed.
+        """
+        with self._lock:
+            waits = sorted(self._waits)
+            elapsed = time.monotonic() - self._started
+            stats = {
+                "size": self.size,
+                "created": self._created,
+                "in_use": self._in_use,
+                "waiting": self._waiting,
+                "runs": self._runs,
+                "utilisation": round(self._busy_seconds / (self.size * elapsed), 4) if elapsed else 0.0,
+            }
+
+        def at(fraction):
+            return round(waits[min(len(waits) - 1, int(fraction * len(waits)))], 6) if waits else 0.0
+
+        stats["queue_wait_seconds"] = {
+            "mean": round(statistics.fmean(waits), 6) if waits else 0.0,
+            "p50": at(0.5),
+            "p95": at(0.95),
+            "max": round(waits[-1], 6) if waits else 0.0,
+        }
+        return stats
@@ -0,0 +1,156 @@
+"""
+ResearchScope AI - Analysis Result
+Typed result of one analysis: keywords, papers, summary, validation gaps and
+per-stage metadata, parsed once where the analysis runs so callers do not
+have to scan the report text.
+"""
+
+import hashlib
+import json
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+try:
+    import msgpack
+except ImportError:  # optional: only needed for to_msgpack/from_msgpack
+    msgpack = None
+
+# Validation lines that name a gap rather than a confirmed requirement
+GAP_HINT = re.compile(
+    r"\b(gaps?|missing|lacks?|lacking|not (?:yet )?(?:addressed|covered|supported|mentioned)"
+    r"|unclear|unaddressed|absent|insufficient|limitations?)\b",
+    re.IGNORECASE,
+)
+LIST_ITEM = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+(.*\S)")
+
+# Fields that describe one particular run, not what was found
+RUN_FIELDS = {"run_id", "created_at", "stages"}
+
+
+class Paper(BaseModel):
+    title: str
+    snippet: str = ""
+    query: Optional[str] = None
+    url: Optional[str] = None
+    doi: Optional[str] = None
+    source: Optional[str] = None
+
+
+class StageInfo(BaseModel):
+    seconds: float = 0.0
+    output_chars: int = 0
+    reused: bool = False
+
+
+class AnalysisResult(BaseModel):
+    """Outcome of analyze_project.
+
+    str(result) renders the plain-text report, so code that treated the old
+    string result as text keeps working.
+    """
+
+    run_id: Optional[str] = None
+    mode: str = "sequential"
+    created_at: float = Field(default_factory=time.time)
+    keywords: List[str] = Field(default_factory=list)
+    papers: List[Paper] = Field(default_factory=list)
+    summary: str = ""
+    validation: str = ""
+    gaps: List[str] = Field(default_factory=list)
+    stages: Dict[str, StageInfo] = Field(default_factory=dict)
+
+    def __str__(self) -> str:
+        return self.to_report()
+
+    def to_report(self) -> str:
+        sections = []
+        if self.summary:
+            sections.append(f"Research Summary:\n{self.summary}")
+        if self.validation:
+            sections.append(f"Validation:\n{self.validation}")
+        return "\n\n".join(sections)
+
+    @property
+    def reused_stages(self) -> List[str]:
+        """Stages whose output came from an earlier analysis"""
+        return [name for name, info in self.stages.items() if info.reused]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self.model_dump(exclude_defaults=True)
+
+    def to_json(self) -> str:
+        """Compact JSON; fields left at their defaults are omitted"""
+        return self.model_dump_json(exclude_defaults=True)
+
+    @classmethod
+    def from_json(cls, data) -> "AnalysisResult":
+        return cls.model_validate_json(data)
+
+    def to_msgpack(self) -> bytes:
+        if msgpack is None:
+            raise ImportError("msgpack is not installed; run `pip install msgpack`")
+        return msgpack.packb(self.model_dump(mode="json", exclude_defaults=True))
+
+    @classmethod
+    def from_msgpack(cls, data: bytes) -> "AnalysisResult":
+        if msgpack is None:
+            raise ImportError("msgpack is not installed; run `pip install msgpack`")
+        return cls.model_validate(msgpack.unpackb(data))
+
+    @classmethod
+    def from_stored(cls, text: str) -> "AnalysisResult":
+        """Load a stored result, accepting plain-text reports from older versions"""
+        try:
+            return cls.from_json(text)
+        except ValueError:
+            return cls(validation=text)
+
+    def content(self) -> Dict[str, Any]:
+        """The findings only, without run id, timestamps or timings"""
+        return self.model_dump(mode="json", exclude=RUN_FIELDS)
+
+    def fingerprint(self) -> str:
+        """Hash of content(): equal for two runs that found the same things"""
+        canonical = json.dumps(self.content(), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def diff(self, other: "AnalysisResult") -> Dict[str, Any]:
+        """Content fields that differ from other; list fields as added/removed items"""
+        mine, theirs = self.content(), other.content()
+        changes = {}
+        for name, value in mine.items():
+            if value == theirs.get(name):
+                continue
+            if isinstance(value, list):
+                old = [json.dumps(item, sort_keys=True) for item in theirs.get(name) or []]
+                new = [json.dumps(item, sort_keys=True) for item in value]
+                changes[name] = {
+                    "added": [json.loads(item) for item in new if item not in old],
+                    "removed": [json.loads(item) for item in old if item not in new],
+                }
+            else:
+                changes[name] = {"old": theirs.get(name), "new": value}
+        return changes
+
+
+def extract_gaps(validation: str) -> List[str]:
+    """List items of a validation report that describe gaps.
+
+    Items following a line that mentions gaps (or missing/unaddressed points)
+    are all taken; elsewhere only items that mention a gap themselves are.
+    """
+    gaps = []
+    in_gap_section = False
+    for line in validation.splitlines():
+        item = LIST_ITEM.match(line)
+        if item is None:
+            if line.strip():
+                in_gap_section = bool(GAP_HINT.search(line))
+            continue
+        text = item.group(1).replace("**", "").strip()
+        if (in_gap_section or GAP_HINT.search(text)) and text not in gaps:
+            gaps.append(text)
+    return gaps
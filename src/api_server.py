@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+ResearchScope AI - API Server
+Headless HTTP/1.1 service exposing analyze_project for programmatic clients.
+
+Endpoints:
+    POST /analyze   {"description": "...", "mode": "sequential"|"parallel",
+                     "verbose": true|false, "keyword_mode": "llm"|"local"|"auto"}
+                    Returns the AnalysisResult as JSON. With ?stream=1 the
+                    response is chunked NDJSON (HTTP/1.1): one progress
+                    event per line, ending with a "result" or "error" event.
+                    verbose logs the run's agent trace in the server log;
+                    keyword_mode overrides KEYWORD_MODE for the run.
+    GET  /healthz   Liveness plus current load and agent pool stats, for load
+                    balancer checks.
+
+Connections are handled with asyncio and kept alive between requests. At most
+`concurrency` analyses run at once; requests beyond that are rejected with
+429 and a Retry-After estimate instead of queueing unboundedly, so a load
+balancer can send them to another instance. The server keeps no state
+between requests.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import statistics
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from analysis_events import ERROR, RESULT
+from analysis_pipeline import AnalysisPipeline
+from keyword_extraction import MODES as KEYWORD_MODES
+from run_logging import configure_logging
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_CONCURRENCY = 2
+DEFAULT_ANALYSIS_TIMEOUT = 600.0
+DEFAULT_IDLE_TIMEOUT = 15.0
+DEFAULT_HEADER_TIMEOUT = 10.0
+MAX_BODY_BYTES = 1024 * 1024
+MAX_HEADER_LINES = 100
+MODES = ("sequential", "parallel")
+
+
+class HTTPError(Exception):
+    def __init__(self, status: HTTPStatus, message: str = "", headers: Optional[Dict[str, str]] = None):
+        super().__init__(message or status.phrase)
+        self.status = status
+        self.headers = headers or {}
+
+
+class AnalysisServer:
+    """asyncio HTTP server running analyses on a bounded worker pool.
+
+    Args:
+        concurrency: Analyses running at once (one worker thread and agent set each).
+        analysis_timeout: Seconds before a request gets 504. The analysis
+            itself cannot be interrupted; its slot frees up when it ends.
+        idle_timeout: Seconds an idle keep-alive connection is held open.
+        agents_factory: Builds one pooled agent set (see AnalysisPipeline).
+    """
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        analysis_timeout: float = DEFAULT_ANALYSIS_TIMEOUT,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        agents_factory: Optional[Callable[[], dict]] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.concurrency = concurrency
+        self.analysis_timeout = analysis_timeout
+        self.idle_timeout = idle_timeout
+        self.pipeline = AnalysisPipeline(size=concurrency, agents_factory=agents_factory)
+        self.in_flight = 0
+        self._durations = deque(maxlen=50)
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="api-analysis")
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self._executor.shutdown(wait=False)
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely free: the typical analysis time"""
+        if not self._durations:
+            return 5
+        return max(1, math.ceil(statistics.median(self._durations)))
+
+    # --- Connection handling ---
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HTTPError as e:
+                    await self._send_json(writer, e.status, {"error": str(e)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+
+                method, target, headers, body, keep_alive = request
+                try:
+                    keep_alive = await self._dispatch(writer, method, target, body, keep_alive) and keep_alive
+                except HTTPError as e:
+                    await self._send_json(writer, e.status, {"error": str(e)}, keep_alive, e.headers)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple]:
+        """Parse one request; None when the client closed or idled out"""
+        try:
+            line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+        except asyncio.TimeoutError:
+            return None
+        if not line:
+            return None
+
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+
+        headers = {}
+        for _ in range(MAX_HEADER_LINES + 1):
+            try:
+                line = await asyncio.wait_for(reader.readline(), DEFAULT_HEADER_TIMEOUT)
+            except asyncio.TimeoutError:
+                raise HTTPError(HTTPStatus.REQUEST_TIMEOUT)
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+
+        if "transfer-encoding" in headers:
+            raise HTTPError(HTTPStatus.NOT_IMPLEMENTED, "Chunked request bodies are not supported")
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        try:
+            body = await asyncio.wait_for(reader.readexactly(length), DEFAULT_HEADER_TIMEOUT) if length else b""
+        except asyncio.TimeoutError:
+            raise HTTPError(HTTPStatus.REQUEST_TIMEOUT)
+
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.0":
+            keep_alive = connection == "keep-alive"
+        else:
+            keep_alive = connection != "close"
+        return method.upper(), target, headers, body, keep_alive
+
+    async def _dispatch(self, writer, method: str, target: str, body: bytes, keep_alive: bool) -> bool:
+        """Handle a request; returns False if the connection must be closed"""
+        url = urlsplit(target)
+        if url.path == "/healthz":
+            if method != "GET":
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED)
+            await self._send_json(writer, HTTPStatus.OK, {
+                "status": "ok", "in_flight": self.in_flight, "concurrency": self.concurrency,
+                "pool": self.pipeline.stats(),
+            }, keep_alive)
+            return True
+
+        if url.path != "/analyze":
+            raise HTTPError(HTTPStatus.NOT_FOUND)
+        if method != "POST":
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED)
+
+        try:
+            payload = json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Body must be JSON")
+        description = (payload.get("description") or "").strip() if isinstance(payload, dict) else ""
+        mode = payload.get("mode", "sequential") if isinstance(payload, dict) else ""
+        verbose = payload.get("verbose") if isinstance(payload, dict) else None
+        keyword_mode = payload.get("keyword_mode") if isinstance(payload, dict) else None
+        if not description:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "description is required")
+        if mode not in MODES:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"mode must be one of {', '.join(MODES)}")
+        if verbose is not None and not isinstance(verbose, bool):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "verbose must be true or false")
+        if keyword_mode is not None and keyword_mode not in KEYWORD_MODES:
+            raise HTTPError(HTTPStatus.BAD_REQUEST,
+                            f"keyword_mode must be one of {', '.join(KEYWORD_MODES)}")
+
+        stream = parse_qs(url.query).get("stream", ["0"])[0] in ("1", "true")
+        if stream:
+            await self._stream_analysis(writer, description, mode, verbose, keyword_mode)
+            return True
+        result = await self._run_analysis(description, mode, verbose, keyword_mode)
+        await self._send_json(writer, HTTPStatus.OK, result.to_dict(), keep_alive)
+        return True
+
+    # --- Analyses ---
+
+    def _admit(self) -> None:
+        """Take a worker slot or reject the request with 429"""
+        if self.in_flight >= self.concurrency:
+            raise HTTPError(
+                HTTPStatus.TOO_MANY_REQUESTS,
+                "All analysis workers are busy",
+                {"Retry-After": str(self.retry_after())},
+            )
+        self.in_flight += 1
+
+    def _submit(self, description: str, mode: str, verbose: Optional[bool] = None,
+                keyword_mode: Optional[str] = None, on_event=None) -> asyncio.Future:
+        """Run an analysis on the pool; its slot is released when it really ends"""
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+
+        def run():
+            return self.pipeline.analyze(description, mode=mode, on_event=on_event, verbose=verbose,
+                                         keyword_mode=keyword_mode)
+
+        def finished(_future):
+            def release():
+                self.in_flight -= 1
+                self._durations.append(time.monotonic() - started)
+            loop.call_soon_threadsafe(release)
+
+        future = loop.run_in_executor(self._executor, run)
+        future.add_done_callback(finished)
+        return future
+
+    async def _run_analysis(self, description: str, mode: str, verbose: Optional[bool] = None,
+                            keyword_mode: Optional[str] = None):
+        self._admit()
+        future = self._submit(description, mode, verbose, keyword_mode)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self.analysis_timeout)
+        except asyncio.TimeoutError:
+            raise HTTPError(HTTPStatus.GATEWAY_TIMEOUT, "Analysis timed out")
+        except Exception as e:
+            raise HTTPError(HTTPStatus.BAD_GATEWAY, f"Analysis failed: {e}")
+
+    async def _stream_analysis(self, writer, description: str, mode: str,
+                               verbose: Optional[bool] = None,
+                               keyword_mode: Optional[str] = None) -> None:
+        self._admit()
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+        future = self._submit(description, mode, verbose, keyword_mode,
+                              on_event=lambda event: loop.call_soon_threadsafe(events.put_nowait, event))
+        future.add_done_callback(lambda _f: events.put_nowait(None))
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: application/x-ndjson\r\n"
+            b"Transfer-Encoding: chunked\r\n"
+            b"Cache-Control: no-cache\r\n\r\n"
+        )
+        deadline = loop.time() + self.analysis_timeout
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(events.get(), max(0.0, deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    await self._write_chunk(writer, {"type": ERROR, "text": "Analysis timed out"})
+                    break
+                if event is None:
+                    error = future.exception()
+                    if error is not None:
+                        final = {"type": ERROR, "text": str(error)}
+                    else:
+                        result = future.result()
+                        final = {"type": RESULT, "text": "", "result": result.to_dict()}
+                    await self._write_chunk(writer, final)
+                    break
+                await self._write_chunk(writer, event.to_dict())
+        finally:
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+
+    # --- Responses ---
+
+    @staticmethod
+    async def _write_chunk(writer, record: dict) -> None:
+        data = (json.dumps(record, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+        writer.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        await writer.drain()
+
+    async def _send_json(self, writer, status: HTTPStatus, payload: dict, keep_alive: bool,
+                         headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        lines = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+        ]
+        if keep_alive:
+            lines += ["Connection: keep-alive", f"Keep-Alive: timeout={int(self.idle_timeout)}"]
+        else:
+            lines.append("Connection: close")
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve ResearchScope AI analyses over HTTP")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Bind address (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Analyses running at once; more get 429 (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_ANALYSIS_TIMEOUT,
+                        help=f"Seconds before an analysis request gets 504 (default: {DEFAULT_ANALYSIS_TIMEOUT:g})")
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT,
+                        help=f"Seconds idle keep-alive connections stay open (default: {DEFAULT_IDLE_TIMEOUT:g})")
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    server = AnalysisServer(
+        host=args.host,
+        port=args.port,
+        concurrency=args.concurrency,
+        analysis_timeout=args.timeout,
+        idle_timeout=args.idle_timeout,
+    )
+
+    async def serve():
+        await server.start()
+        print(f"🚀 ResearchScope AI API on http://{server.host}:{server.port} "
+              f"(concurrency {server.concurrency})", file=sys.stderr)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        print("\n👋 Server stopped", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
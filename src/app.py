@@ -1,12 +1,18 @@
 import streamlit as st
 import os
+from datetime import datetime
 from dotenv import load_dotenv
-from project_analysis_crew_fixed import analyze_project
-import time
+from job_queue import DONE, FAILED, JobQueue
+from project_analysis_crew_fixed import get_analysis_history, prewarm
+from analysis_events import (
+    ERROR, RESULT, STAGE_AGENTS, STAGE_COMPLETED, STAGE_STARTED, STEP, TOKEN, TOOL_RESULT
+)
 
 # Load environment variables from .env file
 load_dotenv()
 
+HISTORY_PAGE_SIZE = 10
+
 # Page configuration
 st.set_page_config(
     page_title="ResearchScope AI - Intelligent Project Analysis",
@@ -76,6 +82,117 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_job_queue():
+    """One worker pool shared by every session of this Streamlit server"""
+    # Build the LLM client, tools and agents once per server, not per rerun
+    prewarm()
+    return JobQueue(max_workers=int(os.getenv("ANALYSIS_WORKERS", "2")))
+
+def run_analysis_with_progress(job_id):
+    """Follow a queued analysis, rendering live per-agent status and partial output"""
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+    
+    # One status line per agent
+    stage_status = {}
+    for stage, agent in STAGE_AGENTS.items():
+        stage_status[stage] = st.empty()
+        stage_status[stage].markdown(f"⏳ **{agent}** - waiting")
+    
+    with st.expander("🔴 Live agent output", expanded=True):
+        live_output = st.empty()
+    
+    completed = set()
+    partial_output = ""
+    for event in get_job_queue().iter_events(job_id):
+        stage = (event.stage or "").split("[")[0]
+        agent = STAGE_AGENTS.get(stage, "")
+        
+        if event.type == STAGE_STARTED and stage in stage_status:
+            stage_status[stage].markdown(f"🔄 **{agent}** - working...")
+            status_text.text(f"{agent} is working...")
+            partial_output = ""
+        elif event.type == STAGE_COMPLETED and stage in stage_status:
+            completed.add(stage)
+            stage_status[stage].markdown(f"✅ **{agent}** - done")
+            progress_bar.progress(int(100 * len(completed) / len(STAGE_AGENTS)))
+        elif event.type in (STEP, TOOL_RESULT):
+            partial_output = event.text
+            live_output.text(partial_output)
+        elif event.type == TOKEN:
+            partial_output += event.text
+            live_output.text(partial_output)
+        elif event.type == ERROR:
+            raise RuntimeError(event.text)
+        elif event.type == RESULT:
+            progress_bar.progress(100)
+            status_text.text("✅ Analysis complete!")
+            return event.data
+
+def show_result(result):
+    """Make result the one shown, and render its report text once"""
+    st.session_state.analysis_result = result
+    st.session_state.analysis_report = result.to_report()
+
+def open_history_entry(run_id):
+    """Button callback: load a stored analysis (only now is its full result read) and show it"""
+    result = get_analysis_history().get(run_id)
+    if result is None:
+        st.error("❌ That analysis is no longer in the history")
+        return
+    show_result(result)
+
+def set_history_page(page_number):
+    st.session_state.history_page = page_number
+
+def format_time(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M")
+
+def render_history():
+    """Searchable history of earlier analyses, one page at a time"""
+    st.markdown("---")
+    st.header("🗂️ Analysis History")
+    
+    query = st.text_input(
+        "Search earlier analyses:",
+        placeholder="Words from the description, keywords, summary or paper titles...",
+        key="history_query"
+    )
+    # A new search starts again from its first page
+    if st.session_state.get("history_last_query") != query:
+        st.session_state.history_last_query = query
+        st.session_state.history_page = 0
+    page_number = st.session_state.get("history_page", 0)
+    
+    page = get_analysis_history().page(
+        offset=page_number * HISTORY_PAGE_SIZE, limit=HISTORY_PAGE_SIZE, query=query
+    )
+    if not page.entries:
+        st.info("No matching analyses" if query else "No analyses stored yet")
+        return
+    
+    st.caption(f"Showing {page.offset + 1}-{page.offset + len(page.entries)} of {page.total}")
+    for entry in page.entries:
+        title = next((line.strip() for line in entry.description.splitlines() if line.strip()), "")
+        details = [format_time(entry.created_at), entry.mode, f"{entry.papers} papers"]
+        if entry.seconds is not None:
+            details.append(f"{entry.seconds:.0f}s")
+        if entry.models:
+            details.append(entry.models)
+        
+        text_col, action_col = st.columns([6, 1])
+        text_col.markdown(f"**{title[:120]}**  \n{entry.keywords}")
+        text_col.caption(" · ".join(details))
+        action_col.button("Open", key=f"history_open_{entry.run_id}",
+                          on_click=open_history_entry, args=(entry.run_id,))
+    
+    previous_col, _, next_col = st.columns([1, 4, 1])
+    previous_col.button("⬅️ Previous", disabled=page_number == 0, key="history_previous",
+                        on_click=set_history_page, args=(page_number - 1,))
+    next_col.button("Next ➡️", disabled=not page.has_more, key="history_next",
+                    on_click=set_history_page, args=(page_number + 1,))
+
 def main():
     # Header
     st.markdown('<h1 class="main-header">🔬 ResearchScope AI</h1>', unsafe_allow_html=True)
@@ -169,51 +286,67 @@ def main():
             key="project_description"
         )
         
+        # Point at an earlier run of the same description before it is re-run
+        previous = get_analysis_history().find(project_description) if project_description.strip() else []
+        if previous:
+            st.info(f"📂 This description was already analysed on {format_time(previous[0].created_at)}")
+            st.button("Open previous result", on_click=open_history_entry,
+                      args=(previous[0].run_id,))
+        
         # Analysis button
         if st.button("🚀 Start Analysis", type="primary", use_container_width=True):
             if not project_description.strip():
                 st.error("❌ Please enter a project description")
             else:
-                with st.spinner("🤖 AI agents are analyzing your project..."):
-                    try:
-                        # Create progress indicators
-                        progress_bar = st.progress(0)
-                        status_text = st.empty()
-                        
-                        # Simulate progress updates
-                        for i, step in enumerate(["Extracting keywords...", "Researching papers...", "Summarizing findings...", "Validating results..."]):
-                            status_text.text(step)
-                            progress_bar.progress((i + 1) * 25)
-                            time.sleep(0.5)
-                        
-                        # Perform the actual analysis
-                        result = analyze_project(project_description)
-                        
-                        progress_bar.progress(100)
-                        status_text.text("✅ Analysis complete!")
-                        
-                        # Store result in session state
-                        st.session_state.analysis_result = result
-                        st.rerun()
-                        
-                    except Exception as e:
-                        st.error(f"❌ Error during analysis: {str(e)}")
-                        st.error("Please check your API key and try again.")
+                # Jobs run on the shared worker pool; the id survives a page refresh
+                job_id = get_job_queue().submit(project_description)
+                st.session_state.job_id = job_id
+                st.experimental_set_query_params(job=job_id)
+        
+        # Follow a running job, including one started before a refresh
+        job_id = st.session_state.get("job_id") or st.experimental_get_query_params().get("job", [None])[0]
+        job = get_job_queue().get(job_id) if job_id else None
+        if job is not None and st.session_state.get("finished_job_id") != job_id:
+            try:
+                if job["status"] == DONE:
+                    result = get_job_queue().result(job_id)
+                elif job["status"] == FAILED:
+                    raise RuntimeError(job["error"])
+                else:
+                    with st.spinner("🤖 AI agents are analyzing your project..."):
+                        result = run_analysis_with_progress(job_id)
+                
+                show_result(result)
+                st.session_state.finished_job_id = job_id
+                st.rerun()
+                
+            except Exception as e:
+                st.session_state.finished_job_id = job_id
+                st.error(f"❌ Error during analysis: {str(e)}")
+                st.error("Please check your API key and try again.")
     
     with col2:
         st.header("📊 Analysis Status")
         
         if 'analysis_result' in st.session_state:
             st.success("✅ Analysis Complete!")
+            reused = st.session_state.analysis_result.reused_stages
+            if reused:
+                st.info("♻️ Reused from an earlier analysis: " + ", ".join(reused))
             
-            # Download button
-            result_text = st.session_state.analysis_result
+            # Download buttons
             st.download_button(
                 label="📥 Download Report",
-                data=result_text,
+                data=st.session_state.analysis_report,
                 file_name="research_analysis_report.txt",
                 mime="text/plain"
             )
+            st.download_button(
+                label="📥 Download JSON",
+                data=st.session_state.analysis_result.to_json(),
+                file_name="research_analysis.json",
+                mime="application/json"
+            )
         else:
             st.info("⏳ No analysis performed yet")
             st.markdown("""
@@ -237,26 +370,35 @@ def main():
             st.markdown('<div class="result-box">', unsafe_allow_html=True)
             st.text_area(
                 "Analysis Report",
-                value=st.session_state.analysis_result,
+                value=st.session_state.analysis_report,
                 height=600,
                 disabled=True
             )
             st.markdown('</div>', unsafe_allow_html=True)
         
         with tab2:
-            # Extract key insights (this is a simplified version)
             result = st.session_state.analysis_result
             st.markdown("### 🔍 Key Insights Extracted")
             
-            # Simple keyword extraction (in a real implementation, you'd parse the result more intelligently)
-            if "keyword" in result.lower() or "research" in result.lower():
-                st.success("✅ Research papers found and analyzed")
-            if "summary" in result.lower():
+            if result.keywords:
+                st.markdown("**Keywords:** " + ", ".join(result.keywords))
+            if result.papers:
+                st.success(f"✅ {len(result.papers)} research papers found and analyzed")
+                for paper in result.papers:
+                    title = f"[{paper.title}]({paper.url})" if paper.url else paper.title
+                    st.markdown(f"- **{title}**")
+            if result.summary:
                 st.success("✅ Comprehensive summary generated")
-            if "validation" in result.lower():
+            if result.gaps:
+                st.warning(f"⚠️ {len(result.gaps)} gaps found during validation")
+                for gap in result.gaps:
+                    st.markdown(f"- {gap}")
+            elif result.validation:
                 st.success("✅ Project requirements validated")
             
             st.info("💡 For detailed insights, check the Full Report tab above.")
+    
+    render_history()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
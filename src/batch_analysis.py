@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+ResearchScope AI - Batch Analysis
+Runs analyze_project over many project descriptions on a bounded worker pool.
+
+Input is JSONL or CSV with a description field (and optionally an id field).
+Results are streamed to a JSONL file which doubles as the checkpoint: records
+already written with status "ok" are skipped when a job is resumed.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from typing import Dict, Iterator, Optional, Set
+
+from analysis_pipeline import AnalysisPipeline
+from keyword_extraction import MODES as KEYWORD_MODES
+from project_analysis_crew_fixed import create_agents
+from rate_limit import RequestsPerMinuteLimiter
+from run_logging import configure_logging
+
+DEFAULT_WORKERS = 4
+DEFAULT_REQUESTS_PER_MINUTE = 60
+
+
+def read_records(
+    input_path: str,
+    description_field: str = "description",
+    id_field: str = "id",
+) -> Iterator[Dict[str, str]]:
+    """Yield {"id", "description"} records from a JSONL or CSV file"""
+    is_csv = input_path.lower().endswith(".csv")
+    with open(input_path, newline="", encoding="utf-8") as f:
+        if is_csv:
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+
+        for index, row in enumerate(rows, start=1):
+            description = (row.get(description_field) or "").strip()
+            if not description:
+                continue
+            record_id = row.get(id_field)
+            yield {
+                "id": str(record_id) if record_id not in (None, "") else str(index),
+                "description": description,
+            }
+
+
+def load_completed_ids(output_path: str) -> Set[str]:
+    """Return the ids already analysed successfully in a previous run"""
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A killed job can leave a truncated final line behind
+                continue
+            if record.get("status") == "ok":
+                completed.add(record["id"])
+    return completed
+
+
+class _ResultWriter:
+    """Appends one JSON line per record and flushes it to disk immediately"""
+
+    def __init__(self, output_path: str):
+        directory = os.path.dirname(os.path.abspath(output_path))
+        os.makedirs(directory, exist_ok=True)
+        # A killed run can leave a cut-off last line; start on a fresh one
+        # so the first new record is not glued onto it
+        cut_off = False
+        if os.path.exists(output_path) and os.path.getsize(output_path):
+            with open(output_path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                cut_off = f.read(1) != b"\n"
+        self._file = open(output_path, "a", encoding="utf-8")
+        if cut_off:
+            self._file.write("\n")
+        self._lock = threading.Lock()
+
+    def write(self, record: dict) -> None:
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def analyze_batch(
+    input_path: str,
+    output_path: str,
+    max_workers: int = DEFAULT_WORKERS,
+    requests_per_minute: Optional[int] = DEFAULT_REQUESTS_PER_MINUTE,
+    resume: bool = True,
+    description_field: str = "description",
+    id_field: str = "id",
+    on_result=None,
+    verbose: Optional[bool] = None,
+    keyword_mode: Optional[str] = None,
+) -> dict:
+    """Analyse every description in input_path and stream results to output_path.
+
+    Args:
+        input_path: JSONL or CSV file of project descriptions.
+        output_path: JSONL file results are appended to.
+        max_workers: Number of crews running at once.
+        requests_per_minute: Global Gemini request budget shared by all workers.
+        resume: Skip records already completed in output_path.
+        on_result: Optional callable invoked with each result record.
+        verbose: Log every run's agent trace (default: ANALYSIS_VERBOSE).
+        keyword_mode: llm, local or auto keyword extraction (default: KEYWORD_MODE).
+
+    Returns:
+        Counts of processed, skipped and failed records, and the agent pool's
+        stats under "pool".
+    """
+    limiter = RequestsPerMinuteLimiter(requests_per_minute) if requests_per_minute else None
+
+    # One isolated agent set per worker; they are not safe to share. Every
+    # agent's models draw on the one request budget
+    pipeline = AnalysisPipeline(size=max_workers,
+                                agents_factory=lambda: create_agents(rate_limiter=limiter))
+
+    def run_record(record):
+        started = time.time()
+        try:
+            result, metrics = pipeline.analyze(record["description"], return_metrics=True,
+                                               verbose=verbose, keyword_mode=keyword_mode)
+            return {
+                "id": record["id"],
+                "status": "ok",
+                "result": result.to_dict(),
+                "elapsed_seconds": round(time.time() - started, 3),
+                "metrics": metrics.summary(),
+            }
+        except Exception as e:
+            return {
+                "id": record["id"],
+                "status": "error",
+                "error": str(e),
+                "elapsed_seconds": round(time.time() - started, 3),
+            }
+
+    completed = load_completed_ids(output_path) if resume else set()
+    if not resume and os.path.exists(output_path):
+        os.remove(output_path)
+
+    counts = {"processed": 0, "skipped": 0, "failed": 0}
+    writer = _ResultWriter(output_path)
+
+    def collect(future):
+        record = future.result()
+        writer.write(record)
+        counts["processed"] += 1
+        if record["status"] != "ok":
+            counts["failed"] += 1
+        if on_result:
+            on_result(record)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = set()
+            for record in read_records(input_path, description_field, id_field):
+                if record["id"] in completed:
+                    counts["skipped"] += 1
+                    continue
+
+                # Keep the in-flight window bounded instead of queueing the whole file
+                if len(pending) >= max_workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future)
+
+                pending.add(executor.submit(run_record, record))
+
+            # Checkpoint the tail in completion order too
+            for future in as_completed(pending):
+                collect(future)
+    finally:
+        writer.close()
+
+    counts["pool"] = pipeline.stats()
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run ResearchScope AI analysis over a file of project descriptions"
+    )
+    parser.add_argument("input", help="JSONL or CSV file with project descriptions")
+    parser.add_argument("-o", "--output", default="batch_results.jsonl",
+                        help="JSONL file to stream results to (default: batch_results.jsonl)")
+    parser.add_argument("-w", "--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Number of concurrent analyses (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--rpm", type=int, default=DEFAULT_REQUESTS_PER_MINUTE,
+                        help="Global Gemini requests-per-minute budget, 0 to disable "
+                             f"(default: {DEFAULT_REQUESTS_PER_MINUTE})")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="Start over instead of skipping completed records")
+    parser.add_argument("--description-field", default="description",
+                        help="Field holding the project description (default: description)")
+    parser.add_argument("--id-field", default="id",
+                        help="Field holding the record id (default: id)")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Log each run's agent trace (see LOG_* settings)")
+    parser.add_argument("--keyword-mode", choices=KEYWORD_MODES,
+                        help="Extract keywords with the LLM, locally, or locally when "
+                             "confident (default: KEYWORD_MODE or llm)")
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    def report(record):
+        icon = "✅" if record["status"] == "ok" else "❌"
+        print(f"{icon} {record['id']} ({record['elapsed_seconds']}s)", file=sys.stderr)
+
+    print(f"🚀 Batch analysis: {args.input} -> {args.output}", file=sys.stderr)
+    counts = analyze_batch(
+        args.input,
+        args.output,
+        max_workers=args.workers,
+        requests_per_minute=args.rpm or None,
+        resume=not args.no_resume,
+        description_field=args.description_field,
+        id_field=args.id_field,
+        on_result=report,
+        verbose=args.verbose or None,
+        keyword_mode=args.keyword_mode,
+    )
+    print(
+        f"📊 Processed {counts['processed']}, skipped {counts['skipped']}, "
+        f"failed {counts['failed']}",
+        file=sys.stderr,
+    )
+    pool = counts["pool"]
+    print(
+        f"🧵 Agent pool utilisation {pool['utilisation']:.0%}, "
+        f"queue wait p95 {pool['queue_wait_seconds']['p95']:.2f}s",
+        file=sys.stderr,
+    )
+    return 0 if counts["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
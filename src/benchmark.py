@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+"""
+ResearchScope AI - Offline Benchmark
+Measures analyze_project end-to-end latency, throughput under concurrency,
+memory high-water mark and per-agent overhead with no network access, plus
+Scholar page parse time and memory per parser backend on saved fixture pages.
+
+Gemini is replaced by the scripted model in fake_gemini and Google Scholar by
+the local stub server, both with configurable latency, so the numbers reflect
+this code base rather than remote services. Results are written as JSON and
+can be compared against a baseline to gate performance changes.
+
+Usage:
+    python src/benchmark.py --runs 5 --concurrency 1 4 -o bench.json
+    python src/benchmark.py --compare baseline.json --max-regression 0.15
+    python src/benchmark.py --parse-pages saved_page.html
+"""
+
+import argparse
+import contextlib
+import glob
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+# CrewAI's telemetry would reach out to the network; the benchmark must not
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+# Scripted runs do not belong in the user's analysis history, and results
+# stored by earlier runs must not change what this run measures
+os.environ.setdefault("ANALYSIS_HISTORY_BYPASS", "1")
+os.environ.setdefault("KEYWORD_CORPUS_BYPASS", "1")
+os.environ.setdefault("SIMILARITY_BYPASS", "1")
+os.environ.setdefault("STAGE_MEMO_BYPASS", "1")
+
+from analysis_pipeline import AnalysisPipeline
+from keyword_extraction import LLM_MODE, MODES as KEYWORD_MODES, keyword_mode
+from fake_gemini import ScriptedGenerativeModel
+from model_router import ModelRouter
+from instrumentation import LLM, SCRAPE, STAGE
+from project_analysis_crew_fixed import (
+    DEFAULT_MODEL_NAME,
+    DEFAULT_TEMPERATURE,
+    GoogleGenerativeAI,
+    analyze_project,
+    create_agents,
+    create_scraper_tools,
+)
+from run_logging import configure_logging
+from scholar_parser import BACKENDS, available_backends
+from scholar_stub_server import render_results_page, start_stub_server
+from scrape_cache import ScrapeCache
+from web_scraper import DEFAULT_MAX_RESULTS, WebScraperTool
+
+DEFAULT_OUTPUT_DIR = os.path.join(".cache", "benchmarks")
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "tests", "fixtures")
+
+PROJECT_DESCRIPTIONS = [
+    """Project: Smart Home Energy Management System
+    Develop an AI-powered energy management system that monitors real-time consumption,
+    forecasts usage from historical and weather data, and optimises distribution across
+    appliances and rooftop solar panels while preserving user privacy.""",
+    """Project: Plant Disease Detection
+    Train a convolutional neural network that classifies leaf photographs into disease
+    categories, runs on smartphones offline, and explains its predictions to farmers.""",
+    """Project: Clinical Notes Summarisation
+    Build a transformer-based summariser for electronic health records that highlights
+    medication changes, respects de-identification requirements and supports clinicians.""",
+    """Project: Warehouse Robot Navigation
+    Design reinforcement learning policies for autonomous warehouse robots that avoid
+    collisions, coordinate with fleet scheduling and adapt to changing shelf layouts.""",
+]
+
+
+class OfflineEnvironment:
+    """Fake Gemini model and local Scholar server wired into fresh agent sets.
+
+    Args:
+        llm_latency: Seconds per fake Gemini call.
+        scrape_latency: Seconds the stub server waits before each response.
+        jitter: Random extra fraction of the LLM latency (seeded).
+        failure_rate: Fraction of LLM calls failing with a retryable error.
+        streaming: Serve LLM calls from the streaming API.
+        scrape_cache: Whether the scraper caches results between runs.
+        routing: Give each agent its role's routed models (all served by the
+            fake) instead of one shared LLM.
+    """
+
+    def __init__(self, llm_latency: float = 0.05, scrape_latency: float = 0.02,
+                 jitter: float = 0.0, failure_rate: float = 0.0, streaming: bool = False,
+                 scrape_cache: bool = False, routing: bool = False):
+        self.server, base_url = start_stub_server(latency=scrape_latency)
+        self.model = ScriptedGenerativeModel(latency=llm_latency, jitter=jitter,
+                                             failure_rate=failure_rate)
+        self.llm = GoogleGenerativeAI(
+            model_name=DEFAULT_MODEL_NAME,
+            temperature=DEFAULT_TEMPERATURE,
+            model=self.model,
+            streaming=streaming,
+        )
+        self.streaming = streaming
+        self.router = ModelRouter() if routing else None
+        self.scraper = WebScraperTool(
+            base_url=base_url,
+            cache=ScrapeCache() if scrape_cache else None,
+        )
+        self.tools = create_scraper_tools(self.scraper)
+
+    def create_agents(self):
+        if self.router is not None:
+            return create_agents(tools=self.tools, router=self.router, model=self.model,
+                                 streaming=self.streaming, response_cache=None, hedge=False)
+        return create_agents(self.llm, self.tools)
+
+    def close(self) -> None:
+        self.scraper.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@contextlib.contextmanager
+def quiet(enabled: bool = True):
+    """Silence stray console output from libraries while measuring"""
+    if not enabled:
+        yield
+        return
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def describe(values: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(values),
+        "mean": round(statistics.fmean(values), 4) if values else 0.0,
+        "p50": round(percentile(values, 0.5), 4),
+        "p95": round(percentile(values, 0.95), 4),
+        "min": round(min(values), 4) if values else 0.0,
+        "max": round(max(values), 4) if values else 0.0,
+    }
+
+
+def agent_overhead(metrics_list) -> Dict[str, Dict[str, float]]:
+    """Mean time per stage split into LLM, scrape and framework overhead.
+
+    Sub-stages (research[0], research[1], ...) are added up under their stage,
+    so for parallel runs this is agent time rather than wall time.
+    """
+    totals: Dict[str, Dict[str, float]] = {}
+    for metrics in metrics_list:
+        per_run: Dict[str, Dict[str, float]] = {}
+        for record in metrics.records:
+            stage = (record["name"] if record["kind"] == STAGE else record.get("stage")) or "unknown"
+            stage = stage.split("[")[0]
+            entry = per_run.setdefault(stage, {"stage": 0.0, "llm": 0.0, "scrape": 0.0, "llm_calls": 0})
+            if record["kind"] == STAGE:
+                entry["stage"] += record["seconds"]
+            elif record["kind"] == LLM:
+                entry["llm"] += record["seconds"]
+                entry["llm_calls"] += 1
+            elif record["kind"] == SCRAPE:
+                entry["scrape"] += record["seconds"]
+        for stage, entry in per_run.items():
+            total = totals.setdefault(stage, {"stage": 0.0, "llm": 0.0, "scrape": 0.0, "llm_calls": 0})
+            for key, value in entry.items():
+                total[key] += value
+
+    runs = max(1, len(metrics_list))
+    report = {}
+    for stage, total in totals.items():
+        seconds, llm, scrape = total["stage"] / runs, total["llm"] / runs, total["scrape"] / runs
+        report[stage] = {
+            "seconds": round(seconds, 4),
+            "llm_seconds": round(llm, 4),
+            "scrape_seconds": round(scrape, 4),
+            "overhead_seconds": round(max(0.0, seconds - llm - scrape), 4),
+            "llm_calls": round(total["llm_calls"] / runs, 2),
+        }
+    return report
+
+
+def measure_latency(env: OfflineEnvironment, runs: int, mode: str) -> dict:
+    """Back-to-back analyses on one agent set; the first (cold) run is reported apart"""
+    agents = env.create_agents()
+    latencies, metrics_list = [], []
+    cold = None
+    for i in range(runs + 1):
+        description = PROJECT_DESCRIPTIONS[i % len(PROJECT_DESCRIPTIONS)]
+        started = time.perf_counter()
+        _, metrics = analyze_project(description, agents=agents, mode=mode, return_metrics=True,
+                                     reuse=False)
+        elapsed = time.perf_counter() - started
+        if i == 0:
+            cold = elapsed
+            continue
+        latencies.append(elapsed)
+        metrics_list.append(metrics)
+
+    llm_seconds = [m.summary()["llm"]["seconds"] for m in metrics_list]
+    return {
+        "cold_seconds": round(cold, 4),
+        "seconds": describe(latencies),
+        "llm_calls_per_run": round(statistics.fmean(m.summary()["llm"]["calls"] for m in metrics_list), 2),
+        "llm_seconds_per_run": round(statistics.fmean(llm_seconds), 4),
+        "llm_cost_usd_per_run": round(statistics.fmean(m.summary()["llm"]["cost_usd"] for m in metrics_list), 6),
+        "agents": agent_overhead(metrics_list),
+    }
+
+
+def measure_throughput(env: OfflineEnvironment, analyses: int, concurrency: int, mode: str) -> dict:
+    """Run analyses from concurrency threads on an AnalysisPipeline of that size"""
+    pipeline = AnalysisPipeline(size=concurrency, agents_factory=env.create_agents).prewarm()
+
+    def run(index):
+        description = PROJECT_DESCRIPTIONS[index % len(PROJECT_DESCRIPTIONS)]
+        started = time.perf_counter()
+        pipeline.analyze(description, mode=mode, reuse=False)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(run, range(analyses)))
+    wall = time.perf_counter() - started
+    pool = pipeline.stats()
+    return {
+        "concurrency": concurrency,
+        "analyses": analyses,
+        "wall_seconds": round(wall, 4),
+        "analyses_per_second": round(analyses / wall, 4),
+        "latency": describe(latencies),
+        "pool_utilisation": pool["utilisation"],
+        "queue_wait_seconds": pool["queue_wait_seconds"],
+    }
+
+
+def measure_memory(env: OfflineEnvironment, mode: str) -> dict:
+    """Python heap high-water mark of one analysis, plus the process peak RSS"""
+    agents = env.create_agents()
+    tracemalloc.start()
+    try:
+        analyze_project(PROJECT_DESCRIPTIONS[0], agents=agents, mode=mode, reuse=False)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    max_rss_mb = max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+    return {
+        "python_peak_mb": round(peak / (1024 * 1024), 3),
+        "python_retained_mb": round(current / (1024 * 1024), 3),
+        "process_max_rss_mb": round(max_rss_mb, 1),
+    }
+
+
+def fixture_pages(paths: Optional[List[str]] = None) -> Dict[str, str]:
+    """Scholar pages to parse: the saved fixtures (or paths) and a minimal stub page"""
+    paths = paths or sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html")))
+    pages = {}
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            pages[os.path.basename(path)] = f.read()
+    pages["stub"] = render_results_page("federated learning privacy")
+    return pages
+
+
+def measure_parsing(pages: Dict[str, str], repeats: int = 30,
+                    limit: int = DEFAULT_MAX_RESULTS) -> dict:
+    """Median parse time and Python heap peak of each installed backend per page.
+
+    tracemalloc only sees Python allocations, so the C parsers' (selectolax,
+    lxml) own buffers are not in python_peak_kb.
+    """
+    results = {}
+    for name, html in pages.items():
+        backends = {}
+        for backend in available_backends():
+            parse = BACKENDS[backend]
+            parse(html, limit)  # warm-up
+            durations = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                parse(html, limit)
+                durations.append(time.perf_counter() - start)
+            tracemalloc.start()
+            try:
+                parse(html, limit)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            backends[backend] = {
+                "ms_p50": round(statistics.median(durations) * 1000, 3),
+                "python_peak_kb": round(peak / 1024, 1),
+            }
+        results[name] = {"bytes": len(html.encode("utf-8")), "backends": backends}
+    return results
+
+
+def environment_info() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": commit,
+    }
+
+
+def run_benchmark(
+    runs: int = 3,
+    concurrency: Optional[List[int]] = None,
+    analyses: Optional[int] = None,
+    mode: str = "sequential",
+    llm_latency: float = 0.05,
+    scrape_latency: float = 0.02,
+    jitter: float = 0.0,
+    failure_rate: float = 0.0,
+    streaming: bool = False,
+    routing: bool = False,
+    memory: bool = True,
+    parse_pages: Optional[List[str]] = None,
+    on_progress: Optional[Callable[[str], None]] = None,
+) -> dict:
+    """Run the full offline benchmark and return the results document"""
+    concurrency = concurrency or [1, 4]
+    progress = on_progress or (lambda message: None)
+    env = OfflineEnvironment(llm_latency=llm_latency, scrape_latency=scrape_latency,
+                             jitter=jitter, failure_rate=failure_rate, streaming=streaming,
+                             routing=routing)
+    try:
+        progress(f"latency: {runs} runs ({mode})")
+        latency = measure_latency(env, runs, mode)
+
+        throughput = []
+        for workers in concurrency:
+            count = analyses or max(4, workers * 2)
+            progress(f"throughput: {count} analyses on {workers} workers")
+            throughput.append(measure_throughput(env, count, workers, mode))
+
+        memory_result = None
+        if memory:
+            progress("memory: one traced analysis")
+            memory_result = measure_memory(env, mode)
+    finally:
+        env.close()
+
+    pages = fixture_pages(parse_pages)
+    progress(f"parsing: {len(pages)} pages x {', '.join(available_backends())}")
+    parsing = measure_parsing(pages)
+
+    return {
+        "benchmark": "researchscope-offline",
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": environment_info(),
+        "config": {
+            "mode": mode,
+            "runs": runs,
+            "concurrency": concurrency,
+            "llm_latency": llm_latency,
+            "scrape_latency": scrape_latency,
+            "jitter": jitter,
+            "failure_rate": failure_rate,
+            "streaming": streaming,
+            "routing": routing,
+            "keyword_mode": keyword_mode(),
+        },
+        "latency": latency,
+        "throughput": throughput,
+        "memory": memory_result,
+        "parsing": parsing,
+    }
+
+
+def key_metrics(results: dict) -> Dict[str, float]:
+    """Headline numbers compared between runs; all are lower-is-better"""
+    metrics = {"latency_p50_seconds": results["latency"]["seconds"]["p50"]}
+    for entry in results["throughput"]:
+        metrics[f"seconds_per_analysis@{entry['concurrency']}"] = round(1 / entry["analyses_per_second"], 4)
+    for stage, entry in results["latency"]["agents"].items():
+        metrics[f"overhead_seconds[{stage}]"] = entry["overhead_seconds"]
+    if results.get("memory"):
+        metrics["python_peak_mb"] = results["memory"]["python_peak_mb"]
+    for page, entry in (results.get("parsing") or {}).items():
+        for backend, timing in entry["backends"].items():
+            metrics[f"parse_ms[{page}:{backend}]"] = timing["ms_p50"]
+    return metrics
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> List[str]:
+    """Print a comparison against baseline and return the regressed metrics"""
+    current, previous = key_metrics(results), key_metrics(baseline)
+    regressions = []
+    print(f"{'metric':<40}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, value in current.items():
+        if name not in previous:
+            continue
+        before = previous[name]
+        change = (value - before) / before if before else 0.0
+        flag = ""
+        # Tiny absolute values (overheads near zero) are too noisy to gate on
+        if change > max_regression and value - before > 0.01:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<40}{before:>12.4f}{value:>12.4f}{change:>+10.1%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline ResearchScope AI benchmark")
+    parser.add_argument("--runs", type=int, default=3,
+                        help="Measured sequential runs after one warm-up run (default: 3)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4],
+                        help="Worker counts for the throughput measurement (default: 1 4)")
+    parser.add_argument("--analyses", type=int, default=None,
+                        help="Analyses per throughput level (default: 2x workers, at least 4)")
+    parser.add_argument("--mode", choices=["sequential", "parallel"], default="sequential")
+    parser.add_argument("--llm-latency", type=float, default=0.05,
+                        help="Seconds per fake Gemini call (default: 0.05)")
+    parser.add_argument("--scrape-latency", type=float, default=0.02,
+                        help="Seconds per stub Scholar request (default: 0.02)")
+    parser.add_argument("--jitter", type=float, default=0.0,
+                        help="Random extra fraction of the LLM latency (default: 0)")
+    parser.add_argument("--failure-rate", type=float, default=0.0,
+                        help="Fraction of fake Gemini calls failing with a retryable error (default: 0)")
+    parser.add_argument("--streaming", action="store_true", help="Use the streaming generation path")
+    parser.add_argument("--routing", action="store_true",
+                        help="Route each agent to its role's models instead of one shared LLM")
+    parser.add_argument("--keyword-mode", choices=KEYWORD_MODES, default=LLM_MODE,
+                        help="Keyword extraction mode (sets KEYWORD_MODE; default: llm)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the memory measurement")
+    parser.add_argument("--parse-pages", nargs="+", metavar="PAGE",
+                        help="Saved Scholar pages to benchmark parsing on (default: tests/fixtures/*.html)")
+    parser.add_argument("-o", "--output", default=None,
+                        help=f"Results file (default: {DEFAULT_OUTPUT_DIR}/benchmark-<time>.json)")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare against a previous results file")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="Allowed relative slowdown before --compare fails (default: 0.2)")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Log the agents' traces to stderr (sets ANALYSIS_VERBOSE)")
+    args = parser.parse_args(argv)
+    os.environ["KEYWORD_MODE"] = args.keyword_mode
+    if args.verbose:
+        os.environ["ANALYSIS_VERBOSE"] = "1"
+        configure_logging()
+
+    def progress(message):
+        print(f"⏱️  {message}", file=sys.stderr)
+
+    with quiet(not args.verbose):
+        results = run_benchmark(
+            runs=args.runs,
+            concurrency=args.concurrency,
+            analyses=args.analyses,
+            mode=args.mode,
+            llm_latency=args.llm_latency,
+            scrape_latency=args.scrape_latency,
+            jitter=args.jitter,
+            failure_rate=args.failure_rate,
+            streaming=args.streaming,
+            routing=args.routing,
+            memory=not args.no_memory,
+            parse_pages=args.parse_pages,
+            on_progress=progress,
+        )
+
+    output = args.output
+    if output is None:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        output = os.path.join(DEFAULT_OUTPUT_DIR, f"benchmark-{stamp}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    latency = results["latency"]["seconds"]
+    print(f"📊 latency p50 {latency['p50']:.3f}s p95 {latency['p95']:.3f}s "
+          f"(cold {results['latency']['cold_seconds']:.3f}s), "
+          f"${results['latency']['llm_cost_usd_per_run']:.5f} of model calls per analysis")
+    for entry in results["throughput"]:
+        print(f"📊 {entry['concurrency']} workers: {entry['analyses_per_second']:.2f} analyses/s")
+    if results["memory"]:
+        print(f"📊 memory peak {results['memory']['python_peak_mb']:.1f} MB Python heap, "
+              f"{results['memory']['process_max_rss_mb']:.0f} MB RSS")
+    for page, entry in results["parsing"].items():
+        timings = ", ".join(f"{backend} {timing['ms_p50']:.2f}ms"
+                            for backend, timing in entry["backends"].items())
+        print(f"📊 parse {page} ({entry['bytes'] // 1024} KB): {timings}")
+    print(f"💾 Results saved to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        # Local keywords skip the keyword agent: runs in different modes measure
+        # different pipelines. Baselines from before the option ran the agent.
+        modes = (baseline["config"].get("keyword_mode", LLM_MODE), results["config"]["keyword_mode"])
+        if modes[0] != modes[1]:
+            print(f"❌ Cannot compare: the baseline used keyword mode {modes[0]}, "
+                  f"this run {modes[1]}; rerun with --keyword-mode {modes[0]}")
+            return 1
+        regressions = compare(results, baseline, args.max_regression)
+        if regressions:
+            print(f"❌ Regressed beyond {args.max_regression:.0%}: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
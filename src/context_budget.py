@@ -0,0 +1,211 @@
+"""
+ResearchScope AI - Context Budgeting
+Compacts what one crew task hands to the next: the keyword list and the
+deduplicated paper records found by the scraper are passed as structured
+sections, and free-form agent output is stripped of ReAct residue and
+extractively compressed to a per-task token budget.
+"""
+
+import contextvars
+import os
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from instrumentation import CHARS_PER_TOKEN, estimate_tokens
+
+# Token budgets for the context each task receives
+TASK_BUDGETS = {
+    "research": 200,
+    "summary": 1500,
+    "validation": 1200,
+}
+
+# Share of a budget given to the paper list; findings get the rest
+PAPER_SHARE = 0.4
+MAX_SNIPPET_CHARS = 240
+
+MAX_KEYWORDS = 20
+MAX_KEYWORD_WORDS = 6
+
+# Lines of an agent's ReAct trace and echoed tool output, not findings
+TRACE_LINE = re.compile(
+    r"^\s*(Thought:|Action:|Action Input:|Observation:|Final Answer:\s*$|\[\{'title')"
+)
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n+")
+WORD = re.compile(r"[a-z0-9]+")
+
+
+def enabled() -> bool:
+    return os.getenv("CONTEXT_BUDGET_BYPASS", "") != "1"
+
+
+def normalize_title(title: str) -> str:
+    return " ".join(WORD.findall(title.lower()))
+
+
+class ResearchNotes:
+    """Structured facts gathered during one analysis run"""
+
+    def __init__(self):
+        self.keywords: List[str] = []
+        self._papers: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+        self.tool_errors: List[str] = []
+        self._lock = threading.Lock()
+
+    def set_keywords(self, keywords: Iterable[str]) -> None:
+        with self._lock:
+            self.keywords = list(keywords)
+
+    def add_papers(self, query: str, results: Iterable[Dict[str, str]]) -> None:
+        """Add scraped records, keeping the first copy of each title"""
+        with self._lock:
+            for record in results:
+                key = normalize_title(record.get("title", ""))
+                if key and key not in self._papers:
+                    self._papers[key] = dict(record, query=record.get("query", query))
+
+    def add_tool_error(self, message: str) -> None:
+        with self._lock:
+            self.tool_errors.append(message)
+
+    @property
+    def papers(self) -> List[Dict[str, str]]:
+        with self._lock:
+            return list(self._papers.values())
+
+
+_current_notes: contextvars.ContextVar[Optional[ResearchNotes]] = contextvars.ContextVar(
+    "researchscope_notes", default=None
+)
+
+
+@contextmanager
+def collecting(notes: ResearchNotes) -> Iterator[ResearchNotes]:
+    """Gather keywords and scraped papers produced in this context into notes"""
+    token = _current_notes.set(notes)
+    try:
+        yield notes
+    finally:
+        _current_notes.reset(token)
+
+
+def current_notes() -> Optional[ResearchNotes]:
+    return _current_notes.get()
+
+
+def record_papers(query: str, results) -> None:
+    """Called by the scraper with each successful result list"""
+    notes = _current_notes.get()
+    if notes is not None and isinstance(results, list):
+        notes.add_papers(query, results)
+
+
+def record_tool_error(message: str) -> None:
+    """Called by the scraper when it hands the agent an error instead of results"""
+    notes = _current_notes.get()
+    if notes is not None:
+        notes.add_tool_error(message)
+
+
+def select_keywords(keywords: Iterable[str]) -> List[str]:
+    """Drop sentence-length "keywords" and cap the list"""
+    short = [k for k in keywords if len(k.split()) <= MAX_KEYWORD_WORDS]
+    return short[:MAX_KEYWORDS]
+
+
+def strip_agent_trace(text: str) -> str:
+    """Drop ReAct bookkeeping lines and echoed tool output from agent text"""
+    kept = [line for line in text.splitlines() if not TRACE_LINE.match(line)]
+    return "\n".join(kept).strip()
+
+
+def split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in SENTENCE_END.split(text) if s and s.strip()]
+
+
+def truncate(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars].rsplit(" ", 1)[0]
+    return cut.rstrip(",;:") + "…"
+
+
+def compress(text: str, budget_tokens: int, terms: Iterable[str] = ()) -> str:
+    """Extractive compression: keep the most relevant unique sentences in order.
+
+    Sentences are scored by how many of terms they mention, with a small bonus
+    for appearing early; duplicates (ignoring case and punctuation) are
+    dropped. Text already within budget is only deduplicated.
+    """
+    term_words = {w for term in terms for w in WORD.findall(term.lower())}
+    seen = set()
+    sentences = []
+    for index, sentence in enumerate(split_sentences(text)):
+        key = " ".join(WORD.findall(sentence.lower()))
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        overlap = len(term_words.intersection(key.split()))
+        sentences.append((overlap + 1.0 / (1 + index), index, sentence))
+
+    if sum(estimate_tokens(s) + 1 for _, _, s in sentences) <= budget_tokens:
+        return " ".join(s for _, _, s in sentences)
+
+    chosen = []
+    used = 0
+    for score, index, sentence in sorted(sentences, key=lambda item: (-item[0], item[1])):
+        cost = estimate_tokens(sentence) + 1
+        if used + cost > budget_tokens:
+            continue
+        chosen.append((index, sentence))
+        used += cost
+    if not chosen and sentences:
+        # A single sentence longer than the whole budget is cut instead
+        chosen = [(0, truncate(sentences[0][2], budget_tokens * CHARS_PER_TOKEN))]
+    return " ".join(sentence for _, sentence in sorted(chosen))
+
+
+def format_papers(papers: List[Dict[str, str]], budget_tokens: int) -> str:
+    """One line per paper, as many as fit in the budget"""
+    lines = []
+    used = 0
+    for paper in papers:
+        line = f"- {paper.get('title', '').strip()}"
+        snippet = paper.get("snippet", "").strip()
+        if snippet:
+            line += f": {truncate(snippet, MAX_SNIPPET_CHARS)}"
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget_tokens:
+            break
+        lines.append(line)
+        used += cost
+    return "\n".join(lines)
+
+
+def build_context(upstream: str, budget_tokens: int,
+                  notes: Optional[ResearchNotes] = None, include_papers: bool = True) -> str:
+    """Compact upstream task output (plus notes) into a structured context block"""
+    notes = notes if notes is not None else _current_notes.get()
+    keywords = notes.keywords if notes is not None else []
+    papers = notes.papers if notes is not None and include_papers else []
+
+    sections = []
+    remaining = budget_tokens
+    if keywords:
+        section = "Keywords: " + ", ".join(keywords)
+        sections.append(section)
+        remaining -= estimate_tokens(section)
+
+    if papers:
+        listing = format_papers(papers, int(remaining * PAPER_SHARE))
+        if listing:
+            sections.append(f"Papers found ({len(papers)} unique):\n{listing}")
+            remaining -= estimate_tokens(sections[-1])
+
+    findings = compress(strip_agent_trace(upstream), max(remaining, 0), keywords)
+    if findings:
+        sections.append(f"Findings:\n{findings}")
+    return "\n\n".join(sections)
@@ -0,0 +1,203 @@
+"""
+ResearchScope AI - DAG Runner
+Executes stages with explicit dependencies, running independent stages concurrently.
+"""
+
+import contextvars
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+
+@dataclass
+class Stage:
+    """A unit of work in the DAG.
+
+    Attributes:
+        name: Unique stage name; downstream stages refer to it in depends_on.
+        run: Called with {dependency name: output} and returns this stage's output.
+        depends_on: Names of the stages whose outputs this stage needs.
+        expand: Instead of run, return child stages once dependencies are done.
+            The children run concurrently and their outputs are combined by
+            reduce, so fan-out can depend on upstream results.
+        reduce: Combines child outputs of an expanding stage (default: join).
+    """
+
+    name: str
+    run: Optional[Callable[[Dict[str, str]], str]] = None
+    depends_on: List[str] = field(default_factory=list)
+    expand: Optional[Callable[[Dict[str, str]], List["Stage"]]] = None
+    reduce: Optional[Callable[[List[str]], str]] = None
+
+
+@dataclass
+class StageTiming:
+    name: str
+    depends_on: List[str]
+    started: float
+    finished: float
+    ready: float
+    on_critical_path: bool = False
+
+    @property
+    def duration(self) -> float:
+        return self.finished - self.started
+
+    @property
+    def queue_delay(self) -> float:
+        """Time between the stage becoming runnable and a worker picking it up"""
+        return self.started - self.ready
+
+
+@dataclass
+class DagResult:
+    outputs: Dict[str, str]
+    timings: Dict[str, StageTiming]
+    critical_path: List[str]
+    wall_seconds: float
+
+    @property
+    def stage_seconds(self) -> float:
+        """Sum of all stage durations, i.e. the wall time of a sequential run"""
+        return sum(t.duration for t in self.timings.values())
+
+    def format_report(self) -> str:
+        lines = [f"{'stage':<28}{'start':>8}{'duration':>10}{'wait':>8}  critical"]
+        origin = min((t.ready for t in self.timings.values()), default=0.0)
+        for timing in sorted(self.timings.values(), key=lambda t: t.started):
+            lines.append(
+                f"{timing.name:<28}{timing.started - origin:>8.2f}{timing.duration:>10.2f}"
+                f"{timing.queue_delay:>8.2f}  {'*' if timing.on_critical_path else ''}"
+            )
+        lines.append(
+            f"wall {self.wall_seconds:.2f}s vs {self.stage_seconds:.2f}s sequential; "
+            f"critical path: {' -> '.join(self.critical_path)}"
+        )
+        return "\n".join(lines)
+
+
+def _default_reduce(outputs: List[str]) -> str:
+    return "\n\n".join(outputs)
+
+
+class DagRunner:
+    """Runs a set of stages respecting depends_on, with a bounded thread pool"""
+
+    def __init__(self, stages: List[Stage], max_workers: int = 4):
+        self.stages = {}
+        for stage in stages:
+            self._validate(stage, self.stages)
+            self.stages[stage.name] = stage
+        for stage in self.stages.values():
+            missing = [dep for dep in stage.depends_on if dep not in self.stages]
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {missing}")
+        self.max_workers = max_workers
+
+    @staticmethod
+    def _validate(stage: Stage, known) -> None:
+        if stage.name in known:
+            raise ValueError(f"Duplicate stage name: '{stage.name}'")
+        if (stage.run is None) == (stage.expand is None):
+            raise ValueError(f"Stage '{stage.name}' needs exactly one of run or expand")
+
+    def run(self) -> DagResult:
+        outputs = {}
+        timings = {}
+        known = set(self.stages)
+        remaining = dict(self.stages)
+        running = {}
+        started_at = time.perf_counter()
+
+        def ready_time(stage):
+            finished = [timings[d].finished for d in stage.depends_on if d in timings]
+            return max(finished, default=started_at)
+
+        def execute(stage, inputs):
+            began = time.perf_counter()
+            result = stage.run(inputs)
+            return began, result, time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while remaining or running:
+                progressed = True
+                while progressed:
+                    progressed = False
+                    for name, stage in list(remaining.items()):
+                        if not all(dep in outputs for dep in stage.depends_on):
+                            continue
+                        del remaining[name]
+                        progressed = True
+                        inputs = {dep: outputs[dep] for dep in stage.depends_on}
+
+                        if stage.expand is not None:
+                            kids = stage.expand(inputs)
+                            for kid in kids:
+                                self._validate(kid, known)
+                                known.add(kid.name)
+                                kid.depends_on = list(kid.depends_on) or list(stage.depends_on)
+                                remaining[kid.name] = kid
+                            # The parent completes once every child has finished
+                            kid_names = [kid.name for kid in kids]
+                            reduce = stage.reduce or _default_reduce
+                            remaining[name] = Stage(
+                                name=name,
+                                run=lambda kid_outputs, kid_names=kid_names, reduce=reduce: (
+                                    reduce([kid_outputs[kid] for kid in kid_names])
+                                ),
+                                depends_on=kid_names,
+                            )
+                            continue
+
+                        # Copy the context so context variables reach worker threads
+                        context = contextvars.copy_context()
+                        future = executor.submit(context.run, execute, stage, inputs)
+                        running[future] = (stage, ready_time(stage))
+
+                if not running:
+                    if remaining:
+                        raise ValueError(
+                            f"Dependency cycle between stages: {sorted(remaining)}"
+                        )
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, ready = running.pop(future)
+                    # Re-raises the first stage failure; pending stages are dropped
+                    began, result, finished = future.result()
+                    outputs[stage.name] = result
+                    timings[stage.name] = StageTiming(
+                        name=stage.name,
+                        depends_on=list(stage.depends_on),
+                        started=began,
+                        finished=finished,
+                        ready=ready,
+                    )
+
+        critical_path = self._critical_path(timings)
+        for name in critical_path:
+            timings[name].on_critical_path = True
+
+        return DagResult(
+            outputs=outputs,
+            timings=timings,
+            critical_path=critical_path,
+            wall_seconds=time.perf_counter() - started_at,
+        )
+
+    @staticmethod
+    def _critical_path(timings: Dict[str, StageTiming]) -> List[str]:
+        """Walk back from the last stage to finish through its latest-finishing dependency"""
+        if not timings:
+            return []
+        current = max(timings.values(), key=lambda t: t.finished)
+        path = [current.name]
+        while True:
+            deps = [timings[d] for d in current.depends_on if d in timings]
+            if not deps:
+                break
+            current = max(deps, key=lambda t: t.finished)
+            path.append(current.name)
+        return list(reversed(path))
@@ -0,0 +1,173 @@
+"""
+ResearchScope AI - Fake Gemini Model
+Scripted, deterministic stand-in for google.generativeai.GenerativeModel so the
+crew can run offline (benchmarks, demos, CI) without an API key.
+
+It answers in the ReAct format the CrewAI agents expect: the Research Agent
+calls the WebScraper tool once before answering, every other agent (and the
+conversation-summary memory) answers directly. CrewAI's follow-up prompt that
+turns a tool call into JSON is answered with the matching schema.
+"""
+
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+from typing import AsyncIterator, Iterator, List
+
+from google.api_core import exceptions as api_exceptions
+
+from instrumentation import estimate_tokens
+
+# Common words plus the vocabulary of the crew's own task templates, so the
+# terms picked come from the project and the upstream context
+STOPWORDS = {
+    "about", "across", "along", "also", "based", "being", "build", "capable",
+    "different", "existing", "following", "from", "have", "into", "multiple",
+    "project", "provide", "should", "system", "that", "their", "these", "this",
+    "using", "where", "which", "while", "with", "would",
+    "address", "additional", "align", "analyze", "applications", "areas",
+    "compare", "comprehensive", "concepts", "context", "create", "description",
+    "documentation", "extract", "extracted", "finding", "findings", "focus", "focusing",
+    "gaps", "highlight", "identify", "insights", "keywords", "need", "original",
+    "papers", "potential", "relate", "relevant", "requirements", "research",
+    "search", "summary", "technical", "terms", "validate", "working",
+}
+
+FILLER = (
+    "The findings indicate that {topic} benefits from careful data preparation, "
+    "robust evaluation and incremental deployment. "
+)
+
+
+class FakeResponse:
+    """Mimics the parts of a Gemini response the LLM wrapper reads"""
+
+    def __init__(self, text: str, prompt: str = ""):
+        self.text = text
+        prompt_tokens = estimate_tokens(prompt)
+        completion_tokens = estimate_tokens(text)
+        self.usage_metadata = SimpleNamespace(
+            prompt_token_count=prompt_tokens,
+            candidates_token_count=completion_tokens,
+            total_token_count=prompt_tokens + completion_tokens,
+        )
+
+
+def _current_task(prompt: str) -> str:
+    """The part of an agent prompt after the task header (task, context, scratchpad)"""
+    return prompt.rsplit("Current Task:", 1)[-1]
+
+
+def extract_terms(text: str, limit: int = 6) -> List[str]:
+    """Longest distinct non-stopword terms of text, in order of appearance"""
+    words = []
+    for word in re.findall(r"[A-Za-z][A-Za-z\-]{3,}", text):
+        lowered = word.lower()
+        if lowered not in STOPWORDS and lowered not in words:
+            words.append(lowered)
+    longest = set(sorted(words, key=len, reverse=True)[:limit])
+    return [word for word in words if word in longest]
+
+
+class ScriptedGenerativeModel:
+    """Offline GenerativeModel replacement with configurable latency.
+
+    Args:
+        latency: Seconds each call takes.
+        jitter: Extra random fraction of latency (0.2 = up to +20%), seeded.
+        response_chars: Approximate length of final answers.
+        failure_rate: Fraction of calls failing with a retryable 503 error.
+        seed: Seed for the jitter and failures, so runs are reproducible.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0,
+                 response_chars: int = 600, failure_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.response_chars = response_chars
+        self.failure_rate = failure_rate
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def respond(self, prompt: str) -> str:
+        """The scripted reply for a prompt"""
+        if prompt.startswith("Progressively summarize"):
+            return "The agent completed its task and reported its findings."
+
+        if prompt.startswith("Tools available:"):
+            # The agent's tool call follows the rendered tool list
+            call = prompt.rsplit("schema:", 1)[-1]
+            tool = re.search(r"Tool Name:\s*(.+)", call)
+            arguments = re.search(r"Tool Arguments:\s*(.+)", call)
+            return json.dumps({
+                "tool_name": tool.group(1).strip() if tool else "WebScraper",
+                "arguments": {"tool_input": arguments.group(1).strip() if arguments else ""},
+            })
+
+        task = _current_task(prompt)
+        terms = extract_terms(task) or ["research"]
+
+        if "You are Keyword Extractor" in prompt:
+            return self._final(", ".join(terms))
+
+        if "You are Research Agent" in prompt and "\nObservation:" not in task:
+            return (
+                "Thought: Do I need to use a tool? Yes\n"
+                "Action: WebScraper\n"
+                f"Action Input: {' '.join(terms[:3])}"
+            )
+
+        topic = " ".join(terms[:3])
+        body = FILLER.format(topic=topic)
+        repeats = max(1, self.response_chars // len(body))
+        return self._final(body * repeats)
+
+    @staticmethod
+    def _final(answer: str) -> str:
+        return f"Thought: Do I need to use a tool? No\nFinal Answer: {answer.strip()}"
+
+    def _wait(self) -> None:
+        with self._lock:
+            self.calls += 1
+            extra = self._random.random() * self.jitter if self.jitter else 0.0
+            fail = self.failure_rate and self._random.random() < self.failure_rate
+        delay = self.latency * (1 + extra)
+        if delay > 0:
+            time.sleep(delay)
+        if fail:
+            raise api_exceptions.ServiceUnavailable("Scripted model failure")
+
+    def generate_content(self, contents, generation_config=None, stream: bool = False,
+                         **kwargs):
+        prompt = contents if isinstance(contents, str) else str(contents)
+        self._wait()
+        text = self.respond(prompt)
+        stop = getattr(generation_config, "stop_sequences", None) or []
+        for sequence in stop:
+            if sequence in text:
+                text = text[:text.index(sequence)]
+        if stream:
+            return self._chunks(text, prompt)
+        return FakeResponse(text, prompt)
+
+    async def generate_content_async(self, contents, generation_config=None,
+                                     stream: bool = False, **kwargs):
+        response = await asyncio.to_thread(self.generate_content, contents, generation_config)
+        if stream:
+            return self._achunks(response.text, contents)
+        return response
+
+    @staticmethod
+    def _chunks(text: str, prompt: str, size: int = 40) -> Iterator[FakeResponse]:
+        for start in range(0, len(text), size):
+            yield FakeResponse(text[start:start + size], prompt if start == 0 else "")
+
+    @classmethod
+    async def _achunks(cls, text: str, prompt: str) -> AsyncIterator[FakeResponse]:
+        for chunk in cls._chunks(text, prompt):
+            yield chunk
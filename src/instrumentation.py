@@ -0,0 +1,286 @@
+"""
+ResearchScope AI - Instrumentation
+Structured latency, size, token and cache metrics for a single analysis run.
+
+Measurements are recorded into the RunMetrics bound to the current context
+(see `recording()`), so concurrent analyses never mix their numbers. Code
+that runs outside a recording context pays only a context-variable lookup.
+"""
+
+import contextvars
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from analysis_events import current_stage
+
+LLM = "llm"
+SCRAPE = "scrape"
+STAGE = "stage"
+CONTEXT = "context"
+ROUTE = "route"
+
+# Rough characters-per-token ratio used when the API reports no usage
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def usage_from_response(response: Any) -> Dict[str, Optional[int]]:
+    """Token counts from a Gemini response's usage metadata, when the SDK exposes it"""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return {}
+    return {
+        "prompt_tokens": getattr(usage, "prompt_token_count", None),
+        "completion_tokens": getattr(usage, "candidates_token_count", None),
+        "total_tokens": getattr(usage, "total_token_count", None),
+    }
+
+
+class RunMetrics:
+    """Thread-safe collection of measurement records for one analysis run"""
+
+    def __init__(self, run_id: Optional[str] = None):
+        self.run_id = run_id
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.records: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, name: str, seconds: float, **attributes) -> None:
+        record = {
+            "kind": kind,
+            "name": name,
+            "seconds": round(seconds, 6),
+            "timestamp": time.time(),
+        }
+        record.update({k: v for k, v in attributes.items() if v is not None})
+        if self.run_id:
+            record["run_id"] = self.run_id
+        with self._lock:
+            self.records.append(record)
+
+    def finish(self) -> None:
+        self.finished_at = time.time()
+
+    @property
+    def wall_seconds(self) -> float:
+        return (self.finished_at or time.time()) - self.started_at
+
+    def _of_kind(self, kind: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [r for r in self.records if r["kind"] == kind]
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregate view: per-stage wall time plus LLM and scrape totals"""
+        llm_calls = self._of_kind(LLM)
+        scrapes = self._of_kind(SCRAPE)
+        stages = self._of_kind(STAGE)
+        contexts = self._of_kind(CONTEXT)
+        routes = self._of_kind(ROUTE)
+
+        def total(records, key):
+            return sum(r.get(key) or 0 for r in records)
+
+        providers: Dict[str, Dict[str, int]] = {}
+        for record in scrapes:
+            for name, outcome in (record.get("providers") or {}).items():
+                counts = providers.setdefault(name, {"results": 0, "failures": 0, "skipped": 0})
+                if isinstance(outcome, int):
+                    counts["results"] += outcome
+                elif outcome == "skipped":
+                    counts["skipped"] += 1
+                else:
+                    counts["failures"] += 1
+
+        models: Dict[str, Dict[str, Any]] = {}
+        for record in llm_calls:
+            model = models.setdefault(record["name"], {"calls": 0, "seconds": 0.0, "cost_usd": 0.0})
+            model["calls"] += 1
+            model["seconds"] = round(model["seconds"] + record["seconds"], 6)
+            model["cost_usd"] = round(model["cost_usd"] + (record.get("cost_usd") or 0), 8)
+
+        routing: Dict[str, Dict[str, int]] = {}
+        for record in routes:
+            chosen = routing.setdefault(record["name"], {})
+            chosen[record["model"]] = chosen.get(record["model"], 0) + 1
+
+        return {
+            "run_id": self.run_id,
+            "wall_seconds": round(self.wall_seconds, 6),
+            "stages": {r["name"]: r["seconds"] for r in stages},
+            "llm": {
+                "calls": len(llm_calls),
+                "seconds": round(total(llm_calls, "seconds"), 6),
+                "cache_hits": sum(1 for r in llm_calls if r.get("cache_hit")),
+                "retries": total(llm_calls, "retries"),
+                "hedged": sum(1 for r in llm_calls if r.get("hedged")),
+                "errors": sum(1 for r in llm_calls if r.get("error")),
+                "prompt_chars": total(llm_calls, "prompt_chars"),
+                "response_chars": total(llm_calls, "response_chars"),
+                "prompt_tokens": total(llm_calls, "prompt_tokens"),
+                "completion_tokens": total(llm_calls, "completion_tokens"),
+                "estimated_tokens": total(llm_calls, "estimated_tokens"),
+                "cost_usd": round(total(llm_calls, "cost_usd"), 8),
+                "fallbacks": total(routes, "fallbacks"),
+                "models": models,
+                "routing": routing,
+            },
+            "scrape": {
+                "requests": len(scrapes),
+                "seconds": round(total(scrapes, "seconds"), 6),
+                "cache_hits": sum(1 for r in scrapes if r.get("cache_hit")),
+                "local_hits": sum(1 for r in scrapes if r.get("local_hit")),
+                "errors": sum(1 for r in scrapes if r.get("error")),
+                "rate_limit_wait_seconds": round(total(scrapes, "rate_limit_wait"), 6),
+                "providers": providers,
+            },
+            "context": {
+                "raw_tokens": total(contexts, "raw_tokens"),
+                "compacted_tokens": total(contexts, "context_tokens"),
+            },
+        }
+
+    def to_json_lines(self) -> str:
+        """One JSON object per record"""
+        with self._lock:
+            return "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in self.records)
+
+    def to_prometheus(self, prefix: str = "researchscope") -> str:
+        """Run totals in the Prometheus text exposition format"""
+        summary = self.summary()
+        llm, scrape = summary["llm"], summary["scrape"]
+        lines = []
+
+        def metric(name, kind, samples):
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                if self.run_id:
+                    labels = dict(labels, run_id=self.run_id)
+                label_text = ",".join(f'{k}={json.dumps(str(v))}' for k, v in labels.items())
+                lines.append(f"{prefix}_{name}{{{label_text}}} {value}" if label_text
+                             else f"{prefix}_{name} {value}")
+
+        metric("run_seconds", "gauge", [({}, summary["wall_seconds"])])
+        metric("stage_seconds", "gauge",
+               [({"stage": name}, seconds) for name, seconds in summary["stages"].items()])
+        metric("llm_calls_total", "counter", [({}, llm["calls"])])
+        metric("llm_seconds_total", "counter", [({}, llm["seconds"])])
+        metric("llm_cache_hits_total", "counter", [({}, llm["cache_hits"])])
+        metric("llm_retries_total", "counter", [({}, llm["retries"])])
+        metric("llm_hedged_total", "counter", [({}, llm["hedged"])])
+        metric("llm_errors_total", "counter", [({}, llm["errors"])])
+        metric("llm_cost_usd_total", "counter", [({}, llm["cost_usd"])])
+        metric("llm_fallbacks_total", "counter", [({}, llm["fallbacks"])])
+        metric("llm_model_calls_total", "counter",
+               [({"model": name}, model["calls"]) for name, model in llm["models"].items()])
+        metric("llm_tokens_total", "counter", [
+            ({"type": "prompt"}, llm["prompt_tokens"]),
+            ({"type": "completion"}, llm["completion_tokens"]),
+            ({"type": "estimated"}, llm["estimated_tokens"]),
+        ])
+        metric("scrape_requests_total", "counter", [({}, scrape["requests"])])
+        metric("scrape_seconds_total", "counter", [({}, scrape["seconds"])])
+        metric("scrape_cache_hits_total", "counter", [({}, scrape["cache_hits"])])
+        metric("scrape_local_hits_total", "counter", [({}, scrape["local_hits"])])
+        metric("scrape_errors_total", "counter", [({}, scrape["errors"])])
+        metric("scrape_provider_results_total", "counter",
+               [({"provider": name}, counts["results"]) for name, counts in scrape["providers"].items()])
+        metric("scrape_provider_failures_total", "counter",
+               [({"provider": name}, counts["failures"]) for name, counts in scrape["providers"].items()])
+        return "\n".join(lines) + "\n"
+
+
+_current_metrics: contextvars.ContextVar[Optional[RunMetrics]] = contextvars.ContextVar(
+    "researchscope_metrics", default=None
+)
+_current_span: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar(
+    "researchscope_span", default=None
+)
+_stage_starts: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar(
+    "researchscope_stage_starts", default=None
+)
+_stage_attributes: contextvars.ContextVar[Optional[Dict[str, Dict[str, Any]]]] = contextvars.ContextVar(
+    "researchscope_stage_attributes", default=None
+)
+
+
+@contextmanager
+def recording(metrics: Optional[RunMetrics]) -> Iterator[Optional[RunMetrics]]:
+    """Record measurements made in this context into metrics"""
+    if metrics is None:
+        yield None
+        return
+    token = _current_metrics.set(metrics)
+    starts = _stage_starts.set({})
+    stage_attributes = _stage_attributes.set({})
+    try:
+        yield metrics
+    finally:
+        _stage_attributes.reset(stage_attributes)
+        _stage_starts.reset(starts)
+        _current_metrics.reset(token)
+
+
+def current_metrics() -> Optional[RunMetrics]:
+    return _current_metrics.get()
+
+
+def record(kind: str, name: str, seconds: float, **attributes) -> None:
+    """Add a record to the active RunMetrics, if any"""
+    metrics = _current_metrics.get()
+    if metrics is not None:
+        attributes.setdefault("stage", current_stage())
+        metrics.record(kind, name, seconds, **attributes)
+
+
+@contextmanager
+def measure(kind: str, name: str, **attributes) -> Iterator[Dict[str, Any]]:
+    """Time a block; attributes added to the yielded dict are recorded with it"""
+    if _current_metrics.get() is None:
+        yield attributes
+        return
+    started = time.perf_counter()
+    span = _current_span.set(attributes)
+    try:
+        yield attributes
+    except Exception as e:
+        attributes.setdefault("error", type(e).__name__)
+        raise
+    finally:
+        _current_span.reset(span)
+        record(kind, name, time.perf_counter() - started, **attributes)
+
+
+def annotate(**attributes) -> None:
+    """Attach attributes to the innermost active measure() block, if any"""
+    span = _current_span.get()
+    if span is not None:
+        span.update(attributes)
+
+
+def stage_started(stage: str) -> None:
+    starts = _stage_starts.get()
+    if starts is not None:
+        starts[stage] = time.perf_counter()
+
+
+def annotate_stage(stage: str, **attributes) -> None:
+    """Attach attributes to the record written when stage finishes"""
+    pending = _stage_attributes.get()
+    if pending is not None:
+        pending.setdefault(stage, {}).update(attributes)
+
+
+def stage_finished(stage: str, **attributes) -> None:
+    starts = _stage_starts.get()
+    if starts is not None and stage in starts:
+        pending = _stage_attributes.get()
+        if pending and stage in pending:
+            attributes = {**pending.pop(stage), **attributes}
+        record(STAGE, stage, time.perf_counter() - starts.pop(stage), **attributes)
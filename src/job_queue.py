@@ -0,0 +1,222 @@
+"""
+ResearchScope AI - Job Queue
+Runs analyses on a local worker pool and persists jobs to SQLite so that
+callers (such as Streamlit sessions) can submit work, go away, and fetch the
+result later by job id.
+"""
+
+import hashlib
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional
+
+from sqlalchemy import Column, Float, MetaData, String, Table, Text, select, update
+
+from analysis_events import ERROR, RESULT, STAGE_STARTED, TOKEN, AnalysisEvent
+from analysis_result import AnalysisResult
+from analysis_pipeline import AnalysisPipeline
+from sqlite_store import create_sqlite_engine
+
+DEFAULT_JOBS_PATH = os.path.join(".cache", "jobs.db")
+DEFAULT_WORKERS = 2
+MAX_BUFFERED_EVENTS = 5000
+MAX_TRACKED_JOBS = 100
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+IN_FLIGHT = (QUEUED, RUNNING)
+
+metadata = MetaData()
+
+jobs_table = Table(
+    "jobs",
+    metadata,
+    Column("id", String(32), primary_key=True),
+    Column("fingerprint", String(64), nullable=False, index=True),
+    Column("description", Text, nullable=False),
+    Column("mode", String(16), nullable=False),
+    Column("status", String(16), nullable=False, index=True),
+    Column("stage", String(32)),
+    Column("result", Text),
+    Column("error", Text),
+    Column("created_at", Float, nullable=False),
+    Column("started_at", Float),
+    Column("finished_at", Float),
+)
+
+
+def job_fingerprint(description: str, mode: str) -> str:
+    """Identical submissions share a fingerprint (whitespace is ignored)"""
+    normalized = " ".join(description.split())
+    return hashlib.sha256(f"{mode}\n{normalized}".encode("utf-8")).hexdigest()
+
+
+class JobQueue:
+    """Bounded worker pool executing analysis jobs persisted in SQLite.
+
+    Submitting a description that is already queued or running returns the
+    existing job id instead of starting a second analysis. Jobs left queued
+    or running by a previous process are resubmitted on start-up.
+    """
+
+    def __init__(self, path: str = DEFAULT_JOBS_PATH, max_workers: int = DEFAULT_WORKERS):
+        self.engine = create_sqlite_engine(path)
+        metadata.create_all(self.engine)
+
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis-job")
+        self._submit_lock = threading.Lock()
+        # Job id -> buffered events, touched by submitters and workers alike
+        self._events = OrderedDict()
+        self._events_lock = threading.Lock()
+        self.pipeline = AnalysisPipeline(size=max_workers)
+        self._recover()
+
+    def _recover(self) -> None:
+        with self.engine.begin() as conn:
+            rows = conn.execute(
+                select(jobs_table.c.id).where(jobs_table.c.status.in_(IN_FLIGHT))
+            ).all()
+            conn.execute(
+                update(jobs_table)
+                .where(jobs_table.c.status == RUNNING)
+                .values(status=QUEUED, stage=None, started_at=None)
+            )
+        for row in rows:
+            self._track(row.id)
+            self._executor.submit(self._run, row.id)
+
+    def _track(self, job_id: str) -> List[AnalysisEvent]:
+        """The job's event buffer, started if needed; the oldest buffers are forgotten"""
+        with self._events_lock:
+            buffer = self._events.get(job_id)
+            if buffer is None:
+                buffer = self._events[job_id] = []
+                while len(self._events) > MAX_TRACKED_JOBS:
+                    self._events.popitem(last=False)
+            return buffer
+
+    def submit(self, description: str, mode: str = "sequential") -> str:
+        """Queue an analysis and return its job id (deduplicated while in flight)"""
+        fingerprint = job_fingerprint(description, mode)
+        with self._submit_lock:
+            with self.engine.begin() as conn:
+                existing = conn.execute(
+                    select(jobs_table.c.id)
+                    .where(jobs_table.c.fingerprint == fingerprint)
+                    .where(jobs_table.c.status.in_(IN_FLIGHT))
+                ).first()
+                if existing is not None:
+                    return existing.id
+
+                job_id = uuid.uuid4().hex
+                conn.execute(jobs_table.insert().values(
+                    id=job_id,
+                    fingerprint=fingerprint,
+                    description=description,
+                    mode=mode,
+                    status=QUEUED,
+                    created_at=time.time(),
+                ))
+
+        self._track(job_id)
+        self._executor.submit(self._run, job_id)
+        return job_id
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """Return the job record (status, stage, result, error, timings) or None"""
+        with self.engine.connect() as conn:
+            row = conn.execute(select(jobs_table).where(jobs_table.c.id == job_id)).first()
+        return dict(row._mapping) if row is not None else None
+
+    def result(self, job_id: str) -> Optional[AnalysisResult]:
+        """The finished job's AnalysisResult, or None if it has none (yet)"""
+        job = self.get(job_id)
+        if job is None or job["status"] != DONE:
+            return None
+        return AnalysisResult.from_stored(job["result"])
+
+    def list_jobs(self, limit: int = 20) -> List[dict]:
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(jobs_table).order_by(jobs_table.c.created_at.desc()).limit(limit)
+            ).all()
+        return [dict(row._mapping) for row in rows]
+
+    def events(self, job_id: str, since: int = 0) -> List[AnalysisEvent]:
+        """Progress events buffered for a job by this process, from index since"""
+        with self._events_lock:
+            return list(self._events.get(job_id, [])[since:])
+
+    def iter_events(self, job_id: str, poll_interval: float = 0.25) -> Iterator[AnalysisEvent]:
+        """Yield a job's events until it finishes, ending with RESULT or ERROR"""
+        cursor = 0
+        while True:
+            for event in self.events(job_id, cursor):
+                cursor += 1
+                if event.type not in (RESULT, ERROR):
+                    yield event
+
+            job = self.get(job_id)
+            if job is None:
+                yield AnalysisEvent(type=ERROR, text=f"Unknown job: {job_id}")
+                return
+            if job["status"] == DONE:
+                result = AnalysisResult.from_stored(job["result"])
+                yield AnalysisEvent(type=RESULT, text=str(result), data=result)
+                return
+            if job["status"] == FAILED:
+                yield AnalysisEvent(type=ERROR, text=job["error"], data=RuntimeError(job["error"]))
+                return
+            time.sleep(poll_interval)
+
+    def wait(self, job_id: str, timeout: Optional[float] = None, poll_interval: float = 0.25) -> dict:
+        """Block until the job finishes (or timeout) and return its record"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or job["status"] not in IN_FLIGHT:
+                return job
+            if deadline is not None and time.monotonic() >= deadline:
+                return job
+            time.sleep(poll_interval)
+
+    def _set(self, job_id: str, **values) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(update(jobs_table).where(jobs_table.c.id == job_id).values(**values))
+
+    def _run(self, job_id: str) -> None:
+        job = self.get(job_id)
+        if job is None or job["status"] != QUEUED:
+            return
+
+        buffer = self._track(job_id)
+
+        def record(event):
+            # An evicted job's buffer is no longer read; appending to it is harmless
+            with self._events_lock:
+                if event.type == TOKEN and len(buffer) >= MAX_BUFFERED_EVENTS:
+                    return
+                buffer.append(event)
+            if event.type == STAGE_STARTED:
+                self._set(job_id, stage=event.stage)
+
+        self._set(job_id, status=RUNNING, started_at=time.time())
+        try:
+            result = self.pipeline.analyze(
+                job["description"],
+                mode=job["mode"],
+                on_event=record,
+            )
+            self._set(job_id, status=DONE, result=result.to_json(), finished_at=time.time())
+        except Exception as e:
+            self._set(job_id, status=FAILED, error=str(e), finished_at=time.time())
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
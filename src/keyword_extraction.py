@@ -0,0 +1,275 @@
+"""
+ResearchScope AI - Keyword Extraction
+Local keyword extraction for the first analysis stage: RAKE candidate phrases
+scored with TF-IDF weights learnt from previously analysed descriptions. It
+takes milliseconds, so with KEYWORD_MODE=auto the keyword agent's LLM round
+trip is only needed when the local result does not look reliable.
+"""
+
+import math
+import os
+import re
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table, select
+from sqlalchemy.dialects.sqlite import insert
+
+from similarity_index import description_id
+from sqlite_store import SQLiteStore, env_flag
+
+LLM_MODE = "llm"
+LOCAL_MODE = "local"
+AUTO_MODE = "auto"
+MODES = (LLM_MODE, LOCAL_MODE, AUTO_MODE)
+
+DEFAULT_CORPUS_PATH = os.path.join(".cache", "keyword_corpus.db")
+DEFAULT_MIN_CONFIDENCE = 0.5
+DEFAULT_LIMIT = 8
+MIN_PHRASES = 3
+MAX_PHRASE_WORDS = 3
+
+# Function words, plus words project descriptions use for everything
+STOPWORDS = frozenset("""
+a about above across after again against all also an and any are as at be because been
+before being below between both but by can could did do does doing down during each
+either etc every few for from further had has have having how however i if in into is it
+its itself just may me might more most must my no nor not of off on once only or other
+our out over own per same shall she should so some such than that the their them then
+there these they this those through to too under until up upon us very via was we were
+what when where which while who whom why will with within without would you your
+like something anything thing things lot lots really good great nice cool
+able allow allows based build building capable create design develop developing
+different e g ensure existing help including ie make making multiple new project provide
+provides providing support supports system systems use used uses using way well
+want wants need needs stuff helps better faster easier
+""".split())
+
+# Verbs (and adverbs) that open requirement bullets ("Monitor patient vital
+# signs"); a phrase never starts with one, so it is dropped from the front
+LEADING_WORDS = frozenset("""
+adapt analyse analyze apply assist automate automatically calculate classify collect
+combine compare compute connect continuously convert deliver detect enable estimate
+evaluate explore extract find forecast generate get handle identify implement improve
+integrate learn manage measure monitor optimise optimize predict process produce
+recommend reduce run schedule send share show simulate store suggest track train
+transform understand visualise visualize
+""".split())
+
+TOKEN = re.compile(r"[a-z0-9][a-z0-9+#\-]*[a-z0-9+#]|[a-z0-9]")
+# Phrases never cross punctuation, list markers or line breaks
+DELIMITER = re.compile(r"[.,;:!?()\[\]{}\"'\n\r\t/|]|\s-\s|^\s*\d+[.)]", re.MULTILINE)
+
+metadata = MetaData()
+
+documents_table = Table(
+    "keyword_documents",
+    metadata,
+    Column("id", String(64), primary_key=True),
+    Column("created_at", Float, nullable=False),
+)
+
+terms_table = Table(
+    "keyword_terms",
+    metadata,
+    Column("term", String, primary_key=True),
+    Column("df", Integer, nullable=False),
+)
+
+
+def candidate_phrases(text: str) -> List[List[str]]:
+    """RAKE candidates: runs of content words between stopwords and punctuation.
+
+    Numbers and single characters end a run like stopwords do, leading verbs
+    are dropped, and runs longer than MAX_PHRASE_WORDS are cut into
+    consecutive pieces.
+    """
+    phrases = []
+    for fragment in DELIMITER.split(text.lower()):
+        run: List[str] = []
+        for word in TOKEN.findall(fragment) + [""]:
+            if len(word) > 1 and word not in STOPWORDS and not word.isdigit():
+                if run or word not in LEADING_WORDS:
+                    run.append(word)
+                continue
+            phrases.extend(run[i:i + MAX_PHRASE_WORDS] for i in range(0, len(run), MAX_PHRASE_WORDS))
+            run = []
+    return phrases
+
+
+class KeywordCorpus(SQLiteStore):
+    """Document frequencies of terms over analysed descriptions, kept in SQLite.
+
+    Each distinct description is counted once. Frequencies are loaded into
+    memory on first use and kept in step with add().
+    """
+
+    metadata = metadata
+
+    def __init__(self, path: str = DEFAULT_CORPUS_PATH, enabled: bool = True):
+        super().__init__(path, enabled)
+        self._df: Optional[Dict[str, int]] = None
+        self._documents = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "KeywordCorpus":
+        """Build a corpus from the KEYWORD_CORPUS_* environment variables"""
+        return cls(
+            path=os.getenv("KEYWORD_CORPUS_PATH", DEFAULT_CORPUS_PATH),
+            enabled=not env_flag("KEYWORD_CORPUS_BYPASS"),
+        )
+
+    def _load(self) -> None:
+        """Read the frequencies into memory (called with the lock held)"""
+        if self._df is not None:
+            return
+        with self.engine.connect() as conn:
+            self._documents = len(conn.execute(select(documents_table.c.id)).all())
+            self._df = {row.term: row.df for row in conn.execute(select(terms_table))}
+
+    @property
+    def documents(self) -> int:
+        if not self.enabled:
+            return 0
+        with self._lock:
+            self._load()
+            return self._documents
+
+    def idf(self, terms: Sequence[str]) -> np.ndarray:
+        """Smoothed inverse document frequency of each term: ln((1 + N) / (1 + df)) + 1"""
+        if not self.enabled:
+            return np.ones(len(terms))
+        with self._lock:
+            self._load()
+            df = np.fromiter((self._df.get(term, 0) for term in terms), dtype=np.float64,
+                             count=len(terms))
+            documents = self._documents
+        return np.log((1 + documents) / (1 + df)) + 1
+
+    def coverage(self, terms: Sequence[str]) -> float:
+        """Share of terms seen in at least one analysed description (0 without any)"""
+        if not self.enabled or not terms:
+            return 0.0
+        with self._lock:
+            self._load()
+            return sum(1 for term in terms if term in self._df) / len(terms)
+
+    def add(self, description: str) -> None:
+        """Count a description's terms, unless it was added before"""
+        if not self.enabled:
+            return
+        terms = sorted({word for phrase in candidate_phrases(description) for word in phrase})
+        with self._lock:
+            self._load()
+            with self.engine.begin() as conn:
+                added = conn.execute(
+                    insert(documents_table)
+                    .values(id=description_id(description), created_at=time.time())
+                    .on_conflict_do_nothing()
+                ).rowcount
+                if not added:
+                    return
+                if terms:
+                    statement = insert(terms_table)
+                    conn.execute(
+                        statement.on_conflict_do_update(
+                            index_elements=[terms_table.c.term],
+                            set_={"df": terms_table.c.df + 1},
+                        ),
+                        [{"term": term, "df": 1} for term in terms],
+                    )
+            self._documents += 1
+            for term in terms:
+                self._df[term] = self._df.get(term, 0) + 1
+
+
+class LocalKeywords(NamedTuple):
+    """Keywords found without the LLM and how far to trust them"""
+
+    keywords: List[str]
+    confidence: float
+
+    @property
+    def text(self) -> str:
+        """The keywords in the keyword agent's comma-separated output format"""
+        return ", ".join(self.keywords)
+
+
+def extract_keywords(text: str, corpus: Optional[KeywordCorpus] = None,
+                     limit: int = DEFAULT_LIMIT) -> LocalKeywords:
+    """Top phrases of text by RAKE score, with words weighted by corpus IDF.
+
+    A word scores degree / frequency (how much of the phrases it appears in
+    it makes up) times its IDF; a phrase scores the sum of its words, scaled
+    by how often the phrase recurs. Phrases contained in a better one are
+    skipped. Ties keep text order, so the result is deterministic.
+
+    confidence is 0 unless at least MIN_PHRASES of the keywords are
+    multi-word phrases (lone words are often too generic to search on).
+    Otherwise it is the share of keywords that are phrases times the share
+    of the phrases' words the corpus has seen: IDF cannot tell a specific
+    term from a typo or filler for words it has never seen, so it is 0
+    without a corpus.
+    """
+    phrases = candidate_phrases(text)
+    if not phrases:
+        return LocalKeywords([], 0.0)
+
+    # Phrase x word incidence in CSR form: word_ids are the column indices,
+    # offsets the row pointers
+    vocabulary: Dict[str, int] = {}
+    word_ids = np.fromiter((vocabulary.setdefault(word, len(vocabulary))
+                            for phrase in phrases for word in phrase), dtype=np.int64)
+    lengths = np.fromiter((len(phrase) for phrase in phrases), dtype=np.int64, count=len(phrases))
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+    frequency = np.bincount(word_ids, minlength=len(vocabulary))
+    degree = np.bincount(word_ids, weights=np.repeat(lengths, lengths), minlength=len(vocabulary))
+    idf = corpus.idf(list(vocabulary)) if corpus is not None else np.ones(len(vocabulary))
+    word_scores = degree / frequency * idf
+    phrase_scores = np.add.reduceat(word_scores[word_ids], offsets)
+
+    first: Dict[str, int] = {}
+    counts: Dict[str, int] = {}
+    for i, phrase in enumerate(phrases):
+        key = " ".join(phrase)
+        first.setdefault(key, i)
+        counts[key] = counts.get(key, 0) + 1
+    distinct = list(first)
+    scores = np.array([phrase_scores[first[key]] * (1 + math.log(counts[key])) for key in distinct])
+
+    selected: List[str] = []
+    for index in sorted(range(len(distinct)), key=lambda i: (-scores[i], first[distinct[i]])):
+        words = set(distinct[index].split())
+        if any(words <= set(chosen.split()) for chosen in selected):
+            continue
+        selected.append(distinct[index])
+        if len(selected) >= limit:
+            break
+
+    multi_word = [keyword for keyword in selected if " " in keyword]
+    confidence = 0.0
+    if len(multi_word) >= MIN_PHRASES and corpus is not None:
+        words = sorted({word for keyword in multi_word for word in keyword.split()})
+        confidence = len(multi_word) / len(selected) * corpus.coverage(words)
+    return LocalKeywords(selected, round(confidence, 4))
+
+
+def keyword_mode(mode: Optional[str] = None) -> str:
+    """The keyword mode to use: mode if given, else KEYWORD_MODE (default llm).
+
+    llm always runs the keyword agent; local uses the local keywords
+    whenever any are found; auto uses them when their confidence reaches
+    KEYWORD_MIN_CONFIDENCE and falls back to the agent otherwise.
+    """
+    mode = (mode or os.getenv("KEYWORD_MODE") or LLM_MODE).strip().lower()
+    if mode not in MODES:
+        raise ValueError(f"Unknown keyword mode {mode!r}; use one of {', '.join(MODES)}")
+    return mode
+
+
+def min_confidence() -> float:
+    return float(os.getenv("KEYWORD_MIN_CONFIDENCE", DEFAULT_MIN_CONFIDENCE))
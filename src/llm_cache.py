@@ -0,0 +1,183 @@
+"""
+ResearchScope AI - LLM Response Cache
+Persistent, content-addressed cache for Gemini responses backed by SQLite.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import List, Optional
+
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table, Text, delete, func, select, update
+
+from sqlite_store import SQLiteStore, env_flag, evict, is_expired
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "llm_responses.db")
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 10000
+
+metadata = MetaData()
+
+responses_table = Table(
+    "llm_responses",
+    metadata,
+    Column("key", String(64), primary_key=True),
+    Column("model_name", String(128), nullable=False),
+    Column("temperature", Float, nullable=False),
+    Column("response", Text, nullable=False),
+    Column("created_at", Float, nullable=False),
+    Column("last_accessed", Float, nullable=False, index=True),
+    Column("hit_count", Integer, nullable=False, default=0),
+)
+
+
+class ResponseCache(SQLiteStore):
+    """On-disk LLM response cache with TTL expiry and LRU eviction.
+
+    Entries are keyed on the model name, the temperature and a SHA-256 hash
+    of the prompt (plus stop sequences, since they change the output).
+    """
+
+    metadata = metadata
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        enabled: bool = True,
+    ):
+        super().__init__(path, enabled)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        """Build a cache from the LLM_CACHE_* environment variables"""
+        ttl = os.getenv("LLM_CACHE_TTL")
+        return cls(
+            path=os.getenv("LLM_CACHE_PATH", DEFAULT_CACHE_PATH),
+            ttl_seconds=float(ttl) if ttl else DEFAULT_TTL_SECONDS,
+            max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+            enabled=not env_flag("LLM_CACHE_BYPASS"),
+        )
+
+    @staticmethod
+    def make_key(
+        model_name: str,
+        temperature: float,
+        prompt: str,
+        stop: Optional[List[str]] = None,
+    ) -> str:
+        """Return the content address for a prompt"""
+        prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        payload = json.dumps(
+            [model_name, float(temperature), prompt_hash, list(stop or [])],
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(
+        self,
+        model_name: str,
+        temperature: float,
+        prompt: str,
+        stop: Optional[List[str]] = None,
+    ) -> Optional[str]:
+        """Return the cached response, or None on a miss or when bypassed"""
+        if not self.enabled:
+            return None
+
+        key = self.make_key(model_name, temperature, prompt, stop)
+        now = time.time()
+        with self.engine.begin() as conn:
+            row = conn.execute(
+                select(responses_table.c.response, responses_table.c.created_at)
+                .where(responses_table.c.key == key)
+            ).first()
+
+            if row is not None and is_expired(row.created_at, now, self.ttl_seconds):
+                conn.execute(delete(responses_table).where(responses_table.c.key == key))
+                row = None
+
+            if row is None:
+                self._count(hit=False)
+                return None
+
+            conn.execute(
+                update(responses_table)
+                .where(responses_table.c.key == key)
+                .values(
+                    last_accessed=now,
+                    hit_count=responses_table.c.hit_count + 1,
+                )
+            )
+
+        self._count(hit=True)
+        return row.response
+
+    def set(
+        self,
+        model_name: str,
+        temperature: float,
+        prompt: str,
+        response: str,
+        stop: Optional[List[str]] = None,
+    ) -> None:
+        """Store a response and evict entries beyond the size bound"""
+        if not self.enabled:
+            return
+
+        key = self.make_key(model_name, temperature, prompt, stop)
+        now = time.time()
+        with self.engine.begin() as conn:
+            conn.execute(delete(responses_table).where(responses_table.c.key == key))
+            conn.execute(
+                responses_table.insert().values(
+                    key=key,
+                    model_name=model_name,
+                    temperature=float(temperature),
+                    response=response,
+                    created_at=now,
+                    last_accessed=now,
+                    hit_count=0,
+                )
+            )
+            evict(conn, responses_table, responses_table.c.key, responses_table.c.created_at,
+                  responses_table.c.last_accessed, now, self.ttl_seconds, self.max_entries)
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def clear(self) -> None:
+        """Remove every cached response"""
+        if not self.enabled:
+            return
+        with self.engine.begin() as conn:
+            conn.execute(delete(responses_table))
+
+    def __len__(self) -> int:
+        if not self.enabled:
+            return 0
+        with self.engine.connect() as conn:
+            return conn.execute(select(func.count()).select_from(responses_table)).scalar()
+
+    @property
+    def stats(self) -> dict:
+        """Hit/miss counters for this process"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self),
+        }
@@ -0,0 +1,333 @@
+"""
+ResearchScope AI - LLM Retry Policy
+Error classification, exponential backoff with jitter inside a deadline, a
+per-model circuit breaker and optional hedged requests for Gemini calls.
+"""
+
+import asyncio
+import contextvars
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+import requests
+from google.api_core import exceptions as api_exceptions
+from google.generativeai.types import BlockedPromptException, StopCandidateException
+
+from instrumentation import annotate
+
+T = TypeVar("T")
+
+# Transient server-side conditions worth another attempt
+RETRYABLE_ERRORS = (
+    api_exceptions.ResourceExhausted,   # 429 / quota
+    api_exceptions.TooManyRequests,
+    api_exceptions.ServiceUnavailable,  # 503
+    api_exceptions.InternalServerError,  # 500
+    api_exceptions.BadGateway,
+    api_exceptions.GatewayTimeout,
+    api_exceptions.DeadlineExceeded,
+    api_exceptions.Aborted,
+    api_exceptions.Unknown,
+    requests.ConnectionError,
+    requests.Timeout,
+    ConnectionError,
+    TimeoutError,
+)
+
+# Errors another attempt cannot fix: bad requests, auth, blocked content
+FATAL_ERRORS = (
+    api_exceptions.InvalidArgument,
+    api_exceptions.PermissionDenied,
+    api_exceptions.Unauthenticated,
+    api_exceptions.NotFound,
+    api_exceptions.FailedPrecondition,
+    BlockedPromptException,
+    StopCandidateException,
+)
+
+
+class LLMError(RuntimeError):
+    """A Gemini call failed for good; raised instead of returning error text"""
+
+    def __init__(self, message: str, retryable: bool = False, attempts: int = 1):
+        super().__init__(message)
+        self.retryable = retryable
+        self.attempts = attempts
+
+
+class CircuitOpenError(LLMError):
+    """The model's circuit breaker is open, so the call was not attempted"""
+
+
+def is_retryable(error: BaseException) -> bool:
+    if isinstance(error, FATAL_ERRORS):
+        return False
+    return isinstance(error, RETRYABLE_ERRORS)
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, bounded by attempts and a deadline.
+
+    Args:
+        max_attempts: Total attempts including the first.
+        base_delay: Backoff ceiling for the first retry, doubled each retry.
+        max_delay: Largest single backoff.
+        deadline: Seconds from the first attempt after which no retry starts.
+    """
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 0.5,
+                 max_delay: float = 8.0, deadline: float = 60.0, rng: Optional[random.Random] = None):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self._random = rng or random.Random()
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        return cls(
+            max_attempts=int(os.getenv("LLM_MAX_ATTEMPTS", "4")),
+            deadline=float(os.getenv("LLM_DEADLINE", "60")),
+        )
+
+    def backoff(self, retry: int) -> float:
+        """Delay before retry number retry (1-based)"""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (retry - 1)))
+        return self._random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """Stops calling a model after consecutive retryable failures.
+
+    After failure_threshold failures in a row the breaker opens and calls fail
+    fast. Once reset_timeout has passed a single trial call is let through;
+    its success closes the breaker, its failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = 0.0
+        self._state = self.CLOSED
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if time.monotonic() - self.opened_at < self.reset_timeout or self._trial_in_flight:
+                return False
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._state = self.CLOSED
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def circuit_breaker_for(model_name: str) -> CircuitBreaker:
+    """The process-wide circuit breaker for a model"""
+    with _breakers_lock:
+        if model_name not in _breakers:
+            _breakers[model_name] = CircuitBreaker()
+        return _breakers[model_name]
+
+
+class LatencyTracker:
+    """Recent successful call latencies, used to decide when to hedge"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20, quantile: float = 0.95):
+        self.min_samples = min_samples
+        self.quantile = quantile
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def threshold(self) -> Optional[float]:
+        """The p95 latency, or None until enough samples have been seen"""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(self.quantile * len(ordered)))]
+
+
+_hedge_executor: Optional[ThreadPoolExecutor] = None
+_hedge_lock = threading.Lock()
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _hedge_executor
+    with _hedge_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="llm-hedge")
+        return _hedge_executor
+
+
+def hedged(call: Callable[[], T], after: float) -> T:
+    """Run call; if it has not finished after `after` seconds, race a duplicate.
+
+    The first successful result wins. The loser is left to finish in the
+    background (Gemini requests cannot be cancelled), so hedging trades some
+    extra quota for a shorter tail.
+    """
+    executor = _executor()
+    futures = {executor.submit(contextvars.copy_context().run, call)}
+    done, _ = wait(futures, timeout=after)
+    if not done:
+        annotate(hedged=True)
+        futures.add(executor.submit(contextvars.copy_context().run, call))
+
+    error = None
+    pending = futures
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+            error = future.exception()
+    raise error
+
+
+async def ahedged(call: Callable[[], Awaitable[T]], after: float) -> T:
+    """Async hedged(): the losing request is cancelled once a winner returns"""
+    tasks = {asyncio.ensure_future(call())}
+    done, _ = await asyncio.wait(tasks, timeout=after)
+    if not done:
+        annotate(hedged=True)
+        tasks.add(asyncio.ensure_future(call()))
+
+    error = None
+    pending = tasks
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if task.exception() is None:
+                for loser in pending:
+                    loser.cancel()
+                return task.result()
+            error = task.exception()
+    raise error
+
+
+def _check_breaker(breaker: Optional[CircuitBreaker], attempt: int) -> None:
+    if breaker is not None and not breaker.allow():
+        raise CircuitOpenError("Circuit breaker open: the model is failing, not calling it",
+                               retryable=True, attempts=attempt - 1)
+
+
+def _record_success(breaker, latency, attempt_started: float) -> None:
+    if breaker is not None:
+        breaker.record_success()
+    if latency is not None:
+        latency.observe(time.monotonic() - attempt_started)
+
+
+def _record_failure(error: Exception, attempt: int, started: float, policy: RetryPolicy,
+                    breaker: Optional[CircuitBreaker], on_retry) -> float:
+    """Account for a failed attempt; return the backoff delay or raise LLMError"""
+    retryable = is_retryable(error)
+    if breaker is not None:
+        # Only service-side trouble counts against the model
+        if retryable:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+    delay = policy.backoff(attempt)
+    elapsed = time.monotonic() - started
+    if not retryable or attempt >= policy.max_attempts or elapsed + delay > policy.deadline:
+        raise LLMError(f"Gemini request failed after {attempt} attempt(s): "
+                       f"{type(error).__name__}: {error}", retryable=retryable,
+                       attempts=attempt) from error
+    if on_retry is not None:
+        on_retry(attempt, error, delay)
+    return delay
+
+
+def call_with_retries(
+    call: Callable[[], T],
+    policy: RetryPolicy,
+    breaker: Optional[CircuitBreaker] = None,
+    latency: Optional[LatencyTracker] = None,
+    on_retry: Optional[Callable[[int, BaseException, float], None]] = None,
+) -> T:
+    """Call with retries on retryable errors, raising LLMError when giving up.
+
+    With a LatencyTracker, attempts that run past the tracked p95 are hedged.
+    on_retry(retry_number, error, delay) is called before each backoff sleep.
+    """
+    started = time.monotonic()
+    attempt = 0
+    while True:
+        attempt += 1
+        _check_breaker(breaker, attempt)
+        attempt_started = time.monotonic()
+        try:
+            threshold = latency.threshold() if latency is not None else None
+            result = hedged(call, threshold) if threshold is not None else call()
+        except Exception as e:
+            time.sleep(_record_failure(e, attempt, started, policy, breaker, on_retry))
+            continue
+        _record_success(breaker, latency, attempt_started)
+        return result
+
+
+async def acall_with_retries(
+    call: Callable[[], Awaitable[T]],
+    policy: RetryPolicy,
+    breaker: Optional[CircuitBreaker] = None,
+    latency: Optional[LatencyTracker] = None,
+    on_retry: Optional[Callable[[int, BaseException, float], None]] = None,
+) -> T:
+    """Async call_with_retries(); backoff waits without blocking the event loop"""
+    started = time.monotonic()
+    attempt = 0
+    while True:
+        attempt += 1
+        _check_breaker(breaker, attempt)
+        attempt_started = time.monotonic()
+        try:
+            threshold = latency.threshold() if latency is not None else None
+            result = await (ahedged(call, threshold) if threshold is not None else call())
+        except Exception as e:
+            await asyncio.sleep(_record_failure(e, attempt, started, policy, breaker, on_retry))
+            continue
+        _record_success(breaker, latency, attempt_started)
+        return result
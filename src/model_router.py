@@ -0,0 +1,178 @@
+"""
+ResearchScope AI - Model Router
+Per-agent model configuration: which Gemini models each agent role may use,
+at what temperature, and which one a call goes to given its prompt size,
+the route's cost and latency budget and the models' health.
+
+Keyword extraction and research run on a cheap, fast model; summarisation
+and validation prefer a stronger one. Every route lists fallbacks that take
+over when the preferred model is overloaded.
+"""
+
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from instrumentation import estimate_tokens
+from llm_retry import CircuitBreaker, LatencyTracker, RetryPolicy, circuit_breaker_for
+
+LITE_MODEL = "gemini-2.5-flash-lite-preview-06-17"
+FLASH_MODEL = "gemini-2.5-flash"
+PRO_MODEL = "gemini-2.5-pro"
+
+# Models other than the last in a route get this many attempts before the
+# call moves on, so an overloaded model is abandoned quickly
+FAILOVER_ATTEMPTS = 2
+FAILOVER_DEADLINE = 10.0
+
+# Output length assumed when estimating the cost of a call
+EXPECTED_OUTPUT_TOKENS = 600
+
+
+@dataclass(frozen=True)
+class ModelProfile:
+    """List prices of a model, in USD per million tokens"""
+
+    name: str
+    input_cost: float
+    output_cost: float
+
+    def cost(self, prompt_tokens: int, completion_tokens: int) -> float:
+        return (prompt_tokens * self.input_cost + completion_tokens * self.output_cost) / 1e6
+
+
+MODELS: Dict[str, ModelProfile] = {
+    profile.name: profile for profile in (
+        ModelProfile(LITE_MODEL, input_cost=0.10, output_cost=0.40),
+        ModelProfile("gemini-2.5-flash-lite", input_cost=0.10, output_cost=0.40),
+        ModelProfile(FLASH_MODEL, input_cost=0.30, output_cost=2.50),
+        ModelProfile(PRO_MODEL, input_cost=1.25, output_cost=10.00),
+    )
+}
+
+
+@dataclass(frozen=True)
+class Route:
+    """Models an agent role may use, in order of preference.
+
+    max_cost (USD per call) and max_latency (seconds, median of recent calls)
+    are the route's budget: a model expected to exceed either for a prompt is
+    tried only after the models within budget.
+    """
+
+    models: Tuple[str, ...]
+    temperature: float
+    max_cost: Optional[float] = None
+    max_latency: Optional[float] = None
+
+
+DEFAULT_ROUTES: Dict[str, Route] = {
+    "keyword_extractor": Route((LITE_MODEL, FLASH_MODEL), temperature=0.1),
+    "researcher": Route((LITE_MODEL, FLASH_MODEL), temperature=0.7),
+    "summarizer": Route((FLASH_MODEL, LITE_MODEL), temperature=0.7, max_cost=0.01),
+    "validator": Route((FLASH_MODEL, LITE_MODEL), temperature=0.3, max_cost=0.01),
+}
+
+
+def estimate_cost(model_name: str, prompt_tokens: int, completion_tokens: int) -> Optional[float]:
+    """Cost of a call in USD, or None for a model without a price"""
+    profile = MODELS.get(model_name)
+    return profile.cost(prompt_tokens, completion_tokens) if profile is not None else None
+
+
+def parse_routes(spec: str, base: Optional[Dict[str, Route]] = None) -> Dict[str, Route]:
+    """Routes from LLM_ROUTES, e.g. "keyword_extractor=gemini-2.5-flash-lite@0.1;
+    summarizer=gemini-2.5-pro,gemini-2.5-flash". Roles not mentioned keep
+    their route from base; a route without @temperature keeps its temperature.
+    """
+    routes = dict(DEFAULT_ROUTES if base is None else base)
+    for entry in spec.split(";"):
+        if not entry.strip():
+            continue
+        role, _, models = entry.partition("=")
+        role = role.strip()
+        models, _, temperature = models.partition("@")
+        names = tuple(name.strip() for name in models.split(",") if name.strip())
+        if not role or not names:
+            raise ValueError(f"Invalid LLM_ROUTES entry {entry!r}; use role=model[,fallback...][@temperature]")
+        current = routes.get(role, Route(names, temperature=0.7))
+        routes[role] = Route(names, float(temperature) if temperature else current.temperature,
+                             current.max_cost, current.max_latency)
+    return routes
+
+
+class ModelRouter:
+    """Chooses the models to try for an agent role's call, best first.
+
+    The route's models are ordered by preference, then models over the
+    budget for this prompt (estimated cost, median latency) move behind
+    those within it, and models whose circuit breaker is open move last.
+    The last candidate is still tried: a call is never refused outright.
+
+    Args:
+        routes: Route per agent role (default: DEFAULT_ROUTES).
+        max_cost: Budget in USD per call for routes that set none.
+        max_latency: Budget in seconds per call for routes that set none.
+    """
+
+    def __init__(self, routes: Optional[Dict[str, Route]] = None,
+                 max_cost: Optional[float] = None, max_latency: Optional[float] = None):
+        self.routes = dict(routes or DEFAULT_ROUTES)
+        self.max_cost = max_cost
+        self.max_latency = max_latency
+        self._latency: Dict[str, LatencyTracker] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ModelRouter":
+        max_cost = os.getenv("LLM_MAX_CALL_COST")
+        max_latency = os.getenv("LLM_MAX_LATENCY")
+        return cls(
+            routes=parse_routes(os.getenv("LLM_ROUTES", "")),
+            max_cost=float(max_cost) if max_cost else None,
+            max_latency=float(max_latency) if max_latency else None,
+        )
+
+    def route(self, role: str) -> Route:
+        try:
+            return self.routes[role]
+        except KeyError:
+            raise ValueError(f"No model route for agent role {role!r}") from None
+
+    def _tracker(self, model_name: str) -> LatencyTracker:
+        with self._lock:
+            if model_name not in self._latency:
+                self._latency[model_name] = LatencyTracker(window=50, min_samples=5, quantile=0.5)
+            return self._latency[model_name]
+
+    def observe(self, model_name: str, seconds: float) -> None:
+        """Record the latency of a successful call"""
+        self._tracker(model_name).observe(seconds)
+
+    def within_budget(self, route: Route, model_name: str, prompt_tokens: int) -> bool:
+        max_cost = route.max_cost if route.max_cost is not None else self.max_cost
+        if max_cost is not None:
+            cost = estimate_cost(model_name, prompt_tokens, EXPECTED_OUTPUT_TOKENS)
+            if cost is not None and cost > max_cost:
+                return False
+        max_latency = route.max_latency if route.max_latency is not None else self.max_latency
+        if max_latency is not None:
+            median = self._tracker(model_name).threshold()
+            if median is not None and median > max_latency:
+                return False
+        return True
+
+    def candidates(self, role: str, prompt: str) -> List[str]:
+        """Models to try for this prompt, in order; each one after the first is a fallback"""
+        route = self.route(role)
+        tokens = estimate_tokens(prompt)
+        within = [name for name in route.models if self.within_budget(route, name, tokens)]
+        ordered = within + [name for name in route.models if name not in within]
+        healthy = [name for name in ordered if circuit_breaker_for(name).state != CircuitBreaker.OPEN]
+        return healthy + [name for name in ordered if name not in healthy]
+
+    @staticmethod
+    def failover_policy() -> RetryPolicy:
+        """Retry policy for a model that has a fallback after it"""
+        return RetryPolicy(max_attempts=FAILOVER_ATTEMPTS, deadline=FAILOVER_DEADLINE)
@@ -0,0 +1,240 @@
+"""
+ResearchScope AI - Paper Index
+Local, persistent inverted index of every paper record the scraper has
+fetched, ranked with BM25, so research queries can be answered from disk
+before going to the network.
+"""
+
+import os
+import re
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+from sqlalchemy import (Column, Float, ForeignKey, Integer, MetaData, String, Table, Text, func,
+                        select, text)
+
+from context_budget import normalize_title
+from sqlite_store import SQLiteStore, env_flag
+
+DEFAULT_INDEX_PATH = os.path.join(".cache", "papers.db")
+DEFAULT_MIN_COVERAGE = 1.0
+DEFAULT_MMAP_BYTES = 256 * 1024 * 1024
+
+# BM25 parameters (the usual defaults)
+K1 = 1.2
+B = 0.75
+
+TOKEN = re.compile(r"[a-z0-9]+")
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is",
+    "it", "of", "on", "or", "that", "the", "this", "to", "with",
+}
+
+metadata = MetaData()
+
+papers_table = Table(
+    "papers",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("key", String(512), nullable=False, unique=True),
+    Column("title", Text, nullable=False),
+    Column("snippet", Text, nullable=False),
+    Column("url", Text),
+    Column("doi", Text),
+    Column("source", Text),
+    Column("keywords", Text),
+    Column("length", Integer, nullable=False),
+    Column("added_at", Float, nullable=False),
+)
+
+postings_table = Table(
+    "postings",
+    metadata,
+    Column("term", String(64), primary_key=True),
+    Column("paper_id", Integer, ForeignKey("papers.id"), primary_key=True),
+    Column("tf", Integer, nullable=False),
+    sqlite_with_rowid=False,
+)
+
+# Optional record fields stored with each paper and handed back on a match;
+# columns added after the first release, so older databases gain them on open
+LINK_FIELDS = ("url", "doi", "source")
+
+
+class Match(NamedTuple):
+    """A search hit: the paper record as the scraper returns it, and its BM25 score"""
+
+    record: Dict[str, str]
+    score: float
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+
+class PaperIndex(SQLiteStore):
+    """BM25-ranked paper store backed by SQLite.
+
+    Postings live in a (term, paper_id) clustered table, so a query reads
+    only the rows for its own terms; SQLite memory-maps the database file
+    (mmap_bytes) so those reads come straight from the page cache. Ranking is
+    done with NumPy over the fetched postings.
+
+    A search is only considered answered locally when at least `limit`
+    papers contain min_coverage of the query's terms; otherwise the caller
+    should go to the network and add() what it finds.
+    """
+
+    metadata = metadata
+
+    def __init__(
+        self,
+        path: str = DEFAULT_INDEX_PATH,
+        min_coverage: float = DEFAULT_MIN_COVERAGE,
+        mmap_bytes: int = DEFAULT_MMAP_BYTES,
+        enabled: bool = True,
+    ):
+        self.pragmas = (f"mmap_size={int(mmap_bytes)}", "journal_mode=WAL")
+        super().__init__(path, enabled)
+        self.min_coverage = min_coverage
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._count, self._total_length = 0, 0
+        if not enabled:
+            return
+        with self.engine.begin() as conn:
+            columns = {row.name for row in conn.execute(text("PRAGMA table_info(papers)"))}
+            for field in LINK_FIELDS:
+                if field not in columns:
+                    conn.execute(text(f"ALTER TABLE papers ADD COLUMN {field} TEXT"))
+            self._count, self._total_length = conn.execute(
+                select(func.count(), func.coalesce(func.sum(papers_table.c.length), 0))
+                .select_from(papers_table)
+            ).one()
+
+    @classmethod
+    def from_env(cls) -> "PaperIndex":
+        """Build an index from the PAPER_INDEX_* environment variables"""
+        return cls(
+            path=os.getenv("PAPER_INDEX_PATH", DEFAULT_INDEX_PATH),
+            min_coverage=float(os.getenv("PAPER_INDEX_MIN_COVERAGE", DEFAULT_MIN_COVERAGE)),
+            enabled=not env_flag("PAPER_INDEX_BYPASS"),
+        )
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, records: Iterable[Dict[str, str]], keywords: str = "") -> int:
+        """Index paper records not seen before (by normalised title); returns how many"""
+        if not self.enabled:
+            return 0
+
+        added = 0
+        now = time.time()
+        with self._lock, self.engine.begin() as conn:
+            for record in records:
+                title = (record.get("title") or "").strip()
+                key = normalize_title(title)
+                if not key:
+                    continue
+                exists = conn.execute(
+                    select(papers_table.c.id).where(papers_table.c.key == key)
+                ).first()
+                if exists is not None:
+                    continue
+
+                snippet = (record.get("snippet") or "").strip()
+                terms = Counter(tokenize(f"{title} {snippet}"))
+                paper_id = conn.execute(papers_table.insert().values(
+                    key=key,
+                    title=title,
+                    snippet=snippet,
+                    url=record.get("url"),
+                    doi=record.get("doi"),
+                    source=record.get("source"),
+                    keywords=record.get("query", keywords),
+                    length=sum(terms.values()),
+                    added_at=now,
+                )).inserted_primary_key[0]
+                if terms:
+                    conn.execute(postings_table.insert(), [
+                        {"term": term, "paper_id": paper_id, "tf": tf}
+                        for term, tf in terms.items()
+                    ])
+                self._count += 1
+                self._total_length += sum(terms.values())
+                added += 1
+        return added
+
+    def search(self, query: str, limit: int = 5) -> List[Match]:
+        """The limit best BM25 matches for query with their scores, best first (may be empty)"""
+        return self._rank(query, limit, min_coverage=0.0)
+
+    def lookup(self, query: str, limit: int = 5) -> Optional[List[Dict[str, str]]]:
+        """Local answer to a scrape: limit well-covered matches, or None to go online"""
+        if not self.enabled:
+            return None
+        results = [match.record for match in self._rank(query, limit, self.min_coverage)]
+        with self._lock:
+            if len(results) >= limit:
+                self.hits += 1
+                return results
+            self.misses += 1
+        return None
+
+    def _rank(self, query: str, limit: int, min_coverage: float) -> List[Match]:
+        terms = sorted(set(tokenize(query)))
+        if not terms or not self._count:
+            return []
+
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(postings_table.c.term, postings_table.c.paper_id,
+                       postings_table.c.tf, papers_table.c.length)
+                .join(papers_table, papers_table.c.id == postings_table.c.paper_id)
+                .where(postings_table.c.term.in_(terms))
+            ).all()
+            if not rows:
+                return []
+
+            position = {term: i for i, term in enumerate(terms)}
+            term_ids = np.array([position[r.term] for r in rows])
+            paper_ids = np.array([r.paper_id for r in rows])
+            tf = np.array([r.tf for r in rows], dtype=np.float64)
+            length = np.array([r.length for r in rows], dtype=np.float64)
+
+            count = self._count
+            avg_length = self._total_length / count if count else 1.0
+            df = np.bincount(term_ids, minlength=len(terms))
+            idf = np.log(1 + (count - df + 0.5) / (df + 0.5))
+            weights = idf[term_ids] * tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / avg_length))
+
+            candidates, slot = np.unique(paper_ids, return_inverse=True)
+            scores = np.bincount(slot, weights=weights)
+            coverage = np.bincount(slot) / len(terms)
+
+            eligible = np.flatnonzero(coverage >= min_coverage - 1e-9)
+            best = eligible[np.argsort(-scores[eligible], kind="stable")[:limit]]
+            if not len(best):
+                return []
+
+            ids = [int(candidates[i]) for i in best]
+            papers = {
+                row.id: row for row in conn.execute(
+                    select(papers_table).where(papers_table.c.id.in_(ids))
+                )
+            }
+
+        results = []
+        for i, paper_id in zip(best, ids):
+            paper = papers[paper_id]
+            record = {"title": paper.title, "snippet": paper.snippet}
+            for field in LINK_FIELDS:
+                if getattr(paper, field):
+                    record[field] = getattr(paper, field)
+            results.append(Match(record, round(float(scores[i]), 4)))
+        return results
@@ -11,7 +11,8 @@ load_dotenv()
 
 api_key = os.getenv('GOOGLE_API_KEY')
 
-print(f"Your API key is: {api_key}")
+# Agent traces are opt-in (ANALYSIS_VERBOSE=1) instead of printed on every run
+VERBOSE = os.getenv('ANALYSIS_VERBOSE', '').lower() in ('1', 'true', 'yes')
 # Configure the LLM
 llm = ChatGoogleGenerativeAI(
     model="gemini-pro",
@@ -59,7 +60,7 @@ keyword_extractor = Agent(
     goal='Extract key technical terms and concepts from project descriptions',
     backstory="""You are an expert at analyzing technical project descriptions 
     and extracting the most relevant keywords and concepts.""",
-    verbose=True,
+    verbose=VERBOSE,
     allow_delegation=False,
     llm=llm
 )
@@ -70,7 +71,7 @@ researcher = Agent(
     backstory="""You are an expert researcher who can find and analyze 
     relevant academic papers and technical documentation.""",
     tools=[scraper_tool],
-    verbose=True,
+    verbose=VERBOSE,
     allow_delegation=False,
     llm=llm
 )
@@ -80,7 +81,7 @@ summarizer = Agent(
     goal='Create comprehensive summaries of research findings',
     backstory="""You are an expert at condensing complex technical information 
     into clear, concise summaries while maintaining accuracy.""",
-    verbose=True,
+    verbose=VERBOSE,
     allow_delegation=False,
     llm=llm
 )
@@ -90,7 +91,7 @@ validator = Agent(
     goal='Validate and compare project requirements with research findings',
     backstory="""You are an expert at validating technical requirements and 
     ensuring alignment between project goals and research findings.""",
-    verbose=True,
+    verbose=VERBOSE,
     allow_delegation=False,
     llm=llm
 )
@@ -128,7 +129,7 @@ def analyze_project(project_description):
     crew = Crew(
         agents=[keyword_extractor, researcher, summarizer, validator],
         tasks=[keyword_task, research_task, summary_task, validation_task],
-        verbose=2,
+        verbose=2 if VERBOSE else 0,
         process=Process.sequential
     )
 
@@ -1,41 +1,377 @@
 from crewai import Agent, Task, Crew, Process
+from crewai.agents.cache import CacheHandler
+from crewai.tasks.task_output import TaskOutput
+from crewai.tools import tool_usage
+from crewai.utilities import Printer
+from pydantic import Field
 from langchain.tools import Tool
-from bs4 import BeautifulSoup
-import requests
 import os
 from dotenv import load_dotenv
 import google.generativeai as genai
 from langchain.llms.base import LLM
-from typing import Any, List, Optional
+from langchain_community.llms.utils import enforce_stop_tokens
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.outputs import GenerationChunk
+import asyncio
+import itertools
+import threading
+import time
+from typing import Any, AsyncIterator, Iterator, List, Optional
+from llm_cache import ResponseCache
+from llm_retry import (
+    LLMError, LatencyTracker, RetryPolicy, acall_with_retries, call_with_retries, circuit_breaker_for,
+    is_retryable
+)
+from web_scraper import WebScraperTool
+from scrape_cache import ScrapeCache
+from paper_index import PaperIndex
+from rate_limit import HostRateLimiter
+from dag_runner import DagRunner, Stage
+from similarity_index import SimilarityIndex
+from keyword_extraction import KeywordCorpus
+import keyword_extraction
+from stage_memo import StageMemo, current_memo, memoizing, stage_key
+from analysis_events import complete_stage, emitting, iter_events, stage_scope, start_stage
+from analysis_result import AnalysisResult, Paper, StageInfo, extract_gaps
+from analysis_history import AnalysisHistory
+from context_budget import (
+    TASK_BUDGETS, ResearchNotes, build_context, collecting, compress, current_notes,
+    select_keywords, strip_agent_trace
+)
+import context_budget
+from model_router import ModelRouter, estimate_cost
+from instrumentation import (
+    CONTEXT, LLM as LLM_CALL, ROUTE, STAGE, RunMetrics, annotate_stage, estimate_tokens, measure,
+    record, recording,
+    stage_finished, stage_started, usage_from_response
+)
+from run_logging import configure_logging, tracing, verbose_default
+import logging
+import uuid
 
 # Load environment variables
 load_dotenv()
 
-# Configure Google Generative AI
-genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+logger = logging.getLogger("researchscope.analysis")
+
+
+class LogPrinter(Printer):
+    """Routes crewai's tool usage output to the log instead of stdout.
+
+    crewai prints every tool result and tool error whatever the agents'
+    verbose setting; a verbose run's trace already has them as tool events.
+    """
+
+    def print(self, content, color):
+        logging.getLogger("researchscope.crewai").debug(content.strip())
+
+
+DEFAULT_MODEL_NAME = "gemini-2.5-flash-lite-preview-06-17"
+DEFAULT_TEMPERATURE = 0.7
+
+# Gemini accepts at most this many stop sequences per request
+MAX_STOP_SEQUENCES = 5
+
+def response_text(response):
+    """Text of a Gemini response or stream chunk ("" for chunks without text parts)"""
+    try:
+        return response.text
+    except ValueError:
+        # Raised for chunks that carry only a finish reason; a response with
+        # no candidates at all (a blocked prompt) is still an error
+        parts = response.parts
+        return "".join(part.text for part in parts if "text" in part)
+
+def stream_error(error):
+    """LLMError for a stream that broke after its first chunk, past retrying or falling back"""
+    return LLMError(f"Gemini stream failed after the first chunk: {type(error).__name__}: {error}",
+                    retryable=is_retryable(error))
+
+def guarded_chunks(chunks):
+    """Iterate a response stream, raising provider errors as LLMError"""
+    try:
+        yield from chunks
+    except Exception as e:
+        raise stream_error(e) from e
+
+class StopScanner:
+    """Finds stop sequences in streamed text, even when split across chunks.
+
+    feed() returns the text that is safe to emit and whether a stop sequence
+    was reached; a tail that could be the start of a stop sequence is held
+    back until the next chunk arrives (or flush() at the end of the stream).
+    """
+
+    def __init__(self, stop=None):
+        self.stop = [sequence for sequence in (stop or []) if sequence]
+        self.hold = max((len(sequence) for sequence in self.stop), default=1) - 1
+        self.buffer = ""
+
+    def feed(self, text):
+        self.buffer += text
+        hits = [i for i in (self.buffer.find(sequence) for sequence in self.stop) if i >= 0]
+        if hits:
+            emit, self.buffer = self.buffer[:min(hits)], ""
+            return emit, True
+        cut = len(self.buffer) - self.hold
+        if cut <= 0:
+            return "", False
+        emit, self.buffer = self.buffer[:cut], self.buffer[cut:]
+        return emit, False
+
+    def flush(self):
+        emit, self.buffer = self.buffer, ""
+        return emit
 
 # Create a custom LLM wrapper for CrewAI compatibility
 class GoogleGenerativeAI(LLM):
-    """Custom LLM wrapper for Google Generative AI"""
+    """Custom LLM wrapper for Google Generative AI.
+
+    Supports blocking, async and streamed generation. Temperature and stop
+    sequences are sent to Gemini, so generation ends at a stop sequence
+    instead of being truncated afterwards. With streaming=True, blocking and
+    async calls are served from the stream so callbacks receive tokens as
+    they arrive.
+    """
     
-    model_name: str = "gemini-2.5-flash-lite-preview-06-17"
-    temperature: float = 0.7
+    model_name: str = DEFAULT_MODEL_NAME
+    temperature: float = DEFAULT_TEMPERATURE
     model: Any = None
+    response_cache: Any = None
+    use_cache: bool = True
+    rate_limiter: Any = None
+    retry_policy: Any = None
+    circuit_breaker: Any = None
+    hedge: bool = False
+    latency_tracker: Any = None
+    streaming: bool = False
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.model = genai.GenerativeModel(self.model_name)
+        # A prebuilt model (e.g. the offline fake in fake_gemini) can be passed in
+        if self.model is None:
+            self.model = genai.GenerativeModel(self.model_name)
+        if self.retry_policy is None:
+            self.retry_policy = RetryPolicy.from_env()
+        if self.circuit_breaker is None:
+            self.circuit_breaker = circuit_breaker_for(self.model_name)
+        if self.hedge and self.latency_tracker is None:
+            self.latency_tracker = LatencyTracker()
     
     @property
     def _llm_type(self) -> str:
         return "google_generative_ai"
+
+    def _generation_config(self, stop):
+        return genai.types.GenerationConfig(
+            temperature=self.temperature,
+            stop_sequences=list(stop or [])[:MAX_STOP_SEQUENCES] or None
+        )
+
+    def _cached(self, prompt, stop, call):
+        if self.response_cache is None or not self.use_cache:
+            return None
+        cached = self.response_cache.get(self.model_name, self.temperature, prompt, stop)
+        if cached is not None:
+            call.update(cache_hit=True, response_chars=len(cached))
+        return cached
+
+    def _acquire(self, call):
+        if self.rate_limiter is not None:
+            waited = self.rate_limiter.acquire()
+            call["rate_limit_wait"] = call.get("rate_limit_wait", 0) + waited
+
+    def _retry_options(self, call):
+        def on_retry(retry, error, delay):
+            call["retries"] = retry
+            call["last_error"] = type(error).__name__
+
+        return {
+            "breaker": self.circuit_breaker,
+            "latency": self.latency_tracker if self.hedge else None,
+            "on_retry": on_retry,
+        }
+
+    def _finish(self, call, prompt, stop, response, text):
+        """Record and cache a completed generation and return its text"""
+        if stop:
+            # Gemini honours at most MAX_STOP_SEQUENCES; cut at any others
+            text = enforce_stop_tokens(text, stop)
+        usage = usage_from_response(response)
+        call.update(
+            response_chars=len(text),
+            estimated_tokens=estimate_tokens(prompt) + estimate_tokens(text),
+            cost_usd=estimate_cost(self.model_name,
+                                   usage.get("prompt_tokens") or estimate_tokens(prompt),
+                                   usage.get("completion_tokens") or estimate_tokens(text)),
+            **usage
+        )
+        if self.response_cache is not None and self.use_cache:
+            self.response_cache.set(self.model_name, self.temperature, prompt, text, stop)
+        return text
     
-    def _call(self, prompt: str, stop: Optional[List[str]] = None) -> str:
-        try:
-            response = self.model.generate_content(prompt)
-            return response.text
-        except Exception as e:
-            return f"Error generating response: {str(e)}"
+    def _call(self, prompt: str, stop: Optional[List[str]] = None,
+              run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> str:
+        if self.streaming:
+            return "".join(chunk.text for chunk in self._stream(prompt, stop, run_manager))
+
+        with measure(LLM_CALL, self.model_name, prompt_chars=len(prompt)) as call:
+            cached = self._cached(prompt, stop, call)
+            if cached is not None:
+                return cached
+
+            config = self._generation_config(stop)
+
+            def attempt():
+                self._acquire(call)
+                response = self.model.generate_content(prompt, generation_config=config)
+                return response, response_text(response)
+
+            # Failures raise LLMError rather than returning error text that
+            # agents would go on to reason about as if it were model output
+            response, text = call_with_retries(
+                attempt, self.retry_policy, **self._retry_options(call)
+            )
+            return self._finish(call, prompt, stop, response, text)
+
+    async def _acall(self, prompt: str, stop: Optional[List[str]] = None,
+                     run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                     **kwargs: Any) -> str:
+        if self.streaming:
+            chunks = [chunk.text async for chunk in self._astream(prompt, stop, run_manager)]
+            return "".join(chunks)
+
+        with measure(LLM_CALL, self.model_name, prompt_chars=len(prompt)) as call:
+            cached = self._cached(prompt, stop, call)
+            if cached is not None:
+                return cached
+
+            config = self._generation_config(stop)
+
+            async def attempt():
+                if self.rate_limiter is not None:
+                    await asyncio.to_thread(self._acquire, call)
+                response = await self.model.generate_content_async(prompt, generation_config=config)
+                return response, response_text(response)
+
+            response, text = await acall_with_retries(
+                attempt, self.retry_policy, **self._retry_options(call)
+            )
+            return self._finish(call, prompt, stop, response, text)
+
+    def _stream(self, prompt: str, stop: Optional[List[str]] = None,
+                run_manager: Optional[CallbackManagerForLLMRun] = None,
+                **kwargs: Any) -> Iterator[GenerationChunk]:
+        with measure(LLM_CALL, self.model_name, prompt_chars=len(prompt), streamed=True) as call:
+            cached = self._cached(prompt, stop, call)
+            if cached is not None:
+                if run_manager:
+                    run_manager.on_llm_new_token(cached)
+                yield GenerationChunk(text=cached)
+                return
+
+            config = self._generation_config(stop)
+            started = time.perf_counter()
+
+            def open_stream():
+                self._acquire(call)
+                response = self.model.generate_content(prompt, generation_config=config, stream=True)
+                chunks = iter(response)
+                # Failures before the first chunk can still be retried
+                return response, chunks, next(chunks, None)
+
+            # Opening the stream ends at its first chunk, so a hedge races time
+            # to first chunk; only the winning stream is read and emitted
+            response, chunks, first = call_with_retries(
+                open_stream, self.retry_policy, **self._retry_options(call)
+            )
+
+            scanner = StopScanner(stop)
+            text = ""
+            pieces = guarded_chunks(itertools.chain([first], chunks) if first is not None else chunks)
+            for piece in pieces:
+                emit, stopped = scanner.feed(response_text(piece))
+                if emit:
+                    text += emit
+                    call.setdefault("first_token_seconds", time.perf_counter() - started)
+                    if run_manager:
+                        run_manager.on_llm_new_token(emit)
+                    yield GenerationChunk(text=emit)
+                if stopped:
+                    # Stop consuming the stream instead of paying for the rest
+                    call["stopped_early"] = True
+                    break
+            else:
+                tail = scanner.flush()
+                if tail:
+                    text += tail
+                    if run_manager:
+                        run_manager.on_llm_new_token(tail)
+                    yield GenerationChunk(text=tail)
+
+            self._finish(call, prompt, stop, response, text)
+
+    async def _astream(self, prompt: str, stop: Optional[List[str]] = None,
+                       run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                       **kwargs: Any) -> AsyncIterator[GenerationChunk]:
+        with measure(LLM_CALL, self.model_name, prompt_chars=len(prompt), streamed=True) as call:
+            cached = self._cached(prompt, stop, call)
+            if cached is not None:
+                if run_manager:
+                    await run_manager.on_llm_new_token(cached)
+                yield GenerationChunk(text=cached)
+                return
+
+            config = self._generation_config(stop)
+            started = time.perf_counter()
+
+            async def open_stream():
+                if self.rate_limiter is not None:
+                    await asyncio.to_thread(self._acquire, call)
+                response = await self.model.generate_content_async(
+                    prompt, generation_config=config, stream=True
+                )
+                chunks = response.__aiter__()
+                try:
+                    first = await chunks.__anext__()
+                except StopAsyncIteration:
+                    first = None
+                return response, chunks, first
+
+            response, chunks, first = await acall_with_retries(
+                open_stream, self.retry_policy, **self._retry_options(call)
+            )
+
+            scanner = StopScanner(stop)
+            text = ""
+            stopped = False
+            pending = first
+            while pending is not None and not stopped:
+                emit, stopped = scanner.feed(response_text(pending))
+                if emit:
+                    text += emit
+                    call.setdefault("first_token_seconds", time.perf_counter() - started)
+                    if run_manager:
+                        await run_manager.on_llm_new_token(emit)
+                    yield GenerationChunk(text=emit)
+                if stopped:
+                    call["stopped_early"] = True
+                    break
+                try:
+                    pending = await chunks.__anext__()
+                except StopAsyncIteration:
+                    pending = None
+                except Exception as e:
+                    raise stream_error(e) from e
+            if not stopped:
+                tail = scanner.flush()
+                if tail:
+                    text += tail
+                    if run_manager:
+                        await run_manager.on_llm_new_token(tail)
+                    yield GenerationChunk(text=tail)
+
+            self._finish(call, prompt, stop, response, text)
     
     @property
     def _identifying_params(self) -> dict[str, Any]:
@@ -44,125 +380,816 @@ class GoogleGenerativeAI(LLM):
             "temperature": self.temperature
         }
 
-# Initialize the LLM
-llm = GoogleGenerativeAI(temperature=0.7)
-
-class WebScraperTool:
-    def scrape_web(self, query):
-        """
-        Scrape web for research papers based on the query
-        """
-        # This is a simplified version. In a real implementation, you'd want to use
-        # academic APIs or more sophisticated web scraping
-        search_url = f"https://scholar.google.com/scholar?q={query}"
-        try:
-            response = requests.get(search_url)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            results = []
-            
-            # Extract paper titles and snippets
-            for result in soup.find_all('div', class_='gs_ri')[:5]:  # Get top 5 results
-                title = result.find('h3')
-                snippet = result.find('div', class_='gs_rs')
-                if title and snippet:
-                    results.append({
-                        'title': title.text,
-                        'snippet': snippet.text
-                    })
-            return results
-        except Exception as e:
-            return f"Error scraping web: {str(e)}"
-
-# Create tools
-web_scraper = WebScraperTool()
-scraper_tool = Tool(
-    name="WebScraper",
-    func=web_scraper.scrape_web,
-    description="Scrapes the web for research papers based on keywords"
-)
+class RoutedLLM(LLM):
+    """LLM for one agent role, sending each call to the model its route picks.
 
-# Create agents
-keyword_extractor = Agent(
-    role='Keyword Extractor',
-    goal='Extract key technical terms and concepts from project descriptions',
-    backstory="""You are an expert at analyzing technical project descriptions 
-    and extracting the most relevant keywords and concepts.""",
-    verbose=True,
-    allow_delegation=False,
-    llm=llm
-)
+    The ModelRouter orders the role's models for the prompt; a call that
+    fails because a model is overloaded (retries exhausted on 429/5xx, or its
+    circuit breaker open) moves on to the next one. Every model but the last
+    gets a short retry policy so the fallback takes over quickly. Errors
+    another model cannot fix, such as a blocked prompt, are raised at once.
+    llm_options are passed to each model's GoogleGenerativeAI.
+    """
 
-researcher = Agent(
-    role='Research Agent',
-    goal='Find and analyze relevant research papers based on keywords',
-    backstory="""You are an expert researcher who can find and analyze 
-    relevant academic papers and technical documentation.""",
-    tools=[scraper_tool],
-    verbose=True,
-    allow_delegation=False,
-    llm=llm
-)
+    role: str
+    router: Any = None
+    llm_options: dict = {}
+    llms: Any = None
+    lock: Any = None
 
-summarizer = Agent(
-    role='Summarization Expert',
-    goal='Create comprehensive summaries of research findings',
-    backstory="""You are an expert at condensing complex technical information 
-    into clear, concise summaries while maintaining accuracy.""",
-    verbose=True,
-    allow_delegation=False,
-    llm=llm
-)
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        if self.router is None:
+            self.router = get_model_router()
+        self.llms = {}
+        self.lock = threading.Lock()
 
-validator = Agent(
-    role='Validation Expert',
-    goal='Validate and compare project requirements with research findings',
-    backstory="""You are an expert at validating technical requirements and 
-    ensuring alignment between project goals and research findings.""",
-    verbose=True,
-    allow_delegation=False,
-    llm=llm
-)
+    @property
+    def _llm_type(self) -> str:
+        return "routed_google_generative_ai"
 
-def analyze_project(project_description):
-    # Create tasks
-    keyword_task = Task(
-        description=f"""Analyze the following project description and extract key technical terms 
+    @property
+    def model_name(self) -> str:
+        # The route's models stand in for the model in stage memo keys
+        return ",".join(self.router.route(self.role).models)
+
+    @property
+    def temperature(self) -> float:
+        return self.router.route(self.role).temperature
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        route = self.router.route(self.role)
+        return {"role": self.role, "models": list(route.models), "temperature": route.temperature}
+
+    def llm_for(self, model_name, failover=False):
+        """The role's GoogleGenerativeAI for a model, built on first use"""
+        with self.lock:
+            key = (model_name, failover)
+            if key not in self.llms:
+                options = dict(self.llm_options)
+                if failover:
+                    options["retry_policy"] = self.router.failover_policy()
+                self.llms[key] = GoogleGenerativeAI(
+                    model_name=model_name,
+                    temperature=self.router.route(self.role).temperature,
+                    **options
+                )
+            return self.llms[key]
+
+    def _attempts(self, prompt):
+        models = self.router.candidates(self.role, prompt)
+        for i, model_name in enumerate(models):
+            last = i == len(models) - 1
+            yield model_name, self.llm_for(model_name, failover=not last), last
+
+    def _fall_back(self, model_name, error, last, failed):
+        """Whether to try the next model after error; re-raises when not"""
+        if last or not error.retryable:
+            raise error
+        failed.append(model_name)
+        logger.warning("model overloaded, falling back", extra={
+            "role": self.role, "model": model_name, "error": str(error)
+        })
+
+    def _routed(self, model_name, failed, started):
+        seconds = time.perf_counter() - started
+        self.router.observe(model_name, seconds)
+        record(ROUTE, self.role, seconds, model=model_name, fallbacks=len(failed),
+               failed=",".join(failed) or None)
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None,
+              run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> str:
+        started = time.perf_counter()
+        failed = []
+        for model_name, llm, last in self._attempts(prompt):
+            try:
+                text = llm._call(prompt, stop, run_manager, **kwargs)
+            except LLMError as e:
+                self._fall_back(model_name, e, last, failed)
+                continue
+            self._routed(model_name, failed, started)
+            return text
+
+    async def _acall(self, prompt: str, stop: Optional[List[str]] = None,
+                     run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                     **kwargs: Any) -> str:
+        started = time.perf_counter()
+        failed = []
+        for model_name, llm, last in self._attempts(prompt):
+            try:
+                text = await llm._acall(prompt, stop, run_manager, **kwargs)
+            except LLMError as e:
+                self._fall_back(model_name, e, last, failed)
+                continue
+            self._routed(model_name, failed, started)
+            return text
+
+    def _stream(self, prompt: str, stop: Optional[List[str]] = None,
+                run_manager: Optional[CallbackManagerForLLMRun] = None,
+                **kwargs: Any) -> Iterator[GenerationChunk]:
+        started = time.perf_counter()
+        failed = []
+        for model_name, llm, last in self._attempts(prompt):
+            chunks = llm._stream(prompt, stop, run_manager, **kwargs)
+            try:
+                # Only a failure before the first chunk can fall back
+                first = next(chunks, None)
+            except LLMError as e:
+                self._fall_back(model_name, e, last, failed)
+                continue
+            if first is not None:
+                yield first
+            # Past the first chunk a failure raises LLMError (see stream_error)
+            yield from chunks
+            self._routed(model_name, failed, started)
+            return
+
+    async def _astream(self, prompt: str, stop: Optional[List[str]] = None,
+                       run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                       **kwargs: Any) -> AsyncIterator[GenerationChunk]:
+        started = time.perf_counter()
+        failed = []
+        for model_name, llm, last in self._attempts(prompt):
+            chunks = llm._astream(prompt, stop, run_manager, **kwargs)
+            try:
+                first = await chunks.__anext__()
+            except StopAsyncIteration:
+                first = None
+            except LLMError as e:
+                self._fall_back(model_name, e, last, failed)
+                continue
+            if first is not None:
+                yield first
+                async for chunk in chunks:
+                    yield chunk
+            self._routed(model_name, failed, started)
+            return
+
+# Lazily built, shared objects. Nothing is constructed at import time, so
+# importing analyze_project is cheap and does not need an API key.
+_registry = {}
+_registry_lock = threading.RLock()
+
+def _get_or_create(key, factory):
+    with _registry_lock:
+        if key not in _registry:
+            _registry[key] = factory()
+        return _registry[key]
+
+def configure_genai():
+    """Configure Google Generative AI once, on first use"""
+    def configure():
+        genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+        return True
+    _get_or_create("genai_configured", configure)
+
+def route_tool_output():
+    """Send crewai's tool output to the log (see LogPrinter), once, on first analysis.
+
+    Relies on crewai 0.11 building each ToolUsage's printer from the
+    module-level tool_usage.Printer; pinned in requirements.txt.
+    """
+    def install():
+        tool_usage.Printer = LogPrinter
+        return True
+    _get_or_create("tool_output_routed", install)
+
+def get_response_cache():
+    """The process-wide LLM response cache"""
+    return _get_or_create("response_cache", ResponseCache.from_env)
+
+def get_similarity_index():
+    """The process-wide index of analysed descriptions"""
+    return _get_or_create("similarity_index", SimilarityIndex.from_env)
+
+def get_keyword_corpus():
+    """Shared corpus of analysed descriptions weighting local keyword extraction"""
+    return _get_or_create("keyword_corpus", KeywordCorpus.from_env)
+
+def get_analysis_history():
+    """Shared store of finished analyses, searchable by their content"""
+    return _get_or_create("analysis_history", AnalysisHistory.from_env)
+
+def get_stage_memo():
+    """The process-wide memo of stage outputs"""
+    return _get_or_create("stage_memo", StageMemo.from_env)
+
+def get_model_router():
+    """The process-wide router choosing each agent role's model"""
+    return _get_or_create("model_router", ModelRouter.from_env)
+
+def llm_options():
+    """GoogleGenerativeAI settings shared by every model: cache, hedging, streaming"""
+    configure_genai()
+    return {
+        "response_cache": get_response_cache(),
+        "hedge": os.getenv("LLM_HEDGE", "") == "1",
+        "streaming": os.getenv("LLM_STREAMING", "1") != "0",
+    }
+
+def get_llm(model_name=DEFAULT_MODEL_NAME, temperature=DEFAULT_TEMPERATURE):
+    """Shared LLM for a (model name, temperature) configuration"""
+    def build():
+        return GoogleGenerativeAI(model_name=model_name, temperature=temperature, **llm_options())
+    return _get_or_create(("llm", model_name, float(temperature)), build)
+
+def create_routed_llm(role, router=None, **options):
+    """A RoutedLLM for an agent role; options override llm_options()"""
+    return RoutedLLM(role=role, router=router or get_model_router(),
+                     llm_options={**llm_options(), **options})
+
+def get_web_scraper():
+    """The shared web scraper with its connection pool, caches and rate limiter"""
+    return _get_or_create("web_scraper", lambda: WebScraperTool(
+        cache=ScrapeCache(),
+        rate_limiter=HostRateLimiter(rate=1.0, burst=5),
+        paper_index=PaperIndex.from_env()
+    ))
+
+def create_scraper_tools(web_scraper):
+    """LangChain tools wrapping a web scraper"""
+    # CrewAI passes the input as the keyword argument `tool_input`, which is
+    # the argument name LangChain advertises for single-input tools
+    def scrape_web(tool_input):
+        return web_scraper.scrape_web(tool_input)
+
+    def scrape_many(tool_input):
+        return web_scraper.scrape_many(tool_input)
+
+    scraper_tool = Tool(
+        name="WebScraper",
+        func=scrape_web,
+        description="Scrapes the web for research papers based on keywords"
+    )
+    multi_scraper_tool = Tool(
+        name="MultiWebScraper",
+        func=scrape_many,
+        description="Searches several keyword queries in parallel and merges the results. "
+                    "Separate queries with ';'"
+    )
+    return [scraper_tool, multi_scraper_tool]
+
+def get_scraper_tools():
+    """LangChain tools wrapping the shared web scraper"""
+    return _get_or_create("scraper_tools", lambda: create_scraper_tools(get_web_scraper()))
+
+def get_agents(model_name=None, temperature=DEFAULT_TEMPERATURE):
+    """Shared agent set for a configuration, used when callers don't pass their own.
+
+    By default each agent's model is routed per role (see model_router); with
+    a model_name every agent shares that one model.
+    """
+    if model_name is None:
+        return _get_or_create(("agents", "routed"), create_agents)
+    return _get_or_create(
+        ("agents", model_name, float(temperature)),
+        lambda: create_agents(get_llm(model_name, temperature))
+    )
+
+def prewarm(model_name=None, temperature=DEFAULT_TEMPERATURE):
+    """Build the LLM, tools and agents for a configuration ahead of the first request"""
+    get_scraper_tools()
+    return get_agents(model_name, temperature)
+
+# Backwards-compatible module attributes, resolved on first access
+_LAZY_ATTRIBUTES = {
+    "llm": lambda: get_llm(),
+    "web_scraper": get_web_scraper,
+    "scraper_tool": lambda: get_scraper_tools()[0],
+    "multi_scraper_tool": lambda: get_scraper_tools()[1],
+    "default_agents": lambda: get_agents(),
+    "keyword_extractor": lambda: get_agents()["keyword_extractor"],
+    "researcher": lambda: get_agents()["researcher"],
+    "summarizer": lambda: get_agents()["summarizer"],
+    "validator": lambda: get_agents()["validator"],
+}
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Agent definitions, keyed by the name used throughout the pipeline
+AGENT_CONFIGS = {
+    "keyword_extractor": {
+        "role": 'Keyword Extractor',
+        "goal": 'Extract key technical terms and concepts from project descriptions',
+        "backstory": """You are an expert at analyzing technical project descriptions 
+        and extracting the most relevant keywords and concepts.""",
+    },
+    "researcher": {
+        "role": 'Research Agent',
+        "goal": 'Find and analyze relevant research papers based on keywords',
+        "backstory": """You are an expert researcher who can find and analyze 
+        relevant academic papers and technical documentation.""",
+    },
+    "summarizer": {
+        "role": 'Summarization Expert',
+        "goal": 'Create comprehensive summaries of research findings',
+        "backstory": """You are an expert at condensing complex technical information 
+        into clear, concise summaries while maintaining accuracy.""",
+    },
+    "validator": {
+        "role": 'Validation Expert',
+        "goal": 'Validate and compare project requirements with research findings',
+        "backstory": """You are an expert at validating technical requirements and 
+        ensuring alignment between project goals and research findings.""",
+    },
+}
+
+def create_agent(name, llm, tools=None):
+    """Build a single agent from AGENT_CONFIGS"""
+    if name == "researcher":
+        tools = tools if tools is not None else get_scraper_tools()
+    return Agent(
+        **AGENT_CONFIGS[name],
+        tools=tools or [],
+        # Traces go to the run log when a run asks for them (see run_logging)
+        # rather than to stdout from every agent
+        verbose=False,
+        allow_delegation=False,
+        llm=llm,
+        # Agent's default tool-result cache is one instance shared by every
+        # agent outside a Crew; sharing it would leak tool results between
+        # concurrent runs and skip the scraper (and its metrics) on repeats
+        cache_handler=CacheHandler()
+    )
+
+def create_agents(llm=None, tools=None, router=None, **options):
+    """Build an isolated set of the four crew agents.
+
+    With an llm every agent shares it. Otherwise each agent gets a RoutedLLM
+    for its role from router (default: the process-wide one); options such
+    as rate_limiter are passed to its models.
+    """
+    return {
+        name: create_agent(
+            name,
+            llm if llm is not None else create_routed_llm(name, router, **options),
+            tools if name == "researcher" else None
+        )
+        for name in AGENT_CONFIGS
+    }
+
+# Task descriptions
+KEYWORD_TASK = """Analyze the following project description and extract key technical terms 
         and concepts that would be relevant for research:
         
-        {project_description}""",
-        agent=keyword_extractor
+        {project_description}"""
+
+RESEARCH_TASK = """Using the extracted keywords, search for and analyze relevant research papers 
+        and technical documentation. Focus on finding papers that address the key concepts."""
+
+RESEARCH_CLUSTER_TASK = """Search for and analyze relevant research papers and technical documentation 
+        for the following keywords: {keywords}. Focus on finding papers that address these concepts."""
+
+SUMMARY_TASK = """Create a comprehensive summary of the research findings, focusing on how they 
+        relate to the project requirements. Highlight key insights and potential applications."""
+
+VALIDATION_TASK = """Compare the original project description below with the research summary. 
+        Validate if the research findings align with the project requirements and identify any gaps 
+        or areas that need additional research:
+        
+        {project_description}"""
+
+VALIDATION_FINDINGS_TASK = """Compare the original project description below with the research findings. 
+        Validate if the research findings align with the project requirements and identify any gaps 
+        or areas that need additional research:
+        
+        {project_description}"""
+
+def parse_keywords(text):
+    """Split keyword extractor output into individual keywords"""
+    keywords = []
+    for part in text.replace("\n", ",").split(","):
+        keyword = part.strip().lstrip("-*•0123456789. ").strip().rstrip(".")
+        if keyword and keyword.lower() not in (k.lower() for k in keywords):
+            keywords.append(keyword)
+    return keywords
+
+def cluster_keywords(keywords, max_clusters=3):
+    """Distribute keywords round-robin over at most max_clusters groups"""
+    count = max(1, min(max_clusters, len(keywords)))
+    clusters = [keywords[i::count] for i in range(count)]
+    return [cluster for cluster in clusters if cluster]
+
+class StageTask(Task):
+    """Crew task for one analysis stage.
+
+    Its incoming context is rebuilt by context_builder before it runs, and
+    while a stage memo is active (see stage_memo.memoizing) the output of an
+    earlier run with identical inputs is reused instead of running the agent.
+    """
+
+    stage: Optional[str] = Field(
+        default=None,
+        description="Analysis stage the task runs; memoised only when set."
+    )
+    context_builder: Optional[Any] = Field(
+        default=None,
+        description="Called with the upstream output; returns the context to use instead."
+    )
+
+    def __repr__(self):
+        # LangChain serialises the agent executor, which holds this task, on
+        # every chain start; it falls back to repr(), and the default pydantic
+        # repr walks the agent, its executor and their runnables every time
+        return f"{type(self).__name__}(stage={self.stage!r})"
+
+    def execute(self, agent=None, context=None, tools=None):
+        if self.context_builder is not None:
+            context = self.context_builder(context)
+        memo = current_memo()
+        if memo is None or self.stage is None:
+            return super().execute(agent=agent, context=context, tools=tools)
+
+        key = stage_key(self.stage, agent or self.agent, self.description, context)
+        entry = memo.get(key)
+        if entry is not None:
+            return self._reuse(entry)
+
+        # Papers found while this stage runs are stored with its output, so
+        # reusing it later restores them too
+        notes = current_notes()
+        known = len(notes.papers) if notes is not None else 0
+        known_errors = len(notes.tool_errors) if notes is not None else 0
+        result = super().execute(agent=agent, context=context, tools=tools)
+        # An output written around a failed search would be replayed for the
+        # whole TTL, so it is only memoised when every tool call succeeded
+        if notes is None or len(notes.tool_errors) == known_errors:
+            memo.set(key, self.stage, result, notes.papers[known:] if notes is not None else [])
+        return result
+
+    def _reuse(self, entry):
+        notes = current_notes()
+        if notes is not None:
+            notes.add_papers("", entry.papers)
+        annotate_stage(self.stage, reused=True)
+        self.output = TaskOutput(description=self.description, result=entry.output)
+        if self.callback:
+            self.callback(self.output)
+        return entry.output
+
+def build_task_templates(agents):
+    """Unformatted StageTasks bound to an agent set, one per crew stage.
+
+    Building them once per agent set and copying them per run (see
+    _task_from_template) skips pydantic validation on every analysis.
+    """
+    return {
+        "keywords": StageTask(description=KEYWORD_TASK, agent=agents["keyword_extractor"],
+                              stage="keywords"),
+        "research": StageTask(description=RESEARCH_TASK, agent=agents["researcher"],
+                              stage="research"),
+        "summary": StageTask(description=SUMMARY_TASK, agent=agents["summarizer"],
+                             stage="summary"),
+        "validation": StageTask(description=VALIDATION_TASK, agent=agents["validator"],
+                                stage="validation"),
+    }
+
+def _task_from_template(templates, stage, **fields):
+    """A fresh task for one run: a shallow copy of the stage's template with fields set"""
+    return templates[stage].model_copy(update=fields)
+
+def compact_context(stage, upstream):
+    """The context handed to stage: structured and within its token budget.
+
+    Research only needs the keyword list; summary and validation get the
+    keywords, the deduplicated papers the scraper found and the upstream
+    findings compressed to fit. CONTEXT_BUDGET_BYPASS=1 passes output as is.
+    """
+    if not upstream or not context_budget.enabled():
+        return upstream
+
+    if stage == "research":
+        keywords = select_keywords(parse_keywords(strip_agent_trace(upstream)))
+        notes = current_notes()
+        if notes is not None:
+            notes.set_keywords(keywords)
+        if keywords:
+            context = "Keywords: " + ", ".join(keywords)
+        else:
+            context = compress(strip_agent_trace(upstream), TASK_BUDGETS["research"])
+    else:
+        # Never spend more than the raw output would have cost
+        budget = min(TASK_BUDGETS[stage], estimate_tokens(upstream))
+        context = build_context(upstream, budget)
+
+    record(CONTEXT, stage, 0.0,
+           raw_tokens=estimate_tokens(upstream), context_tokens=estimate_tokens(context))
+    return context
+
+def _context_builder(stage, upstream=None):
+    """Task context builder; upstream, if given, replaces the previous task's output"""
+    return lambda output: compact_context(stage, upstream if upstream is not None else output)
+
+def run_parallel_analysis(project_description, agents=None, max_research_clusters=3,
+                          max_workers=4, reuse=None, task_templates=None, keywords=None):
+    """Run the analysis as a DAG and return the DagResult with stage timings.
+
+    Research is split into one sub-task per keyword cluster, each on its own
+    researcher agent, and reduced into one findings document. Validation
+    checks the description against those findings speculatively, in parallel
+    with summarisation, instead of waiting for the summary.
+    With reuse (a similarity_index.Match) the keyword and research outputs of
+    that earlier analysis are used instead of running those stages.
+    task_templates, from build_task_templates(agents), saves rebuilding the
+    per-stage tasks. keywords, if given (see local_keywords), are used
+    instead of running the keyword agent.
+    """
+    route_tool_output()
+    agents = agents or get_agents()
+    templates = task_templates or build_task_templates(agents)
+    research_llm = agents["researcher"].llm
+    research_tools = agents["researcher"].tools
+
+    def tracked(stage, run):
+        """Wrap a stage function so it reports start, completion and timing"""
+        def wrapper(inputs):
+            _begin_stage(stage)
+            output = run(inputs)
+            _end_stage(stage, output)
+            return output
+        return wrapper
+
+    def extract_keywords(inputs):
+        task = _task_from_template(
+            templates, "keywords",
+            description=KEYWORD_TASK.format(project_description=project_description)
+        )
+        return task.execute()
+
+    def plan_research(inputs):
+        keywords = parse_keywords(inputs["keywords"])
+        notes = current_notes()
+        if notes is not None:
+            notes.set_keywords(select_keywords(keywords))
+        clusters = cluster_keywords(keywords, max_research_clusters) if keywords else [[inputs["keywords"]]]
+
+        def research(cluster, stage):
+            task = StageTask(
+                description=RESEARCH_CLUSTER_TASK.format(keywords=", ".join(cluster)),
+                agent=create_agent("researcher", research_llm, research_tools),
+                stage=stage
+            )
+            return lambda _inputs: task.execute()
+
+        return [
+            Stage(name=f"research[{i}]",
+                  run=tracked(f"research[{i}]", research(cluster, f"research[{i}]")))
+            for i, cluster in enumerate(clusters)
+        ]
+
+    def summarize(inputs):
+        task = _task_from_template(templates, "summary")
+        return task.execute(context=compact_context("summary", inputs["research"]))
+
+    def validate(inputs):
+        task = _task_from_template(
+            templates, "validation",
+            description=VALIDATION_FINDINGS_TASK.format(project_description=project_description)
+        )
+        return task.execute(context=compact_context("validation", inputs["research"]))
+
+    if reuse is not None:
+        _replay_stages(reuse)
+        first_stages = [
+            Stage(name="keywords", run=lambda inputs: reuse.keywords),
+            Stage(name="research", run=lambda inputs: reuse.research, depends_on=["keywords"]),
+        ]
+    elif keywords is not None:
+        first_stages = [
+            Stage(name="keywords", run=lambda inputs: keywords),
+            Stage(name="research", expand=plan_research, depends_on=["keywords"]),
+        ]
+    else:
+        first_stages = [
+            Stage(name="keywords", run=tracked("keywords", extract_keywords)),
+            Stage(name="research", expand=plan_research, depends_on=["keywords"]),
+        ]
+
+    runner = DagRunner(first_stages + [
+        Stage(name="summary", run=tracked("summary", summarize), depends_on=["research"]),
+        Stage(name="validation", run=tracked("validation", validate), depends_on=["research"]),
+    ], max_workers=max_workers)
+    return runner.run()
+
+def analyze_project(project_description, agents=None, mode="sequential", on_event=None,
+                    return_metrics=False, reuse=True, task_templates=None, verbose=None,
+                    keyword_mode=None):
+    """Analyse a project description and return an AnalysisResult.
+
+    mode="sequential" runs the four agents one after another as a crew;
+    mode="parallel" runs the dependency graph from run_parallel_analysis.
+    on_event, if given, receives AnalysisEvents (stage changes, agent steps,
+    tool results, LLM output) while the analysis runs.
+    With return_metrics=True the result is returned as (result, RunMetrics)
+    holding per-stage, LLM and scrape measurements for this run.
+    Earlier work is reused: a stage whose inputs (prompt, context, agent and
+    model) are unchanged since an earlier run returns that run's output, and
+    for a near-duplicate of a description analysed before, the keyword and
+    research outputs of that analysis are used. reuse=False runs every stage.
+    Every result is stored in the analysis history (see get_analysis_history).
+    task_templates are the agents' prebuilt tasks (see build_task_templates);
+    AnalysisPipeline passes them so runs skip rebuilding tasks.
+    verbose=True logs the run's agent trace (steps, tool results, LLM
+    output) to the researchscope.trace logger; it defaults to
+    ANALYSIS_VERBOSE. Run progress is logged to researchscope.analysis.
+    keyword_mode chooses between the keyword agent and local keyword
+    extraction: llm, local, or auto (use local keywords when confident);
+    it defaults to KEYWORD_MODE.
+    """
+    route_tool_output()
+    metrics = RunMetrics(run_id=uuid.uuid4().hex)
+    notes = ResearchNotes()
+    index = get_similarity_index() if reuse else None
+    memo = get_stage_memo() if reuse else None
+    if verbose if verbose is not None else verbose_default():
+        on_event = tracing(on_event, run_id=metrics.run_id)
+    with stage_scope(), emitting(on_event), recording(metrics), collecting(notes), memoizing(memo):
+        logger.info("analysis started", extra={"mode": mode})
+        match = index.find(project_description) if index is not None else None
+        try:
+            outputs = _analyze_project(project_description, agents, mode, match, task_templates,
+                                       keyword_mode)
+        except Exception:
+            logger.exception("analysis failed")
+            raise
+    metrics.finish()
+    logger.info("analysis finished", extra={
+        "run_id": metrics.run_id, "mode": mode, "seconds": round(metrics.wall_seconds, 3),
+        "reused": match is not None,
+    })
+    # Research written around a failed search is not worth reusing
+    if index is not None and not notes.tool_errors:
+        index.add(project_description, str(outputs["keywords"]), str(outputs["research"]),
+                  notes.papers)
+    if reuse:
+        # Runs with reuse=False (forced reruns, benchmarks) leave the corpus as is
+        get_keyword_corpus().add(project_description)
+    result = build_result(outputs, notes, metrics, mode)
+    llm = metrics.summary()["llm"]
+    get_analysis_history().add(project_description, result, models=llm["models"],
+                               seconds=round(metrics.wall_seconds, 3), cost_usd=llm["cost_usd"])
+    if not return_metrics:
+        return result
+    return result, metrics
+
+def build_result(outputs, notes, metrics, mode):
+    """Assemble the AnalysisResult from the stage outputs and the run's notes"""
+    keywords = notes.keywords or select_keywords(
+        parse_keywords(strip_agent_trace(outputs["keywords"]))
+    )
+    stages = {
+        r["name"]: StageInfo(seconds=r["seconds"], output_chars=r.get("output_chars", 0),
+                             reused=r.get("reused", False))
+        for r in metrics.records if r["kind"] == STAGE
+    }
+    validation = str(outputs["validation"])
+    return AnalysisResult(
+        run_id=metrics.run_id,
+        mode=mode,
+        keywords=keywords,
+        papers=[Paper(**paper) for paper in notes.papers],
+        summary=str(outputs["summary"]),
+        validation=validation,
+        gaps=extract_gaps(validation),
+        stages=stages,
+    )
+
+def iter_analysis_events(project_description, **kwargs):
+    """Run analyze_project in the background and yield its events as they happen"""
+    return iter_events(analyze_project, project_description, **kwargs)
+
+def _begin_stage(stage):
+    start_stage(stage)
+    stage_started(stage)
+    logger.debug("stage started", extra={"stage": stage})
+
+def _end_stage(stage, output, **attributes):
+    stage_finished(stage, output_chars=len(str(output)), **attributes)
+    complete_stage(stage, output)
+    logger.debug("stage finished", extra={"stage": stage, "output_chars": len(str(output)),
+                                          **attributes})
+
+def _replay_stages(match):
+    """Report the keyword and research stages as done with a similar analysis' outputs"""
+    notes = current_notes()
+    if notes is not None:
+        notes.set_keywords(select_keywords(parse_keywords(strip_agent_trace(match.keywords))))
+        notes.add_papers("", match.papers)
+    for stage, output in (("keywords", match.keywords), ("research", match.research)):
+        _begin_stage(stage)
+        _end_stage(stage, output, reused=True, similarity=round(match.similarity, 3))
+
+def local_keywords(project_description, mode=None):
+    """Keywords for the description found without the keyword agent, or None to run it.
+
+    mode (default KEYWORD_MODE) is llm, local or auto; see
+    keyword_extraction.keyword_mode. When the local keywords are used the
+    keywords stage is reported as done with them.
+    """
+    mode = keyword_extraction.keyword_mode(mode)
+    if mode == keyword_extraction.LLM_MODE:
+        return None
+    local = keyword_extraction.extract_keywords(project_description, get_keyword_corpus())
+    confident = local.confidence >= keyword_extraction.min_confidence()
+    if not local.keywords or (mode == keyword_extraction.AUTO_MODE and not confident):
+        logger.debug("local keywords not used", extra={"confidence": local.confidence})
+        return None
+    _begin_stage("keywords")
+    _end_stage("keywords", local.text, source="local", confidence=local.confidence)
+    return local.text
+
+def _stage_transition(stage, next_stage=None):
+    """Task callback closing one stage and announcing the next"""
+    def callback(task_output):
+        _end_stage(stage, task_output.result)
+        if next_stage:
+            _begin_stage(next_stage)
+    return callback
+
+def _analyze_project(project_description, agents, mode, reuse=None, task_templates=None,
+                     keyword_mode=None):
+    # Agents carry executor state, so concurrent callers pass their own set
+    agents = agents or get_agents()
+    templates = task_templates or build_task_templates(agents)
+    if mode not in ("sequential", "parallel"):
+        raise ValueError(f"Unknown analysis mode: {mode!r}")
+    keywords = local_keywords(project_description, keyword_mode) if reuse is None else None
+
+    if mode == "parallel":
+        dag = run_parallel_analysis(project_description, agents, reuse=reuse,
+                                    task_templates=templates, keywords=keywords)
+        logger.debug("stage timings\n%s", dag.format_report())
+        return dag.outputs
+
+    keyword_extractor = agents["keyword_extractor"]
+    researcher = agents["researcher"]
+    summarizer = agents["summarizer"]
+    validator = agents["validator"]
+
+    # Create tasks
+    keyword_task = _task_from_template(
+        templates, "keywords",
+        description=KEYWORD_TASK.format(project_description=project_description),
+        callback=_stage_transition("keywords", "research")
     )
 
-    research_task = Task(
-        description="""Using the extracted keywords, search for and analyze relevant research papers 
-        and technical documentation. Focus on finding papers that address the key concepts.""",
-        agent=researcher
+    # Each later task receives a compacted context instead of the raw output
+    research_task = _task_from_template(
+        templates, "research",
+        callback=_stage_transition("research", "summary"),
+        context_builder=_context_builder("research", keywords)
     )
 
-    summary_task = Task(
-        description="""Create a comprehensive summary of the research findings, focusing on how they 
-        relate to the project requirements. Highlight key insights and potential applications.""",
-        agent=summarizer
+    summary_task = _task_from_template(
+        templates, "summary",
+        callback=_stage_transition("summary", "validation"),
+        context_builder=_context_builder("summary", reuse.research if reuse else None)
     )
 
-    validation_task = Task(
-        description="""Compare the original project description with the research summary. 
-        Validate if the research findings align with the project requirements and identify any gaps 
-        or areas that need additional research.""",
-        agent=validator
+    validation_task = _task_from_template(
+        templates, "validation",
+        description=VALIDATION_TASK.format(project_description=project_description),
+        callback=_stage_transition("validation"),
+        context_builder=_context_builder("validation")
     )
 
+    if reuse is not None:
+        # Keywords and research come from a similar earlier analysis
+        _replay_stages(reuse)
+        agents_to_run = [summarizer, validator]
+        tasks = [summary_task, validation_task]
+        first_stage = "summary"
+    elif keywords is not None:
+        # Keywords were extracted locally
+        agents_to_run = [researcher, summarizer, validator]
+        tasks = [research_task, summary_task, validation_task]
+        first_stage = "research"
+    else:
+        agents_to_run = [keyword_extractor, researcher, summarizer, validator]
+        tasks = [keyword_task, research_task, summary_task, validation_task]
+        first_stage = "keywords"
+
     # Create crew
     crew = Crew(
-        agents=[keyword_extractor, researcher, summarizer, validator],
-        tasks=[keyword_task, research_task, summary_task, validation_task],
-        verbose=2,
+        agents=agents_to_run,
+        tasks=tasks,
+        verbose=False,
         process=Process.sequential
     )
 
     # Execute the crew's tasks
-    result = crew.kickoff()
-    return result
+    _begin_stage(first_stage)
+    validation = crew.kickoff()
+    return {
+        "keywords": reuse.keywords if reuse else keywords or keyword_task.output.result,
+        "research": reuse.research if reuse else research_task.output.result,
+        "summary": summary_task.output.result,
+        "validation": validation,
+    }
 
 if __name__ == "__main__":
     # Example usage
@@ -179,6 +1206,7 @@ if __name__ == "__main__":
     The system should be scalable, secure, and capable of handling multiple data sources while maintaining user privacy.
     """
     
+    configure_logging()
     result = analyze_project(project_description)
     print("\nFinal Analysis Result:")
     print(result) 
\ No newline at end of file
@@ -0,0 +1,103 @@
+"""
+ResearchScope AI - Rate Limiting
+Thread-safe limiters shared by concurrent analyses.
+"""
+
+import threading
+import time
+from collections import deque
+from urllib.parse import urlparse
+
+
+class RequestsPerMinuteLimiter:
+    """Sliding-window limiter enforcing a global requests-per-minute budget.
+
+    A single instance is shared by every worker so the budget applies to the
+    whole process rather than to each crew.
+    """
+
+    def __init__(self, requests_per_minute: int, window_seconds: float = 60.0):
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be positive")
+        self.requests_per_minute = requests_per_minute
+        self.window_seconds = window_seconds
+        self._timestamps = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block until a request slot is free; return the seconds spent waiting"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._timestamps and self._timestamps[0] <= now - self.window_seconds:
+                    self._timestamps.popleft()
+
+                if len(self._timestamps) < self.requests_per_minute:
+                    self._timestamps.append(now)
+                    return waited
+
+                delay = self._timestamps[0] + self.window_seconds - now
+
+            time.sleep(delay)
+            waited += delay
+
+
+class TokenBucket:
+    """Token bucket allowing short bursts up to capacity at a sustained rate"""
+
+    def __init__(self, rate: float, capacity: float):
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available without blocking"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def acquire(self) -> float:
+        """Block until a token is available; return the seconds spent waiting"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+
+            time.sleep(delay)
+            waited += delay
+
+
+class HostRateLimiter:
+    """Keeps one token bucket per host so one slow or strict host is throttled alone"""
+
+    def __init__(self, rate: float = 1.0, burst: float = 5.0):
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return self._buckets[host]
+
+    def acquire(self, url: str) -> float:
+        """Wait for the bucket of the host in url; return the seconds spent waiting"""
+        return self.bucket(urlparse(url).netloc.lower()).acquire()
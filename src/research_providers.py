@@ -0,0 +1,384 @@
+"""
+ResearchScope AI - Research Providers
+Paper search backends behind one interface (Google Scholar HTML, arXiv Atom,
+Semantic Scholar JSON, and an offline fixture), plus the fan-out that queries
+several of them at once and merges their results as they arrive.
+"""
+
+import json
+import os
+import re
+import time
+import xml.etree.ElementTree as ElementTree
+from concurrent.futures import FIRST_COMPLETED, Executor, wait
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+import requests
+
+from context_budget import normalize_title
+from scholar_parser import CHUNK_SIZE, default_backend, parse_results, parse_stream
+
+SCHOLAR_URL = "https://scholar.google.com/scholar"
+ARXIV_URL = "https://export.arxiv.org/api/query"
+SEMANTIC_SCHOLAR_URL = "https://api.semanticscholar.org/graph/v1/paper/search"
+DEFAULT_TIMEOUT = (3.05, 10.0)  # (connect, read) seconds
+DEFAULT_PROVIDERS = ("scholar", "arxiv", "semantic_scholar")
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+ARXIV = "{http://arxiv.org/schemas/atom}"
+DOI = re.compile(r"10\.\d{4,9}/[^\s\"<>]+", re.IGNORECASE)
+WORD = re.compile(r"[A-Za-z0-9]+")
+
+Record = Dict[str, str]
+
+
+class ProviderError(RuntimeError):
+    """Every provider failed for a query"""
+
+
+def collapse(text: Optional[str]) -> str:
+    return " ".join((text or "").split())
+
+
+def normalize_doi(value: Optional[str]) -> Optional[str]:
+    """The bare, lower-case DOI in value (a DOI, doi: URI or doi.org link)"""
+    match = DOI.search(value or "")
+    return match.group(0).rstrip(".").lower() if match else None
+
+
+def record_keys(record: Record) -> List[str]:
+    """Identities of a paper record: its DOI and its normalised title"""
+    keys = []
+    doi = normalize_doi(record.get("doi"))
+    if doi:
+        keys.append(f"doi:{doi}")
+    title = normalize_title(record.get("title") or "")
+    if title:
+        keys.append(f"title:{title}")
+    return keys
+
+
+class ResultMerger:
+    """Accumulates records, dropping any whose DOI or normalised title was seen"""
+
+    def __init__(self):
+        self.records: List[Record] = []
+        self._seen = set()
+
+    def add(self, records: Iterable[Record], **extra) -> int:
+        """Add the new records (with extra fields set); returns how many were new"""
+        added = 0
+        for record in records:
+            keys = record_keys(record)
+            if not keys or any(key in self._seen for key in keys):
+                continue
+            self._seen.update(keys)
+            self.records.append(dict(record, **extra))
+            added += 1
+        return added
+
+
+class SearchProvider:
+    """One paper search backend.
+
+    Subclasses describe the request (request()) and parse the response body
+    (parse()); search() does the round trip over the caller's pooled session.
+    `deadline` bounds the whole search in seconds, on top of the socket-level
+    (connect, read) timeout.
+    """
+
+    name = "provider"
+    default_url = ""
+    url_env = ""
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+        deadline: Optional[float] = None,
+    ):
+        self.base_url = base_url or (os.getenv(self.url_env) if self.url_env else None) or self.default_url
+        self.timeout = timeout
+        self.deadline = deadline if deadline is not None else sum(timeout)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.base_url!r}, deadline={self.deadline})"
+
+    def request(self, query: str, limit: int) -> Tuple[Dict[str, Union[str, int]], Dict[str, str]]:
+        """Query parameters and extra headers for a search"""
+        raise NotImplementedError
+
+    def parse(self, text: str, limit: int) -> List[Record]:
+        """Paper records (title, snippet, optional url and doi) from a response body"""
+        raise NotImplementedError
+
+    def search(self, session: requests.Session, query: str, limit: int) -> List[Record]:
+        """Run one search and return parsed records; raises on failure"""
+        params, headers = self.request(query, limit)
+        response = session.get(self.base_url, params=params, headers=headers,
+                               timeout=self.timeout)
+        response.raise_for_status()
+        return self.parse(response.text, limit)
+
+
+class ScholarProvider(SearchProvider):
+    """Google Scholar (or the local stub server) results pages.
+
+    `parser` picks a scholar_parser backend (default: the fastest installed).
+    With the pure-Python "stream" backend the page is parsed while it
+    downloads and parsing stops at the limit-th result.
+    """
+
+    name = "scholar"
+    default_url = SCHOLAR_URL
+    url_env = "SCHOLAR_BASE_URL"
+
+    def __init__(self, base_url=None, timeout=DEFAULT_TIMEOUT, deadline=None,
+                 parser: Optional[str] = None):
+        super().__init__(base_url, timeout, deadline)
+        self.parser = parser or default_backend()
+
+    def request(self, query, limit):
+        return {"q": query}, {}
+
+    def parse(self, text, limit):
+        return parse_results(text, limit, self.parser)
+
+    def search(self, session, query, limit):
+        if self.parser != "stream":
+            return super().search(session, query, limit)
+
+        params, headers = self.request(query, limit)
+        with session.get(self.base_url, params=params, headers=headers,
+                         timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            if response.encoding is None:
+                response.encoding = "utf-8"
+            chunks = response.iter_content(chunk_size=CHUNK_SIZE, decode_unicode=True)
+            results = parse_stream(chunks, limit)
+            # Read the rest without parsing it, so the connection goes back to the pool
+            for _ in chunks:
+                pass
+        return results
+
+
+class ArxivProvider(SearchProvider):
+    """The arXiv export API (Atom feed)"""
+
+    name = "arxiv"
+    default_url = ARXIV_URL
+    url_env = "ARXIV_BASE_URL"
+
+    def request(self, query, limit):
+        terms = WORD.findall(query) or [query]
+        search = " AND ".join(f"all:{term}" for term in terms)
+        return {"search_query": search, "start": 0, "max_results": limit}, {}
+
+    def parse(self, text, limit):
+        feed = ElementTree.fromstring(text)
+        results = []
+        for entry in feed.iter(f"{ATOM}entry"):
+            title = collapse(entry.findtext(f"{ATOM}title"))
+            if not title:
+                continue
+            record = {"title": title, "snippet": collapse(entry.findtext(f"{ATOM}summary"))}
+            url = collapse(entry.findtext(f"{ATOM}id"))
+            if url:
+                record["url"] = url
+            doi = normalize_doi(entry.findtext(f"{ARXIV}doi"))
+            if doi:
+                record["doi"] = doi
+            results.append(record)
+            if len(results) >= limit:
+                break
+        return results
+
+
+class SemanticScholarProvider(SearchProvider):
+    """The Semantic Scholar Graph API paper search (JSON).
+
+    Set SEMANTIC_SCHOLAR_API_KEY for the higher authenticated rate limit.
+    """
+
+    name = "semantic_scholar"
+    default_url = SEMANTIC_SCHOLAR_URL
+    url_env = "SEMANTIC_SCHOLAR_BASE_URL"
+
+    def request(self, query, limit):
+        params = {"query": query, "limit": limit, "fields": "title,abstract,url,externalIds"}
+        api_key = os.getenv("SEMANTIC_SCHOLAR_API_KEY")
+        return params, ({"x-api-key": api_key} if api_key else {})
+
+    def parse(self, text, limit):
+        results = []
+        for paper in json.loads(text).get("data") or []:
+            title = collapse(paper.get("title"))
+            if not title:
+                continue
+            record = {"title": title, "snippet": collapse(paper.get("abstract"))}
+            if paper.get("url"):
+                record["url"] = paper["url"]
+            doi = normalize_doi((paper.get("externalIds") or {}).get("DOI"))
+            if doi:
+                record["doi"] = doi
+            results.append(record)
+            if len(results) >= limit:
+                break
+        return results
+
+
+class FixtureProvider(SearchProvider):
+    """Offline provider answering from fixed records.
+
+    `records` is either a list (a search returns those sharing a word with
+    the query) or a mapping from query to records. Without records, each
+    query gets deterministic synthetic papers. `latency` simulates a slow
+    backend.
+    """
+
+    name = "fixture"
+
+    def __init__(
+        self,
+        records: Optional[Union[List[Record], Dict[str, List[Record]]]] = None,
+        latency: float = 0.0,
+        name: Optional[str] = None,
+        deadline: Optional[float] = None,
+    ):
+        super().__init__(base_url=f"fixture://{name or self.name}", deadline=deadline)
+        self.records = records
+        self.latency = latency
+        if name:
+            self.name = name
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "FixtureProvider":
+        with open(path, encoding="utf-8") as f:
+            return cls(records=json.load(f), **kwargs)
+
+    def search(self, session, query, limit):
+        if self.latency:
+            time.sleep(self.latency)
+        if isinstance(self.records, dict):
+            return [dict(r) for r in self.records.get(query, [])[:limit]]
+        if self.records is not None:
+            terms = set(normalize_title(query).split())
+            return [
+                dict(r) for r in self.records
+                if terms & set(normalize_title(f"{r.get('title', '')} {r.get('snippet', '')}").split())
+            ][:limit]
+        topic = collapse(query).strip('"') or "research"
+        return [
+            {"title": f"{topic.title()}: {self.name} study {i + 1}",
+             "snippet": f"Approach {i + 1} to {topic}, evaluated on public benchmarks."}
+            for i in range(limit)
+        ]
+
+
+PROVIDERS = {
+    provider.name: provider
+    for provider in (ScholarProvider, ArxivProvider, SemanticScholarProvider, FixtureProvider)
+}
+
+
+def providers_from_env(timeout: Tuple[float, float] = DEFAULT_TIMEOUT) -> List[SearchProvider]:
+    """Providers named in RESEARCH_PROVIDERS, e.g. "scholar,arxiv:5,semantic_scholar".
+
+    A number after a colon is that provider's deadline in seconds. When the
+    variable is unset, all three online providers are used, except that
+    SCHOLAR_BASE_URL on its own keeps the scraper on that one (stub) endpoint.
+    The fixture provider reads RESEARCH_FIXTURE_PATH when it is set.
+    """
+    spec = os.getenv("RESEARCH_PROVIDERS")
+    if spec is None:
+        spec = "scholar" if os.getenv("SCHOLAR_BASE_URL") else ",".join(DEFAULT_PROVIDERS)
+
+    providers = []
+    for item in spec.split(","):
+        name, _, deadline = item.strip().partition(":")
+        if not name:
+            continue
+        if name not in PROVIDERS:
+            raise ValueError(f"Unknown research provider {name!r}; expected one of {sorted(PROVIDERS)}")
+        deadline = float(deadline) if deadline else None
+        if name == FixtureProvider.name:
+            path = os.getenv("RESEARCH_FIXTURE_PATH")
+            providers.append(FixtureProvider.from_file(path, deadline=deadline) if path
+                             else FixtureProvider(deadline=deadline))
+        else:
+            providers.append(PROVIDERS[name](timeout=timeout, deadline=deadline))
+    return providers
+
+
+class FanOut(NamedTuple):
+    """Merged records of one fanned-out search and how each provider fared"""
+
+    records: List[Record]
+    outcomes: Dict[str, Union[int, str]]  # new records contributed, or what went wrong
+    errors: List[str]
+    rate_limit_wait: float
+    failures: Dict[str, Exception]  # provider name -> the exception it raised
+
+
+def _timed_search(provider: SearchProvider, session, query: str, limit: int,
+                  rate_limiter) -> Tuple[List[Record], float]:
+    waited = rate_limiter.acquire(provider.base_url) if rate_limiter is not None else 0.0
+    return provider.search(session, query, limit), waited
+
+
+def fan_out(
+    providers: List[SearchProvider],
+    session: requests.Session,
+    query: str,
+    limit: int,
+    executor: Executor,
+    rate_limiter=None,
+) -> FanOut:
+    """Search every provider concurrently, merging results as they arrive.
+
+    Returns as soon as `limit` distinct papers are in, or when every
+    provider has answered, failed or passed its own deadline. Providers
+    still running at that point are abandoned (outcome "skipped" or
+    "timeout"); their threads finish in the background.
+    """
+    start = time.monotonic()
+    futures = {
+        executor.submit(_timed_search, provider, session, query, limit, rate_limiter): provider
+        for provider in providers
+    }
+    deadlines = {future: start + provider.deadline for future, provider in futures.items()}
+    merger = ResultMerger()
+    outcomes: Dict[str, Union[int, str]] = {}
+    errors: List[str] = []
+    failures: Dict[str, Exception] = {}
+    waited = 0.0
+
+    pending = set(futures)
+    try:
+        while pending and len(merger.records) < limit:
+            remaining = min(deadlines[f] for f in pending) - time.monotonic()
+            done, pending = wait(pending, timeout=max(0.0, remaining), return_when=FIRST_COMPLETED)
+            for future in done:
+                provider = futures[future]
+                try:
+                    records, provider_wait = future.result()
+                except Exception as e:
+                    outcomes[provider.name] = type(e).__name__
+                    errors.append(f"{provider.name}: {e}")
+                    failures[provider.name] = e
+                    continue
+                waited = max(waited, provider_wait)
+                outcomes[provider.name] = merger.add(records, source=provider.name)
+
+            now = time.monotonic()
+            for future in [f for f in pending if deadlines[f] <= now]:
+                pending.discard(future)
+                provider = futures[future]
+                outcomes[provider.name] = "timeout"
+                errors.append(f"{provider.name}: no answer within {provider.deadline:g}s")
+    finally:
+        for future in pending:
+            future.cancel()
+            outcomes[futures[future].name] = "skipped"
+
+    return FanOut(merger.records[:limit], outcomes, errors, waited, failures)
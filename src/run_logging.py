@@ -0,0 +1,279 @@
+"""
+ResearchScope AI - Run Logging
+Structured logging for analyses: JSON (or text) lines tagged with the run id
+and stage they belong to, handed to a background writer through a bounded
+queue so logging never blocks an analysis, with per-run sampling.
+
+Agent traces (steps, tool results, LLM output) are opt-in per run: pass
+verbose=True to analyze_project or set ANALYSIS_VERBOSE=1, and the run's
+trace is logged to researchscope.trace instead of printed to stdout.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import zlib
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler
+from typing import Any, Callable, Dict, Optional, TextIO
+
+from analysis_events import TOKEN, AnalysisEvent, current_stage
+from instrumentation import current_metrics
+
+LOGGER_NAME = "researchscope"
+TRACE_LOGGER_NAME = f"{LOGGER_NAME}.trace"
+
+DEFAULT_LEVEL = "WARNING"
+DEFAULT_FORMAT = "json"
+DEFAULT_BUFFER_SIZE = 10000
+BATCH_SIZE = 256
+
+# Attributes every LogRecord has; anything else on a record came from extra=
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+_STOP = object()
+
+
+def env_flag(name: str) -> bool:
+    return os.getenv(name, "").lower() in ("1", "true", "yes")
+
+
+def verbose_default() -> bool:
+    """Whether runs log their agent trace when the caller does not say"""
+    return env_flag("ANALYSIS_VERBOSE")
+
+
+class RunContextFilter(logging.Filter):
+    """Tags records with the run id and stage of the context that logged them"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "run_id", None) is None:
+            metrics = current_metrics()
+            record.run_id = metrics.run_id if metrics is not None else None
+        if getattr(record, "stage", None) is None:
+            record.stage = current_stage()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps all records of a `rate` share of runs, chosen by run id.
+
+    Sampling whole runs keeps every kept run's log complete. Warnings and
+    errors, and records outside a run, are always kept.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def sampled(self, run_id: str) -> bool:
+        return zlib.crc32(run_id.encode()) / 2 ** 32 < self.rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        run_id = getattr(record, "run_id", None)
+        return record.levelno >= logging.WARNING or run_id is None or self.sampled(run_id)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, run id, stage, message and extras"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and value is not None:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines prefixed with the short run id"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        run_id = getattr(record, "run_id", None)
+        stage = getattr(record, "stage", None)
+        tag = "/".join(part for part in (run_id[:8] if run_id else None, stage) if part)
+        return f"[{tag}] {line}" if tag else line
+
+
+class BufferedQueueHandler(QueueHandler):
+    """Queues records for the background writer without ever blocking the caller.
+
+    When the buffer is full the record is dropped and counted in `dropped`
+    rather than stalling the analysis that logged it.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_BUFFER_SIZE):
+        super().__init__(queue.Queue(capacity))
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message and traceback now (the writer thread may see the
+        # record long after its arguments changed) but keep the extras
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogWriter:
+    """Background thread writing queued records in batches, one write and flush per batch"""
+
+    def __init__(self, records: queue.Queue, stream: TextIO, formatter: logging.Formatter,
+                 batch_size: int = BATCH_SIZE):
+        self.records = records
+        self.stream = stream
+        self.formatter = formatter
+        self.batch_size = batch_size
+        self._thread = threading.Thread(target=self._run, name="researchscope-log-writer",
+                                        daemon=True)
+
+    def start(self) -> "LogWriter":
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while True:
+            batch = [self.records.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.records.get_nowait())
+                except queue.Empty:
+                    break
+            lines = []
+            for record in batch:
+                if record is _STOP:
+                    continue
+                try:
+                    lines.append(self.formatter.format(record))
+                except Exception:
+                    # A record that cannot be formatted is skipped, not fatal
+                    pass
+            if lines:
+                try:
+                    self.stream.write("\n".join(lines) + "\n")
+                    self.stream.flush()
+                except (OSError, ValueError):
+                    pass
+            if any(record is _STOP for record in batch):
+                return
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Write out everything queued so far and end the thread"""
+        if self._thread.is_alive():
+            self.records.put(_STOP)
+            self._thread.join(timeout)
+
+
+_lock = threading.Lock()
+_active: Optional[tuple] = None  # (handler, writer, stream opened by us or None)
+
+
+def configure_logging(level: Optional[str] = None, fmt: Optional[str] = None,
+                      path: Optional[str] = None, sample_rate: Optional[float] = None,
+                      buffer_size: Optional[int] = None) -> BufferedQueueHandler:
+    """Send researchscope logs through a buffered background writer.
+
+    Unset arguments come from LOG_LEVEL (default WARNING), LOG_FORMAT (json
+    or text), LOG_FILE (default stderr), LOG_SAMPLE_RATE (share of runs
+    logged below WARNING, default 1) and LOG_BUFFER_SIZE. Calling it again
+    replaces the previous configuration. Returns the handler, whose
+    `dropped` counts records lost to a full buffer.
+    """
+    global _active
+    level = (level or os.getenv("LOG_LEVEL", DEFAULT_LEVEL)).upper()
+    fmt = fmt or os.getenv("LOG_FORMAT", DEFAULT_FORMAT)
+    path = path or os.getenv("LOG_FILE")
+    if sample_rate is None:
+        sample_rate = float(os.getenv("LOG_SAMPLE_RATE", "1"))
+    buffer_size = buffer_size or int(os.getenv("LOG_BUFFER_SIZE", DEFAULT_BUFFER_SIZE))
+    if fmt not in ("json", "text"):
+        raise ValueError(f"Unknown log format {fmt!r}; use json or text")
+
+    handler = BufferedQueueHandler(buffer_size)
+    handler.addFilter(RunContextFilter())
+    if sample_rate < 1:
+        handler.addFilter(SamplingFilter(sample_rate))
+    owned = open(path, "a", encoding="utf-8") if path else None
+    formatter = JsonFormatter() if fmt == "json" else TextFormatter()
+    writer = LogWriter(handler.queue, owned or sys.stderr, formatter).start()
+
+    with _lock:
+        previous, _active = _active, (handler, writer, owned)
+        logger = logging.getLogger(LOGGER_NAME)
+        if previous is not None:
+            logger.removeHandler(previous[0])
+        logger.addHandler(handler)
+        logger.setLevel(level)
+        logger.propagate = False
+        # Traces are opted into per run, so they pass whatever the level
+        logging.getLogger(TRACE_LOGGER_NAME).setLevel(logging.INFO)
+    if previous is not None:
+        _close(previous)
+    return handler
+
+
+def _close(active: tuple) -> None:
+    _handler, writer, owned = active
+    writer.stop()
+    if owned is not None:
+        owned.close()
+
+
+def shutdown_logging() -> None:
+    """Flush and stop the background writer (also run at exit)"""
+    global _active
+    with _lock:
+        active, _active = _active, None
+        if active is not None:
+            logging.getLogger(LOGGER_NAME).removeHandler(active[0])
+    if active is not None:
+        _close(active)
+
+
+atexit.register(shutdown_logging)
+
+
+def tracing(on_event: Optional[Callable[[AnalysisEvent], None]] = None,
+            run_id: Optional[str] = None) -> Callable[[AnalysisEvent], None]:
+    """Event listener logging a run's agent trace, then passing events on to on_event.
+
+    Streamed tokens are left out; the LLM output they add up to is logged.
+    """
+    trace = logging.getLogger(TRACE_LOGGER_NAME)
+
+    def listener(event: AnalysisEvent) -> None:
+        if event.type != TOKEN:
+            extra: Dict[str, Any] = {"event": event.type, "stage": event.stage, "run_id": run_id}
+            data = event.to_dict().get("data")
+            if data is not None:
+                extra["data"] = data
+            trace.info(event.text, extra=extra)
+        if on_event is not None:
+            on_event(event)
+
+    return listener
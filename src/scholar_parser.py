@@ -0,0 +1,214 @@
+"""
+ResearchScope AI - Scholar Parser
+Extracts paper records from Scholar results pages without building a full
+document tree. Uses selectolax or lxml when installed, otherwise a streaming
+parser on the standard library that stops once enough results are found.
+"""
+
+import os
+from html.parser import HTMLParser
+from typing import Callable, Dict, Iterable, List, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # optional: fastest backend when installed
+    LexborHTMLParser = None
+
+try:
+    import lxml.html
+except ImportError:  # optional: fast backend when installed
+    lxml = None
+
+Record = Dict[str, str]
+
+CHUNK_SIZE = 16 * 1024
+RESULT_CLASS = "gs_ri"
+SNIPPET_CLASS = "gs_rs"
+
+
+def has_class(attrs, name: str) -> bool:
+    for key, value in attrs:
+        if key == "class" and value and name in value.split():
+            return True
+    return False
+
+
+class StreamingResultParser(HTMLParser):
+    """Incremental parser for Scholar result blocks.
+
+    Feed it the page in chunks; it keeps only the text it needs (the first
+    h3 and the first gs_rs div of each gs_ri block) and sets `done` once
+    `limit` records are complete, so the caller can stop feeding.
+    """
+
+    def __init__(self, limit: int):
+        super().__init__(convert_charrefs=True)
+        self.limit = limit
+        self.results: List[Record] = []
+        self.done = limit <= 0
+        self._depth = 0  # div nesting inside the current gs_ri block; 0 outside
+        self._title: Optional[List[str]] = None
+        self._in_title = False
+        self._url: Optional[str] = None
+        self._snippet: Optional[List[str]] = None
+        self._snippet_depth: Optional[int] = None
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if not self._depth:
+            if tag == "div" and has_class(attrs, RESULT_CLASS):
+                self._depth = 1
+                self._title = self._url = self._snippet = None
+            return
+
+        if tag == "div":
+            self._depth += 1
+            if self._snippet is None and not self._in_title and has_class(attrs, SNIPPET_CLASS):
+                self._snippet = []
+                self._snippet_depth = self._depth
+        elif tag == "h3" and self._title is None:
+            self._title = []
+            self._in_title = True
+        elif tag == "a" and self._in_title and self._url is None:
+            self._url = dict(attrs).get("href")
+
+    def handle_endtag(self, tag):
+        if self.done or not self._depth:
+            return
+        if tag == "h3":
+            self._in_title = False
+        elif tag == "div":
+            if self._snippet_depth == self._depth:
+                self._snippet_depth = None
+            self._depth -= 1
+            if not self._depth:
+                self._finish_result()
+
+    def handle_data(self, data):
+        if self._in_title:
+            self._title.append(data)
+        if self._snippet_depth is not None:
+            self._snippet.append(data)
+
+    def _finish_result(self) -> None:
+        self._in_title = False
+        self._snippet_depth = None
+        if self._title is None or self._snippet is None:
+            return
+        record = {"title": "".join(self._title), "snippet": "".join(self._snippet)}
+        if self._url is not None:
+            record["url"] = self._url
+        self.results.append(record)
+        if len(self.results) >= self.limit:
+            self.done = True
+
+
+def parse_stream(chunks: Iterable[str], limit: int) -> List[Record]:
+    """Parse a page arriving in text chunks, stopping once limit records are found"""
+    parser = StreamingResultParser(limit)
+    for chunk in chunks:
+        parser.feed(chunk)
+        if parser.done:
+            break
+    return parser.results
+
+
+def parse_streaming(html: str, limit: int) -> List[Record]:
+    # feed() tokenises everything it is given, so chunking is what lets it stop early
+    return parse_stream((html[i:i + CHUNK_SIZE] for i in range(0, len(html), CHUNK_SIZE)), limit)
+
+
+def parse_selectolax(html: str, limit: int) -> List[Record]:
+    results = []
+    for block in LexborHTMLParser(html).css(f"div.{RESULT_CLASS}"):
+        title = block.css_first("h3")
+        snippet = block.css_first(f"div.{SNIPPET_CLASS}")
+        if title is None or snippet is None:
+            continue
+        record = {"title": title.text(deep=True), "snippet": snippet.text(deep=True)}
+        link = title.css_first("a[href]")
+        if link is not None:
+            record["url"] = link.attributes["href"]
+        results.append(record)
+        if len(results) >= limit:
+            break
+    return results
+
+
+def _class_xpath(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def parse_lxml(html: str, limit: int) -> List[Record]:
+    if not html.strip():
+        return []
+    results = []
+    for block in lxml.html.fromstring(html).xpath(f"//div[{_class_xpath(RESULT_CLASS)}]"):
+        titles = block.xpath(".//h3")
+        snippets = block.xpath(f".//div[{_class_xpath(SNIPPET_CLASS)}]")
+        if not titles or not snippets:
+            continue
+        record = {"title": titles[0].text_content(), "snippet": snippets[0].text_content()}
+        links = titles[0].xpath(".//a[@href]")
+        if links:
+            record["url"] = links[0].get("href")
+        results.append(record)
+        if len(results) >= limit:
+            break
+    return results
+
+
+def parse_bs4(html: str, limit: int) -> List[Record]:
+    """BeautifulSoup reference parser, building only the gs_ri subtrees"""
+    soup = BeautifulSoup(html, "html.parser", parse_only=SoupStrainer("div", class_=RESULT_CLASS))
+    results = []
+
+    # Extract paper titles and snippets
+    for result in soup.find_all("div", class_=RESULT_CLASS):
+        title = result.find("h3")
+        snippet = result.find("div", class_=SNIPPET_CLASS)
+        if title and snippet:
+            record = {
+                "title": title.text,
+                "snippet": snippet.text
+            }
+            link = title.find("a", href=True)
+            if link:
+                record["url"] = link["href"]
+            results.append(record)
+            if len(results) >= limit:
+                break
+    return results
+
+
+BACKENDS: Dict[str, Callable[[str, int], List[Record]]] = {
+    "selectolax": parse_selectolax,
+    "lxml": parse_lxml,
+    "stream": parse_streaming,
+    "bs4": parse_bs4,
+}
+
+
+def available_backends() -> List[str]:
+    """Installed backends, fastest first"""
+    installed = {"selectolax": LexborHTMLParser is not None, "lxml": lxml is not None}
+    return [name for name in BACKENDS if installed.get(name, True)]
+
+
+def default_backend() -> str:
+    """SCHOLAR_PARSER if set, else the fastest installed backend"""
+    name = os.getenv("SCHOLAR_PARSER")
+    if name:
+        if name not in available_backends():
+            raise ValueError(f"Scholar parser {name!r} is not available; "
+                             f"installed: {', '.join(available_backends())}")
+        return name
+    return available_backends()[0]
+
+
+def parse_results(html: str, limit: int, backend: Optional[str] = None) -> List[Record]:
+    """Up to limit title/snippet(/url) records from a Scholar results page"""
+    return BACKENDS[backend or default_backend()](html, limit)
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+ResearchScope AI - Scholar Stub Server
+Local stand-in for Google Scholar so the web scraper can run offline. It
+also answers arXiv (/arxiv) and Semantic Scholar (/semantic_scholar) style
+searches for the same synthetic papers.
+
+Usage:
+    python src/scholar_stub_server.py --port 8765
+    SCHOLAR_BASE_URL=http://127.0.0.1:8765/scholar python run_app.py
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+from urllib.parse import parse_qs, urlparse
+
+RESULT_TEMPLATE = """
+<div class="gs_r gs_or gs_scl">
+  <div class="gs_ri">
+    <h3 class="gs_rt"><a href="https://example.org/papers/{paper_id}">{title}</a></h3>
+    <div class="gs_a">A. Author, B. Author - Journal of {topic}, {year}</div>
+    <div class="gs_rs">{snippet}</div>
+  </div>
+</div>
+"""
+
+
+def render_results_page(query: str, count: int = 10) -> str:
+    """Render a deterministic Scholar-like results page for a query"""
+    topic = html.escape(query.strip().strip('"') or "research")
+    blocks = []
+    for i in range(count):
+        paper_id = hashlib.sha1(f"{query}:{i}".encode("utf-8")).hexdigest()[:12]
+        blocks.append(RESULT_TEMPLATE.format(
+            paper_id=paper_id,
+            title=f"{topic.title()}: study {i + 1}",
+            topic=topic,
+            year=2015 + i % 10,
+            snippet=f"We present approach {i + 1} to {topic}, evaluated on public benchmarks.",
+        ))
+    return (
+        "<html><head><title>Scholar stub</title></head><body>"
+        f'<div id="gs_res_ccl_mid">{"".join(blocks)}</div>'
+        "</body></html>"
+    )
+
+
+ARXIV_ENTRY = """
+  <entry>
+    <id>http://arxiv.org/abs/{paper_id}</id>
+    <title>{title}</title>
+    <summary>{snippet}</summary>
+    <arxiv:doi>10.5555/stub.{paper_id}</arxiv:doi>
+  </entry>"""
+
+
+def stub_papers(topic: str, count: int):
+    """Synthetic papers on a topic, shared by the arXiv and Semantic Scholar endpoints"""
+    topic = topic.strip().strip('"') or "research"
+    for i in range(count):
+        yield {
+            "paper_id": hashlib.sha1(f"{topic.lower()}:{i}".encode("utf-8")).hexdigest()[:12],
+            "title": f"{topic.title()}: study {i + 1}",
+            "snippet": f"We present approach {i + 1} to {topic}, evaluated on public benchmarks.",
+        }
+
+
+def render_arxiv_feed(search_query: str, count: int = 10) -> str:
+    """Render an arXiv-API-like Atom feed for a search_query such as all:a AND all:b"""
+    topic = " ".join(re.sub(r"\ball:|\bAND\b", " ", search_query).split())
+    entries = "".join(
+        ARXIV_ENTRY.format(**{k: html.escape(v) for k, v in paper.items()})
+        for paper in stub_papers(topic, count)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:arxiv="http://arxiv.org/schemas/atom">'
+        f"<title>arXiv stub</title>{entries}\n</feed>"
+    )
+
+
+def render_semantic_scholar(query: str, count: int = 10) -> str:
+    """Render a Semantic Scholar paper-search-like JSON response"""
+    data = [
+        {
+            "paperId": paper["paper_id"],
+            "title": paper["title"],
+            "abstract": paper["snippet"],
+            "url": f"https://example.org/papers/{paper['paper_id']}",
+            "externalIds": {"DOI": f"10.5555/stub.{paper['paper_id']}"},
+        }
+        for paper in stub_papers(query, count)
+    ]
+    return json.dumps({"total": len(data), "offset": 0, "data": data})
+
+
+class ScholarStubHandler(BaseHTTPRequestHandler):
+    """Serves /scholar?q=..., /arxiv?search_query=... and
+    /semantic_scholar?query=... with synthetic results"""
+
+    protocol_version = "HTTP/1.1"  # keep-alive, so pooled clients reuse connections
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        count = self.server.results_per_page
+        path = url.path.rstrip("/")
+        if path == "/scholar":
+            content_type = "text/html; charset=utf-8"
+            body = render_results_page(params.get("q", [""])[0], count)
+        elif path == "/arxiv":
+            content_type = "application/atom+xml; charset=utf-8"
+            limit = int(params.get("max_results", [count])[0])
+            body = render_arxiv_feed(params.get("search_query", [""])[0], min(count, limit))
+        elif path == "/semantic_scholar":
+            content_type = "application/json"
+            limit = int(params.get("limit", [count])[0])
+            body = render_semantic_scholar(params.get("query", [""])[0], min(count, limit))
+        else:
+            self.send_error(404)
+            return
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        body = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ScholarStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency: float = 0.0, results_per_page: int = 10,
+                 verbose: bool = False):
+        super().__init__(address, ScholarStubHandler)
+        self.latency = latency
+        self.results_per_page = results_per_page
+        self.verbose = verbose
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/scholar"
+
+
+def start_stub_server(
+    host: str = "127.0.0.1",
+    port: int = 0,
+    latency: float = 0.0,
+    results_per_page: int = 10,
+) -> Tuple[ScholarStubServer, str]:
+    """Start the stub server on a background thread; return (server, base_url)"""
+    server = ScholarStubServer((host, port), latency=latency,
+                               results_per_page=results_per_page)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, server.base_url
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve synthetic Scholar results locally")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Seconds to sleep before each response")
+    args = parser.parse_args()
+
+    server = ScholarStubServer((args.host, args.port), latency=args.latency, verbose=True)
+    print(f"📚 Scholar stub server listening on {server.base_url}")
+    print(f"💡 export SCHOLAR_BASE_URL={server.base_url}")
+    print(f"💡 export ARXIV_BASE_URL={server.base_url[:-len('/scholar')]}/arxiv")
+    print(f"💡 export SEMANTIC_SCHOLAR_BASE_URL={server.base_url[:-len('/scholar')]}/semantic_scholar")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopping stub server")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+ResearchScope AI - Scrape Cache
+In-memory TTL cache for web scraper results, including short-lived failures,
+and cooldowns for hosts that block or refuse requests.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_TTL_SECONDS = 6 * 3600
+DEFAULT_NEGATIVE_TTL_SECONDS = 60
+DEFAULT_MAX_ENTRIES = 2048
+
+_QUOTES = "\"'`‘’“”"
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Normalise a search query so trivially different inputs share a key.
+
+    Agents often wrap tool input in quotes and vary case or spacing, e.g.
+    '"Anomaly  detection"' and 'anomaly detection' are the same search.
+    """
+    query = query.translate(str.maketrans("", "", _QUOTES))
+    return _WHITESPACE.sub(" ", query).strip().lower()
+
+
+class ScrapeCache:
+    """Thread-safe LRU cache of scrape results with separate TTLs for failures.
+
+    Successful results are kept for ttl_seconds. Failures are cached for the
+    much shorter negative_ttl_seconds so a query that failed is not retried
+    on every tool call, but recovers quickly once the host is healthy.
+
+    A block or rate limit applies to a whole host, not to one query, so a
+    host that refused a request is put in cooldown (block_host) for the
+    negative TTL, or for as long as its Retry-After asks; searches skip it
+    until then whatever the query.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        negative_ttl_seconds: float = DEFAULT_NEGATIVE_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._blocked: Dict[str, Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, query: str) -> Optional[Any]:
+        """Return cached results (or a cached error string), else None"""
+        key = normalize_query(query)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            expires_at, value, failed = entry
+            if failed:
+                self.negative_hits += 1
+                return value
+            self.hits += 1
+            return [dict(record) for record in value]
+
+    def set(self, query: str, results: List[dict]) -> None:
+        """Cache a successful result list"""
+        self._store(query, [dict(record) for record in results], self.ttl_seconds, False)
+
+    def set_failure(self, query: str, error: str) -> None:
+        """Cache an error message for the negative TTL"""
+        self._store(query, error, self.negative_ttl_seconds, True)
+
+    def _store(self, query: str, value: Any, ttl: float, failed: bool) -> None:
+        key = normalize_query(query)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value, failed)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def block_host(self, host: str, error: str, seconds: Optional[float] = None) -> None:
+        """Skip host for seconds (default: the negative TTL), remembering why"""
+        seconds = max(seconds or 0.0, self.negative_ttl_seconds)
+        with self._lock:
+            self._blocked[host.lower()] = (time.monotonic() + seconds, error)
+
+    def host_blocked(self, host: str) -> Optional[str]:
+        """The error that put host in cooldown, or None when it may be contacted"""
+        host = host.lower()
+        with self._lock:
+            entry = self._blocked.get(host)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._blocked[host]
+                return None
+            return entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._blocked.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "entries": len(self),
+            "blocked_hosts": sum(1 for expires_at, _ in list(self._blocked.values())
+                                 if expires_at > time.monotonic()),
+        }
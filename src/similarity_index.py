@@ -0,0 +1,212 @@
+"""
+ResearchScope AI - Similarity Index
+MinHash index over previously analysed project descriptions. A description
+that is a small edit of an earlier one is matched to it, so the keyword and
+research stages can reuse the earlier outputs instead of calling Gemini and
+Scholar again.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import zlib
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+from sqlalchemy import Column, Float, LargeBinary, MetaData, String, Table, Text, delete, select, update
+
+from sqlite_store import SQLiteStore, env_flag, evict, is_expired
+
+DEFAULT_INDEX_PATH = os.path.join(".cache", "similar_descriptions.db")
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 5000
+
+SHINGLE_WORDS = 3
+NUM_PERMUTATIONS = 128
+# Prime above every 32-bit shingle hash; with a, b < 2**31 nothing overflows uint64
+HASH_PRIME = np.uint64(4294967311)
+
+WORD = re.compile(r"[a-z0-9]+")
+
+_random = np.random.RandomState(20240517)
+PERM_A = _random.randint(1, 2 ** 31, size=NUM_PERMUTATIONS).astype(np.uint64)
+PERM_B = _random.randint(0, 2 ** 31, size=NUM_PERMUTATIONS).astype(np.uint64)
+
+metadata = MetaData()
+
+descriptions_table = Table(
+    "analysed_descriptions",
+    metadata,
+    Column("id", String(64), primary_key=True),
+    Column("signature", LargeBinary, nullable=False),
+    Column("keywords", Text, nullable=False),
+    Column("research", Text, nullable=False),
+    Column("papers", Text, nullable=False),
+    Column("created_at", Float, nullable=False),
+    Column("last_used", Float, nullable=False, index=True),
+)
+
+
+def description_words(text: str) -> List[str]:
+    return WORD.findall(text.lower())
+
+
+def description_id(text: str) -> str:
+    """Identical descriptions (ignoring case, punctuation and spacing) share an id"""
+    return hashlib.sha256(" ".join(description_words(text)).encode("utf-8")).hexdigest()
+
+
+def shingle_hashes(text: str, size: int = SHINGLE_WORDS) -> np.ndarray:
+    """32-bit hashes of the word shingles of text"""
+    words = description_words(text)
+    if len(words) <= size:
+        shingles = [" ".join(words)]
+    else:
+        shingles = [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+    return np.fromiter(
+        (zlib.crc32(s.encode("utf-8")) for s in set(shingles)), dtype=np.uint64
+    )
+
+
+def minhash(text: str) -> np.ndarray:
+    """MinHash signature of text; the share of equal slots estimates Jaccard similarity"""
+    hashes = shingle_hashes(text)
+    permuted = (PERM_A[:, None] * hashes[None, :] + PERM_B[:, None]) % HASH_PRIME
+    return permuted.min(axis=1)
+
+
+class Match(NamedTuple):
+    """Stage outputs stored for an earlier, similar description"""
+
+    entry_id: str
+    similarity: float
+    keywords: str
+    research: str
+    papers: List[Dict[str, str]]
+
+
+class SimilarityIndex(SQLiteStore):
+    """On-disk index of analysed descriptions with their reusable stage outputs.
+
+    Signatures are loaded into one NumPy matrix on first use, so a lookup is a
+    single vectorised comparison against every stored description. Entries
+    expire after ttl_seconds and the least recently used are evicted beyond
+    max_entries.
+    """
+
+    metadata = metadata
+
+    def __init__(
+        self,
+        path: str = DEFAULT_INDEX_PATH,
+        threshold: float = DEFAULT_THRESHOLD,
+        ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        enabled: bool = True,
+    ):
+        super().__init__(path, enabled)
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._ids: List[str] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "SimilarityIndex":
+        """Build an index from the SIMILARITY_* environment variables"""
+        return cls(
+            path=os.getenv("SIMILARITY_INDEX_PATH", DEFAULT_INDEX_PATH),
+            threshold=float(os.getenv("SIMILARITY_THRESHOLD", DEFAULT_THRESHOLD)),
+            enabled=not env_flag("SIMILARITY_BYPASS"),
+        )
+
+    def _load(self) -> None:
+        """Read every signature into memory (called with the lock held)"""
+        if self._matrix is not None:
+            return
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(descriptions_table.c.id, descriptions_table.c.signature)
+            ).all()
+        self._ids = [row.id for row in rows]
+        self._matrix = (
+            np.vstack([np.frombuffer(row.signature, dtype=np.uint64) for row in rows])
+            if rows else np.empty((0, NUM_PERMUTATIONS), dtype=np.uint64)
+        )
+
+    def find(self, description: str) -> Optional[Match]:
+        """The stored description most similar to description, if above the threshold.
+
+        Candidates are tried best first, so an expired best match does not
+        hide a live one just below it.
+        """
+        if not self.enabled:
+            return None
+
+        signature = minhash(description)
+        with self._lock:
+            self._load()
+            if not self._ids:
+                return None
+            scores = (self._matrix == signature).mean(axis=1)
+            above = np.flatnonzero(scores >= self.threshold)
+            candidates = [(self._ids[i], float(scores[i]))
+                          for i in above[np.argsort(-scores[above], kind="stable")]]
+        if not candidates:
+            return None
+
+        now = time.time()
+        with self.engine.begin() as conn:
+            for entry_id, similarity in candidates:
+                row = conn.execute(
+                    select(descriptions_table).where(descriptions_table.c.id == entry_id)
+                ).first()
+                if row is None or is_expired(row.created_at, now, self.ttl_seconds):
+                    continue
+                conn.execute(
+                    update(descriptions_table)
+                    .where(descriptions_table.c.id == entry_id)
+                    .values(last_used=now)
+                )
+                return Match(entry_id, similarity, row.keywords, row.research,
+                             json.loads(row.papers))
+        return None
+
+    def add(self, description: str, keywords: str, research: str,
+            papers: List[Dict[str, str]]) -> None:
+        """Store a description's keyword and research outputs"""
+        if not self.enabled:
+            return
+
+        entry_id = description_id(description)
+        signature = minhash(description)
+        now = time.time()
+        with self._lock:
+            with self.engine.begin() as conn:
+                conn.execute(delete(descriptions_table).where(descriptions_table.c.id == entry_id))
+                conn.execute(descriptions_table.insert().values(
+                    id=entry_id,
+                    signature=signature.tobytes(),
+                    keywords=keywords,
+                    research=research,
+                    papers=json.dumps(papers, ensure_ascii=False),
+                    created_at=now,
+                    last_used=now,
+                ))
+                evicted = evict(conn, descriptions_table, descriptions_table.c.id,
+                                descriptions_table.c.created_at, descriptions_table.c.last_used,
+                                now, self.ttl_seconds, self.max_entries) > 0
+
+            if evicted:
+                self._matrix = None
+            elif self._matrix is not None:
+                if entry_id in self._ids:
+                    self._matrix[self._ids.index(entry_id)] = signature
+                else:
+                    self._ids.append(entry_id)
+                    self._matrix = np.vstack([self._matrix, signature])
@@ -0,0 +1,76 @@
+"""
+ResearchScope AI - SQLite Store
+Shared plumbing for the on-disk stores (LLM response cache, similarity index,
+paper index, stage memo, keyword corpus and analysis history): opening the
+SQLite file, the *_BYPASS environment flags and TTL/LRU eviction.
+"""
+
+import os
+from typing import Optional, Sequence
+
+from sqlalchemy import Column, MetaData, Table, create_engine, delete, event, func, select
+from sqlalchemy.engine import Engine
+
+TRUE_VALUES = ("1", "true", "yes")
+
+
+def env_flag(name: str) -> bool:
+    """Whether an on/off environment variable is set (1, true or yes)"""
+    return os.getenv(name, "").lower() in TRUE_VALUES
+
+
+def create_sqlite_engine(path: str, pragmas: Sequence[str] = ()) -> Engine:
+    """Engine for a SQLite file, creating its directory; pragmas run on every connection"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    if pragmas:
+        @event.listens_for(engine, "connect")
+        def _pragmas(dbapi_connection, _record):
+            for pragma in pragmas:
+                dbapi_connection.execute(f"PRAGMA {pragma}")
+    return engine
+
+
+class SQLiteStore:
+    """A store kept in one SQLite file, with its tables created on open.
+
+    A disabled (bypassed) store opens nothing: engine is None and no file
+    is created, so subclasses check enabled before touching the engine.
+    """
+
+    metadata: MetaData
+    pragmas: Sequence[str] = ()
+
+    def __init__(self, path: str, enabled: bool = True):
+        self.path = path
+        self.enabled = enabled
+        self.engine: Optional[Engine] = None
+        if enabled:
+            self.engine = create_sqlite_engine(path, self.pragmas)
+            self.metadata.create_all(self.engine)
+
+
+def is_expired(created_at: float, now: float, ttl_seconds: Optional[float]) -> bool:
+    return ttl_seconds is not None and created_at < now - ttl_seconds
+
+
+def evict(conn, table: Table, key: Column, created: Column, used: Column, now: float,
+          ttl_seconds: Optional[float], max_entries: int) -> int:
+    """Drop rows older than ttl_seconds, then the least recently used over max_entries.
+
+    Returns how many rows were removed.
+    """
+    removed = 0
+    if ttl_seconds is not None:
+        removed += conn.execute(delete(table).where(created < now - ttl_seconds)).rowcount
+
+    count = conn.execute(select(func.count()).select_from(table)).scalar()
+    overflow = count - max_entries
+    if overflow > 0:
+        oldest = select(key).order_by(used.asc()).limit(overflow)
+        removed += conn.execute(delete(table).where(key.in_(oldest))).rowcount
+    return removed
@@ -0,0 +1,153 @@
+"""
+ResearchScope AI - Stage Memo
+Persistent memo of crew task outputs keyed by a fingerprint of everything the
+task's output depends on, so re-analysing an edited description recomputes
+only the stages whose inputs changed.
+"""
+
+import contextvars
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+from sqlalchemy import Column, Float, MetaData, String, Table, Text, delete, select, update
+
+from sqlite_store import SQLiteStore, env_flag, evict, is_expired
+
+DEFAULT_MEMO_PATH = os.path.join(".cache", "stage_outputs.db")
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 20000
+
+# Bump when the way outputs are produced changes without the prompts changing
+MEMO_FORMAT = 1
+
+metadata = MetaData()
+
+stage_outputs_table = Table(
+    "stage_outputs",
+    metadata,
+    Column("key", String(64), primary_key=True),
+    Column("stage", String(64), nullable=False),
+    Column("output", Text, nullable=False),
+    Column("papers", Text, nullable=False),
+    Column("created_at", Float, nullable=False),
+    Column("last_used", Float, nullable=False, index=True),
+)
+
+
+class MemoEntry(NamedTuple):
+    output: str
+    papers: List[Dict[str, str]]
+
+
+def stage_key(stage: str, agent: Any, task_description: str, context: Optional[str]) -> str:
+    """Fingerprint of a task's inputs.
+
+    Covers the task prompt (which embeds the description and the template
+    text, so editing a template invalidates its stage), the incoming context,
+    the agent's role, goal, backstory and tools, and the model settings.
+    """
+    llm = getattr(agent, "llm", None)
+    payload = json.dumps([
+        MEMO_FORMAT,
+        stage.split("[")[0],
+        task_description,
+        context or "",
+        getattr(agent, "role", ""),
+        getattr(agent, "goal", ""),
+        getattr(agent, "backstory", ""),
+        sorted(tool.name for tool in getattr(agent, "tools", None) or []),
+        getattr(llm, "model_name", type(llm).__name__),
+        getattr(llm, "temperature", None),
+    ], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class StageMemo(SQLiteStore):
+    """On-disk store of stage outputs with TTL expiry and LRU eviction"""
+
+    metadata = metadata
+
+    def __init__(
+        self,
+        path: str = DEFAULT_MEMO_PATH,
+        ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        enabled: bool = True,
+    ):
+        super().__init__(path, enabled)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+    @classmethod
+    def from_env(cls) -> "StageMemo":
+        """Build a memo from the STAGE_MEMO_* environment variables"""
+        return cls(
+            path=os.getenv("STAGE_MEMO_PATH", DEFAULT_MEMO_PATH),
+            enabled=not env_flag("STAGE_MEMO_BYPASS"),
+        )
+
+    def get(self, key: str) -> Optional[MemoEntry]:
+        if not self.enabled:
+            return None
+
+        now = time.time()
+        with self.engine.begin() as conn:
+            row = conn.execute(
+                select(stage_outputs_table).where(stage_outputs_table.c.key == key)
+            ).first()
+            if row is None:
+                return None
+            if is_expired(row.created_at, now, self.ttl_seconds):
+                conn.execute(delete(stage_outputs_table).where(stage_outputs_table.c.key == key))
+                return None
+            conn.execute(
+                update(stage_outputs_table)
+                .where(stage_outputs_table.c.key == key)
+                .values(last_used=now)
+            )
+        return MemoEntry(row.output, json.loads(row.papers))
+
+    def set(self, key: str, stage: str, output: str,
+            papers: Optional[List[Dict[str, str]]] = None) -> None:
+        """Store a stage's output with the papers its tools found"""
+        if not self.enabled:
+            return
+
+        now = time.time()
+        with self.engine.begin() as conn:
+            conn.execute(delete(stage_outputs_table).where(stage_outputs_table.c.key == key))
+            conn.execute(stage_outputs_table.insert().values(
+                key=key,
+                stage=stage,
+                output=output,
+                papers=json.dumps(papers or [], ensure_ascii=False),
+                created_at=now,
+                last_used=now,
+            ))
+            evict(conn, stage_outputs_table, stage_outputs_table.c.key,
+                  stage_outputs_table.c.created_at, stage_outputs_table.c.last_used,
+                  now, self.ttl_seconds, self.max_entries)
+
+
+_current_memo: contextvars.ContextVar[Optional[StageMemo]] = contextvars.ContextVar(
+    "researchscope_stage_memo", default=None
+)
+
+
+@contextmanager
+def memoizing(memo: Optional[StageMemo]) -> Iterator[Optional[StageMemo]]:
+    """Let stages run in this context reuse and store outputs in memo"""
+    token = _current_memo.set(memo)
+    try:
+        yield memo
+    finally:
+        _current_memo.reset(token)
+
+
+def current_memo() -> Optional[StageMemo]:
+    memo = _current_memo.get()
+    return memo if memo is not None and memo.enabled else None
@@ -0,0 +1,258 @@
+"""
+ResearchScope AI - Web Scraper
+Paper search tool with a pooled keep-alive HTTP client, concurrent
+multi-provider search and async multi-query fan-out.
+"""
+
+import asyncio
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from context_budget import record_papers, record_tool_error
+from instrumentation import SCRAPE, annotate, measure
+from research_providers import (
+    DEFAULT_TIMEOUT,
+    SCHOLAR_URL,
+    ProviderError,
+    ResultMerger,
+    ScholarProvider,
+    SearchProvider,
+    fan_out,
+    providers_from_env,
+)
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_RESULTS = 5
+USER_AGENT = "Mozilla/5.0 (compatible; ResearchScopeAI/1.0)"
+BLOCK_STATUSES = (403, 429, 503)  # the host refuses us, not the query
+
+
+def create_session(pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """Create a keep-alive session whose connection pool fits pool_size workers"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT})
+    return session
+
+
+def host_of(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+def host_cooldown(error: Exception) -> Optional[float]:
+    """Seconds a failed host should be left alone (0: the default), or None.
+
+    Blocks, rate limits and unreachable hosts fail every query the same
+    way; anything else (a parse error, a 404) is about this query only.
+    """
+    if isinstance(error, requests.HTTPError):
+        response = error.response
+        if response is None or response.status_code not in BLOCK_STATUSES:
+            return None
+        retry_after = response.headers.get("Retry-After", "")
+        return float(retry_after) if retry_after.isdigit() else 0.0
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return 0.0
+    return None
+
+
+def split_queries(query: str) -> List[str]:
+    """Split a tool input such as "a; b; c" into individual queries"""
+    parts = query.replace("\n", ";").split(";")
+    return [part.strip() for part in parts if part.strip()]
+
+
+class WebScraperTool:
+    """Searches paper providers (Scholar, arXiv, Semantic Scholar) for papers.
+
+    Each query goes to every provider at once; results are merged and
+    deduplicated by DOI and normalised title as they arrive, and the search
+    returns as soon as max_results distinct papers are in. A provider that
+    fails or misses its deadline is skipped as long as another one answers.
+    Passing base_url (or setting only SCHOLAR_BASE_URL) searches that single
+    Scholar-compatible endpoint, e.g. the local stub server for offline runs.
+
+    All requests go through one pooled session so repeated searches reuse
+    TCP/TLS connections, and every request has connect/read timeouts so a
+    stalled host cannot stall the crew.
+
+    An optional ScrapeCache answers repeated queries (and recently failed
+    ones, and hosts cooling down after a block) without network I/O, and an
+    optional HostRateLimiter throttles
+    outbound requests per host. With a PaperIndex, every fetched paper is
+    indexed and a query the index can answer well enough never leaves the
+    machine.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        max_results: int = DEFAULT_MAX_RESULTS,
+        session: Optional[requests.Session] = None,
+        cache=None,
+        rate_limiter=None,
+        paper_index=None,
+        providers: Optional[List[SearchProvider]] = None,
+    ):
+        if providers is None:
+            providers = ([ScholarProvider(base_url, timeout)] if base_url
+                         else providers_from_env(timeout))
+        if not providers:
+            raise ValueError("WebScraperTool needs at least one research provider")
+        self.providers = providers
+        self.base_url = base_url or os.getenv("SCHOLAR_BASE_URL", SCHOLAR_URL)
+        self.timeout = timeout
+        self.max_results = max_results
+        self.session = session or create_session(pool_size)
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.paper_index = paper_index
+        self._executor = ThreadPoolExecutor(
+            max_workers=pool_size, thread_name_prefix="scholar"
+        )
+        # Provider searches get their own pool: scrape_web itself may be
+        # running on self._executor, and must not wait on its own workers
+        self._provider_executor = ThreadPoolExecutor(
+            max_workers=pool_size * len(providers), thread_name_prefix="provider"
+        )
+
+    def fetch(self, query: str) -> List[Dict[str, str]]:
+        """Search all providers and return the merged records; raises if all fail.
+
+        Providers whose host is cooling down after a block are skipped, and
+        a provider failing in a way that affects every query cools its host.
+        """
+        providers, skipped = self.providers, {}
+        if self.cache is not None:
+            providers = []
+            for provider in self.providers:
+                blocked = self.cache.host_blocked(host_of(provider.base_url))
+                if blocked is None:
+                    providers.append(provider)
+                else:
+                    skipped[provider.name] = blocked
+            if not providers:
+                annotate(providers={name: "cooldown" for name in skipped})
+                raise ProviderError("; ".join(f"{name}: {error} (cooling down)"
+                                              for name, error in skipped.items()))
+
+        result = fan_out(providers, self.session, query, self.max_results,
+                         self._provider_executor, self.rate_limiter)
+        annotate(providers={**result.outcomes, **{name: "cooldown" for name in skipped}})
+        if self.rate_limiter is not None:
+            annotate(rate_limit_wait=result.rate_limit_wait)
+        if self.cache is not None:
+            for provider in providers:
+                error = result.failures.get(provider.name)
+                seconds = host_cooldown(error) if error is not None else None
+                if seconds is not None:
+                    self.cache.block_host(host_of(provider.base_url),
+                                          f"{type(error).__name__}: {error}", seconds)
+        if result.errors and not result.records:
+            raise ProviderError("; ".join(result.errors))
+        return result.records
+
+    def parse_results(self, html: str) -> List[Dict[str, str]]:
+        """Extract title/snippet records from a Scholar results page"""
+        return ScholarProvider(self.base_url).parse(html, self.max_results)
+
+    def scrape_web(self, query: str) -> Union[List[Dict[str, str]], str]:
+        """
+        Scrape web for research papers based on the query
+        """
+        # The query goes to the providers as given (quoted phrases matter to
+        # Scholar); the cache normalises only its own keys
+        with measure(SCRAPE, "scholar", query=query) as call:
+            if self.cache is not None:
+                cached = self.cache.get(query)
+                if cached is not None:
+                    call.update(cache_hit=True, error=isinstance(cached, str) or None)
+                    if isinstance(cached, str):
+                        record_tool_error(cached)
+                    record_papers(query, cached)
+                    return cached
+
+            if self.paper_index is not None:
+                local = self.paper_index.lookup(query, self.max_results)
+                if local is not None:
+                    call.update(local_hit=True, results=len(local))
+                    if self.cache is not None:
+                        self.cache.set(query, local)
+                    record_papers(query, local)
+                    return local
+
+            try:
+                results = self.fetch(query)
+            except Exception as e:
+                call["error"] = type(e).__name__
+                error = f"Error scraping web: {str(e)}"
+                if self.cache is not None:
+                    self.cache.set_failure(query, error)
+                record_tool_error(error)
+                return error
+
+            call["results"] = len(results)
+            if self.cache is not None:
+                self.cache.set(query, results)
+            if self.paper_index is not None:
+                self.paper_index.add(results, keywords=query)
+            record_papers(query, results)
+            return results
+
+    async def ascrape_web(self, query: str) -> Union[List[Dict[str, str]], str]:
+        """Async variant of scrape_web running on the tool's I/O pool"""
+        loop = asyncio.get_running_loop()
+        # run_in_executor does not carry context variables (metrics, stage) over
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self._executor, context.run, self.scrape_web, query)
+
+    async def ascrape_many(self, queries: Iterable[str]) -> Union[List[Dict[str, str]], str]:
+        """Search several queries in parallel and merge the results"""
+        queries = list(queries)
+        batches = await asyncio.gather(*(self.ascrape_web(q) for q in queries))
+        return merge_results(queries, batches)
+
+    def scrape_many(self, query: Union[str, Iterable[str]]) -> Union[List[Dict[str, str]], str]:
+        """
+        Scrape web for several queries at once (separate queries with ';')
+        """
+        queries = split_queries(query) if isinstance(query, str) else list(query)
+        if not queries:
+            return "Error scraping web: no query given"
+        return asyncio.run(self.ascrape_many(queries))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+        self._provider_executor.shutdown(wait=False)
+        self.session.close()
+
+
+def merge_results(
+    queries: List[str],
+    batches: List[Union[List[Dict[str, str]], str]],
+) -> Union[List[Dict[str, str]], str]:
+    """Merge per-query results, dropping duplicate papers (same DOI or title).
+
+    Failed queries are skipped as long as at least one query succeeded.
+    """
+    merger = ResultMerger()
+    errors = []
+    for query, batch in zip(queries, batches):
+        if isinstance(batch, str):
+            errors.append(f"{query}: {batch}")
+            continue
+        merger.add(batch, query=query)
+
+    if errors and not merger.records:
+        return "Error scraping web: " + "; ".join(errors)
+    return merger.records
@@ -0,0 +1,11 @@
+import os
+import sys
+
+# The modules live in src/ and import each other by bare name
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+# CrewAI's telemetry would reach out to the network
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+# A script (run directly), not a pytest module: its test_import helper takes arguments
+collect_ignore = ["test_dependencies.py"]
@@ -0,0 +1,36 @@
+import pytest
+
+import analysis_cli
+from analysis_events import RESULT
+from analysis_result import AnalysisResult
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+
+    def fake_events(*args):
+        calls.append(args)
+        yield {"type": RESULT, "result": AnalysisResult(summary="done").to_dict()}
+
+    monkeypatch.setattr(analysis_cli, "local_events", fake_events)
+    monkeypatch.setattr(analysis_cli, "remote_events", fake_events)
+    return calls
+
+
+def test_keyword_mode_reaches_in_process_runs(calls):
+    assert analysis_cli.main(["Build an app", "--keyword-mode", "local"]) == 0
+    assert calls == [("Build an app", "sequential", False, "local")]
+
+
+def test_keyword_mode_reaches_the_server(calls):
+    argv = ["Build an app", "--server", "http://127.0.0.1:1", "--keyword-mode", "auto"]
+    assert analysis_cli.main(argv) == 0
+    assert calls == [("http://127.0.0.1:1", "Build an app", "sequential", 900.0, "auto")]
+
+
+def test_keyword_mode_defaults_to_the_environment(calls):
+    analysis_cli.main(["Build an app"])
+    assert calls[0][-1] is None
+    with pytest.raises(SystemExit):
+        analysis_cli.main(["Build an app", "--keyword-mode", "fast"])
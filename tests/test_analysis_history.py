@@ -0,0 +1,99 @@
+import os
+import time
+
+import pytest
+from sqlalchemy import create_engine
+
+from analysis_history import AnalysisHistory, analyses_table, match_expression, metadata
+from analysis_result import AnalysisResult, Paper
+
+ANALYSES = [
+    ("Energy management for smart homes with solar panels",
+     ["energy management", "smart homes"], "Optimization of household energy use."),
+    ("Federated learning for hospital imaging",
+     ["federated learning", "medical imaging"], "Privacy preserving training across sites."),
+    ("Monitoring pipeline for factory sensors",
+     ["monitoring", "anomaly detection"], "Streaming anomaly detection on sensor data."),
+]
+
+
+def result(run_id, keywords, summary, created_at, papers=()):
+    return AnalysisResult(run_id=run_id, keywords=keywords, summary=summary, created_at=created_at,
+                          papers=[Paper(title=title) for title in papers])
+
+
+@pytest.fixture
+def history(tmp_path):
+    history = AnalysisHistory(path=str(tmp_path / "history.db"))
+    for i, (description, keywords, summary) in enumerate(ANALYSES):
+        history.add(description, result(f"run{i}", keywords, summary, 1000.0 + i))
+    return history
+
+
+def descriptions(page):
+    return [entry.description for entry in page.entries]
+
+
+def test_match_expression_quotes_words_and_prefixes_the_last():
+    assert match_expression('smart "home') == '"smart" "home"*'
+    assert match_expression("  ...  ") == ""
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("managem", ANALYSES[0][0]),
+    ("optimiz", ANALYSES[0][0]),
+    ("federa", ANALYSES[1][0]),
+    ("federated learni", ANALYSES[1][0]),
+    ("monitori", ANALYSES[2][0]),
+    ("sm", ANALYSES[0][0]),
+])
+def test_partial_words_match_as_prefixes(history, query, expected):
+    page = history.page(query=query)
+    assert descriptions(page) == [expected]
+    assert page.total == 1
+
+
+def test_listing_is_newest_first_and_paged(history):
+    page = history.page(limit=2)
+    assert descriptions(page) == [ANALYSES[2][0], ANALYSES[1][0]]
+    assert page.total == 3 and page.has_more
+    assert descriptions(history.page(offset=2, limit=2)) == [ANALYSES[0][0]]
+
+
+def test_search_ranks_by_relevance_not_age(history):
+    history.add("Anomaly detection", result("run-a", ["anomaly detection"],
+                                            "Anomaly detection and anomaly scoring for anomaly alerts.",
+                                            900.0, papers=["Anomaly detection survey"]))
+    page = history.page(query="anomaly")
+    assert descriptions(page) == ["Anomaly detection", ANALYSES[2][0]]
+
+
+def test_index_built_with_other_options_is_rebuilt(tmp_path):
+    path = str(tmp_path / "history.db")
+    engine = create_engine(f"sqlite:///{path}")
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE VIRTUAL TABLE analyses_fts USING fts5(description, keywords, summary, papers, "
+            "content='', tokenize='porter unicode61')"
+        )
+        conn.execute(analyses_table.insert().values(
+            run_id="old", description_hash="h", description=ANALYSES[0][0], mode="sequential",
+            created_at=time.time(), keywords=", ".join(ANALYSES[0][1]),
+            result=result("old", ANALYSES[0][1], ANALYSES[0][2], 1.0).to_json(),
+        ))
+    engine.dispose()
+
+    history = AnalysisHistory(path=path)
+    assert descriptions(history.page(query="managem")) == [ANALYSES[0][0]]
+    assert descriptions(history.page(query="optimiz")) == [ANALYSES[0][0]]
+
+
+def test_bypassed_history_stores_nothing_and_creates_no_file(tmp_path):
+    path = tmp_path / "history.db"
+    history = AnalysisHistory(path=str(path), enabled=False)
+    history.add(ANALYSES[0][0], result("run0", [], "", 1.0))
+    assert history.page().entries == [] and history.page(query="energy").total == 0
+    assert history.find(ANALYSES[0][0]) == [] and history.get("run0") is None
+    assert len(history) == 0
+    assert not os.path.exists(path)
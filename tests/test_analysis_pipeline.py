@@ -0,0 +1,111 @@
+import threading
+
+import pytest
+
+import analysis_pipeline
+from analysis_pipeline import AnalysisPipeline, PoolTimeout
+
+
+@pytest.fixture(autouse=True)
+def no_crew_tasks(monkeypatch):
+    monkeypatch.setattr(analysis_pipeline, "build_task_templates", lambda agents: {"agents": agents})
+
+
+def counting_factory():
+    built = []
+
+    def factory():
+        built.append({"id": len(built)})
+        return built[-1]
+
+    return factory, built
+
+
+def test_sets_are_built_lazily_and_reused():
+    factory, built = counting_factory()
+    pipeline = AnalysisPipeline(size=2, agents_factory=factory)
+    for _ in range(3):
+        with pipeline.agent_set() as agent_set:
+            assert agent_set.templates == {"agents": agent_set.agents}
+    assert len(built) == 1
+    assert pipeline.stats()["created"] == 1
+
+
+def test_prewarm_builds_the_whole_pool_once():
+    factory, built = counting_factory()
+    pipeline = AnalysisPipeline(size=3, agents_factory=factory).prewarm().prewarm()
+    assert len(built) == 3
+    with pipeline.agent_set() as first, pipeline.agent_set() as second:
+        assert first.agents is not second.agents
+
+
+def test_checkout_waits_for_a_free_set_and_times_out():
+    factory, _ = counting_factory()
+    pipeline = AnalysisPipeline(size=1, agents_factory=factory)
+    with pipeline.agent_set() as held:
+        with pytest.raises(PoolTimeout):
+            with pipeline.agent_set(timeout=0.01):
+                pass
+
+        got = []
+
+        def wait():
+            with pipeline.agent_set(timeout=5) as agent_set:
+                got.append(agent_set)
+
+        waiter = threading.Thread(target=wait)
+        waiter.start()
+        waiter.join(0.05)
+        assert waiter.is_alive()
+        assert pipeline.stats()["waiting"] == 1
+    waiter.join(5)
+    assert got[0] is held
+
+
+def test_failed_build_frees_its_slot():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("no API key")
+        return {}
+
+    pipeline = AnalysisPipeline(size=1, agents_factory=factory)
+    with pytest.raises(RuntimeError):
+        with pipeline.agent_set():
+            pass
+    with pipeline.agent_set():
+        pass
+    assert pipeline.stats()["created"] == 1
+
+
+def test_stats_count_runs_occupancy_and_waits():
+    factory, _ = counting_factory()
+    pipeline = AnalysisPipeline(size=2, agents_factory=factory)
+    with pipeline.agent_set():
+        assert pipeline.stats()["in_use"] == 1
+    with pipeline.agent_set():
+        pass
+
+    stats = pipeline.stats()
+    assert (stats["size"], stats["in_use"], stats["waiting"], stats["runs"]) == (2, 0, 0, 2)
+    assert 0.0 <= stats["utilisation"] <= 1.0
+    waits = stats["queue_wait_seconds"]
+    assert 0.0 <= waits["p50"] <= waits["p95"] <= waits["max"]
+
+
+def test_analyze_passes_the_checked_out_set(monkeypatch):
+    seen = {}
+
+    def fake_analyze(description, agents, task_templates, **kwargs):
+        seen.update(description=description, agents=agents, kwargs=kwargs)
+        return "report"
+
+    monkeypatch.setattr(analysis_pipeline, "analyze_project", fake_analyze)
+    factory, built = counting_factory()
+    pipeline = AnalysisPipeline(size=1, agents_factory=factory)
+    assert pipeline.analyze("Build an app", mode="parallel") == "report"
+    assert seen == {"description": "Build an app", "agents": built[0],
+                    "kwargs": {"mode": "parallel"}}
+    assert pipeline.stats()["runs"] == 1
@@ -0,0 +1,66 @@
+from analysis_result import AnalysisResult, Paper, StageInfo, extract_gaps
+
+RECORD = {
+    "title": "Federated learning for medical imaging",
+    "snippet": "Privacy preserving training across hospitals",
+    "query": "federated learning",
+    "url": "https://example.org/papers/1",
+    "doi": "10.1000/xyz123",
+    "source": "crossref",
+}
+
+
+def test_paper_keeps_its_link_doi_and_source_through_storage():
+    result = AnalysisResult(papers=[Paper(**RECORD)])
+    stored = AnalysisResult.from_stored(result.to_json())
+    assert stored.papers[0].model_dump() == RECORD
+
+
+def test_paper_link_fields_are_optional():
+    paper = Paper(title="Untitled draft")
+    assert (paper.url, paper.doi, paper.source) == (None, None, None)
+    assert AnalysisResult(papers=[paper]).to_dict()["papers"] == [{"title": "Untitled draft"}]
+
+
+def test_fingerprint_ignores_run_metadata_but_not_findings():
+    first = AnalysisResult(run_id="a", created_at=1.0, keywords=["privacy", "ml"],
+                           stages={"research": StageInfo(seconds=3.0)})
+    second = AnalysisResult(run_id="b", created_at=2.0, keywords=["privacy", "ml"])
+    assert first.fingerprint() == second.fingerprint()
+    assert first.fingerprint() == AnalysisResult.from_json(first.to_json()).fingerprint()
+    assert first.fingerprint() != AnalysisResult(keywords=["ml", "privacy"]).fingerprint()
+
+
+def test_diff_reports_list_items_added_and_removed_and_changed_text():
+    old = AnalysisResult(run_id="a", keywords=["privacy", "ml"], summary="Old summary",
+                         papers=[Paper(title="Kept"), Paper(title="Dropped")])
+    new = AnalysisResult(run_id="b", keywords=["privacy", "edge ai"], summary="New summary",
+                         papers=[Paper(title="Kept"), Paper(title="Found")])
+    assert new.diff(old) == {
+        "keywords": {"added": ["edge ai"], "removed": ["ml"]},
+        "papers": {"added": [Paper(title="Found").model_dump()],
+                   "removed": [Paper(title="Dropped").model_dump()]},
+        "summary": {"old": "Old summary", "new": "New summary"},
+    }
+    assert new.diff(new.model_copy(update={"run_id": "c"})) == {}
+
+
+def test_extract_gaps_takes_a_gap_section_and_gap_items_elsewhere():
+    validation = """Covered requirements:
+- Secure login with OAuth
+- Data export is missing from the design
+
+Gaps identified:
+1. No offline mode
+2) **Accessibility** review
+- No offline mode
+
+Recommendations:
+- Add caching
+"""
+    assert extract_gaps(validation) == [
+        "Data export is missing from the design",
+        "No offline mode",
+        "Accessibility review",
+    ]
+    assert extract_gaps("Everything is covered.") == []
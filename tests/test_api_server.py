@@ -0,0 +1,123 @@
+import asyncio
+import http.client
+import json
+import threading
+
+import pytest
+
+from analysis_events import ERROR, RESULT, STEP, AnalysisEvent
+from analysis_result import AnalysisResult
+from api_server import AnalysisServer
+
+
+class FakePipeline:
+    """Analyses that wait on release, emitting a step event first"""
+
+    def __init__(self, error=None):
+        self.release = threading.Event()
+        self.started = threading.Semaphore(0)
+        self.error = error
+
+    def analyze(self, description, mode="sequential", on_event=None, verbose=None,
+                keyword_mode=None):
+        if on_event is not None:
+            on_event(AnalysisEvent(type=STEP, text="searching"))
+        self.started.release()
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return AnalysisResult(summary=description, mode=mode)
+
+    def stats(self):
+        return {}
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(pipeline, **options):
+        server = AnalysisServer(port=0, **options)
+        server.pipeline = pipeline
+        loop = asyncio.new_event_loop()
+        threading.Thread(target=loop.run_forever, daemon=True).start()
+        asyncio.run_coroutine_threadsafe(server.start(), loop).result(5)
+        servers.append((server, loop, pipeline))
+        return server
+
+    yield start
+    for server, loop, pipeline in servers:
+        pipeline.release.set()
+        asyncio.run_coroutine_threadsafe(server.close(), loop).result(5)
+        loop.call_soon_threadsafe(loop.stop)
+
+
+def post(server, description, path="/analyze"):
+    connection = http.client.HTTPConnection("127.0.0.1", server.port, timeout=10)
+    connection.request("POST", path, json.dumps({"description": description}),
+                       {"Content-Type": "application/json"})
+    return connection.getresponse()
+
+
+def in_background(call, *args):
+    box = {}
+    thread = threading.Thread(target=lambda: box.setdefault("value", call(*args)))
+    thread.start()
+    return thread, box
+
+
+def test_result_is_returned_as_json(serve):
+    pipeline = FakePipeline()
+    pipeline.release.set()
+    response = post(serve(pipeline), "a project")
+    assert response.status == 200
+    assert json.loads(response.read())["summary"] == "a project"
+
+
+def test_busy_server_answers_429_with_retry_after(serve):
+    pipeline = FakePipeline()
+    server = serve(pipeline, concurrency=1)
+    thread, first = in_background(post, server, "first")
+    assert pipeline.started.acquire(timeout=5)
+
+    response = post(server, "second")
+    assert response.status == 429
+    assert int(response.getheader("Retry-After")) >= 1
+    assert "busy" in json.loads(response.read())["error"]
+
+    pipeline.release.set()
+    thread.join(5)
+    assert first["value"].status == 200
+
+
+def test_slow_analysis_gets_504(serve):
+    pipeline = FakePipeline()
+    response = post(serve(pipeline, analysis_timeout=0.2), "slow")
+    assert response.status == 504
+    assert json.loads(response.read())["error"] == "Analysis timed out"
+
+
+def read_stream(response):
+    assert response.getheader("Content-Type") == "application/x-ndjson"
+    return [json.loads(line) for line in response.read().decode("utf-8").splitlines()]
+
+
+def test_stream_ends_with_a_result_event(serve):
+    pipeline = FakePipeline()
+    pipeline.release.set()
+    events = read_stream(post(serve(pipeline), "streamed", "/analyze?stream=1"))
+    assert [event["type"] for event in events] == [STEP, RESULT]
+    assert events[-1]["result"]["summary"] == "streamed"
+
+
+def test_stream_ends_with_an_error_event_when_the_analysis_fails(serve):
+    pipeline = FakePipeline(error=RuntimeError("model unavailable"))
+    pipeline.release.set()
+    events = read_stream(post(serve(pipeline), "failing", "/analyze?stream=1"))
+    assert events[-1] == {"type": ERROR, "text": "model unavailable"}
+
+
+def test_stream_ends_with_an_error_event_on_timeout(serve):
+    pipeline = FakePipeline()
+    events = read_stream(post(serve(pipeline, analysis_timeout=0.2), "slow", "/analyze?stream=1"))
+    assert events[-1] == {"type": ERROR, "text": "Analysis timed out"}
@@ -0,0 +1,109 @@
+import json
+import threading
+import time
+
+import pytest
+
+import batch_analysis
+from analysis_result import AnalysisResult
+from batch_analysis import analyze_batch
+
+
+class FakeMetrics:
+    def summary(self):
+        return {}
+
+
+class FakePipeline:
+    """Stands in for AnalysisPipeline; later records finish first"""
+
+    analyzed = []
+
+    def __init__(self, size, agents_factory=None):
+        self.lock = threading.Lock()
+
+    def analyze(self, description, return_metrics=False, verbose=None, keyword_mode=None):
+        number = int(description.split()[-1])
+        time.sleep(0.002 * (number % 4))
+        if "broken" in description:
+            raise RuntimeError("model unavailable")
+        with self.lock:
+            FakePipeline.analyzed.append(description)
+        return AnalysisResult(summary=description), FakeMetrics()
+
+    def stats(self):
+        return {}
+
+
+@pytest.fixture(autouse=True)
+def fake_pipeline(monkeypatch):
+    FakePipeline.analyzed = []
+    monkeypatch.setattr(batch_analysis, "AnalysisPipeline", FakePipeline)
+
+
+def write_input(path, count, broken=()):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(1, count + 1):
+            word = "broken" if i in broken else "project"
+            f.write(json.dumps({"id": f"r{i}", "description": f"{word} {i}"}) + "\n")
+
+
+def read_output(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_results_and_failures_are_checkpointed(tmp_path):
+    write_input(tmp_path / "in.jsonl", 6, broken={4})
+    counts = analyze_batch(str(tmp_path / "in.jsonl"), str(tmp_path / "out.jsonl"),
+                           max_workers=2, requests_per_minute=None)
+    records = {record["id"]: record for record in read_output(tmp_path / "out.jsonl")}
+    assert (counts["processed"], counts["failed"], counts["skipped"]) == (6, 1, 0)
+    assert records["r4"]["status"] == "error" and records["r4"]["error"] == "model unavailable"
+    assert records["r1"]["result"]["summary"] == "project 1"
+
+
+def test_resume_skips_finished_records_and_retries_failed_ones(tmp_path):
+    write_input(tmp_path / "in.jsonl", 5)
+    with open(tmp_path / "out.jsonl", "w", encoding="utf-8") as f:
+        f.write(json.dumps({"id": "r1", "status": "ok"}) + "\n")
+        f.write(json.dumps({"id": "r2", "status": "error", "error": "x"}) + "\n")
+        f.write(json.dumps({"id": "r3", "status": "ok"}) + "\n")
+        f.write('{"id": "r4", "sta')  # cut off when the previous run was killed
+
+    counts = analyze_batch(str(tmp_path / "in.jsonl"), str(tmp_path / "out.jsonl"),
+                           max_workers=2, requests_per_minute=None)
+    assert counts["skipped"] == 2 and counts["processed"] == 3
+    assert sorted(FakePipeline.analyzed) == ["project 2", "project 4", "project 5"]
+    assert batch_analysis.load_completed_ids(str(tmp_path / "out.jsonl")) == {
+        "r1", "r2", "r3", "r4", "r5"}
+
+
+def test_no_resume_starts_over(tmp_path):
+    write_input(tmp_path / "in.jsonl", 2)
+    with open(tmp_path / "out.jsonl", "w", encoding="utf-8") as f:
+        f.write(json.dumps({"id": "r1", "status": "ok"}) + "\n")
+    counts = analyze_batch(str(tmp_path / "in.jsonl"), str(tmp_path / "out.jsonl"),
+                           max_workers=1, requests_per_minute=None, resume=False)
+    assert counts["skipped"] == 0
+    assert [record["id"] for record in read_output(tmp_path / "out.jsonl")] == ["r1", "r2"]
+
+
+def test_in_flight_window_stays_bounded(tmp_path, monkeypatch):
+    read, collected, lag = [], [], []
+    records = batch_analysis.read_records
+
+    def tracked(*args):
+        for record in records(*args):
+            read.append(record["id"])
+            lag.append(len(read) - len(collected))
+            yield record
+
+    monkeypatch.setattr(batch_analysis, "read_records", tracked)
+    write_input(tmp_path / "in.jsonl", 40)
+    analyze_batch(str(tmp_path / "in.jsonl"), str(tmp_path / "out.jsonl"), max_workers=2,
+                  requests_per_minute=None, on_result=collected.append)
+
+    assert len(collected) == 40
+    # At most 2 x workers submitted and unfinished, plus the record just read
+    assert max(lag) <= 2 * 2 + 1
@@ -0,0 +1,65 @@
+from context_budget import (
+    ResearchNotes,
+    build_context,
+    collecting,
+    compress,
+    record_papers,
+)
+from instrumentation import estimate_tokens
+
+FINDINGS = (
+    "The weather was pleasant during the study. "
+    "Federated learning keeps patient data inside each hospital. "
+    "Our team met weekly to discuss progress. "
+    "Differential privacy bounds what federated learning updates reveal. "
+    "Federated learning keeps patient data inside each hospital!"
+)
+
+
+def test_compress_within_budget_only_drops_duplicates():
+    compressed = compress(FINDINGS, 1000)
+    assert compressed.count("keeps patient data") == 1
+    assert compressed.startswith("The weather was pleasant")
+
+
+def test_compress_keeps_sentences_on_the_terms_in_original_order():
+    compressed = compress(FINDINGS, 35, terms=["federated learning", "privacy"])
+    assert compressed == (
+        "Federated learning keeps patient data inside each hospital. "
+        "Differential privacy bounds what federated learning updates reveal."
+    )
+    assert estimate_tokens(compressed) <= 35
+
+
+def test_compress_cuts_a_single_sentence_longer_than_the_budget():
+    sentence = "word " * 200
+    compressed = compress(sentence.strip() + ".", 10)
+    assert compressed.endswith("…")
+    assert estimate_tokens(compressed) <= 11
+
+
+def test_build_context_fits_the_budget_and_lists_keywords_and_papers():
+    notes = ResearchNotes()
+    notes.set_keywords(["federated learning", "privacy"])
+    with collecting(notes):
+        record_papers("federated learning", [
+            {"title": f"Paper {i}", "snippet": "A study of federated learning " * 5}
+            for i in range(50)
+        ])
+        record_papers("privacy", [{"title": "paper 0", "snippet": "duplicate title"}])
+        context = build_context("Thought: searching\n" + " ".join([FINDINGS] * 20), 300)
+
+    assert estimate_tokens(context) <= 300
+    assert context.startswith("Keywords: federated learning, privacy")
+    assert "Papers found (50 unique):" in context
+    assert "Thought:" not in context
+    assert "\n\nFindings:\n" in context
+    assert context.count("keeps patient data") == 1
+
+
+def test_build_context_without_papers_leaves_them_out():
+    notes = ResearchNotes()
+    record = {"title": "Paper", "snippet": "snippet"}
+    notes.add_papers("query", [record])
+    context = build_context("Some finding.", 200, notes=notes, include_papers=False)
+    assert context == "Findings:\nSome finding."
@@ -0,0 +1,109 @@
+import threading
+import time
+
+import pytest
+
+from dag_runner import DagRunner, Stage
+
+
+def sleeper(seconds, output):
+    def run(inputs):
+        time.sleep(seconds)
+        return output
+    return run
+
+
+def test_dependencies_run_first_and_receive_outputs():
+    order = []
+    lock = threading.Lock()
+
+    def stage(name, output):
+        def run(inputs):
+            with lock:
+                order.append(name)
+            return f"{output}({','.join(sorted(inputs.values()))})"
+        return run
+
+    result = DagRunner([
+        Stage("c", stage("c", "C"), depends_on=["a", "b"]),
+        Stage("a", stage("a", "A")),
+        Stage("b", stage("b", "B"), depends_on=["a"]),
+    ]).run()
+
+    assert order == ["a", "b", "c"]
+    assert result.outputs == {"a": "A()", "b": "B(A())", "c": "C(A(),B(A()))"}
+
+
+def test_independent_stages_run_concurrently():
+    barrier = threading.Barrier(2, timeout=2)
+
+    def meet(inputs):
+        barrier.wait()
+        return "met"
+
+    result = DagRunner([Stage("x", meet), Stage("y", meet)], max_workers=2).run()
+    assert result.outputs == {"x": "met", "y": "met"}
+
+
+def test_expand_runs_children_and_reduces_in_declared_order():
+    def expand(inputs):
+        return [Stage(f"part[{i}]", sleeper(0.03 * (3 - i), f"p{i}")) for i in range(3)]
+
+    result = DagRunner([
+        Stage("plan", lambda inputs: "plan"),
+        Stage("parts", expand=expand, depends_on=["plan"], reduce="+".join),
+        Stage("after", lambda inputs: inputs["parts"].upper(), depends_on=["parts"]),
+    ]).run()
+
+    assert result.outputs["parts"] == "p0+p1+p2"
+    assert result.outputs["after"] == "P0+P1+P2"
+    assert result.timings["part[0]"].depends_on == ["plan"]
+
+
+def test_failure_propagates_and_downstream_stages_do_not_run():
+    ran = []
+
+    def fail(inputs):
+        raise RuntimeError("boom")
+
+    runner = DagRunner([
+        Stage("ok", lambda inputs: "ok"),
+        Stage("bad", fail, depends_on=["ok"]),
+        Stage("downstream", lambda inputs: ran.append("downstream"), depends_on=["bad"]),
+    ])
+    with pytest.raises(RuntimeError, match="boom"):
+        runner.run()
+    assert ran == []
+
+
+def test_critical_path_follows_the_slowest_chain():
+    result = DagRunner([
+        Stage("start", sleeper(0.01, "s")),
+        Stage("slow", sleeper(0.15, "slow"), depends_on=["start"]),
+        Stage("fast", sleeper(0.01, "fast"), depends_on=["start"]),
+        Stage("end", sleeper(0.01, "e"), depends_on=["slow", "fast"]),
+    ]).run()
+
+    assert result.critical_path == ["start", "slow", "end"]
+    assert result.timings["slow"].on_critical_path
+    assert not result.timings["fast"].on_critical_path
+    assert result.wall_seconds < result.stage_seconds
+
+
+@pytest.mark.parametrize("stages, message", [
+    ([Stage("a", lambda i: ""), Stage("a", lambda i: "")], "Duplicate"),
+    ([Stage("a", lambda i: "", depends_on=["missing"])], "unknown"),
+    ([Stage("a")], "exactly one"),
+])
+def test_invalid_graphs_are_rejected(stages, message):
+    with pytest.raises(ValueError, match=message):
+        DagRunner(stages)
+
+
+def test_dependency_cycle_is_reported():
+    runner = DagRunner([
+        Stage("a", lambda i: "", depends_on=["b"]),
+        Stage("b", lambda i: "", depends_on=["a"]),
+    ])
+    with pytest.raises(ValueError, match="cycle"):
+        runner.run()
@@ -38,6 +38,7 @@ def main():
         ("bs4", "BeautifulSoup4"),
         ("sqlalchemy", "SQLAlchemy"),
         ("pydantic", "Pydantic"),
+        ("numpy", "NumPy"),
     ]
     
     core_results = []
@@ -72,6 +73,39 @@ def main():
         print(f"❌ Project Analysis Crew - FAILED: {e}")
         custom_result = False
     
+    custom_tests = [
+        ("llm_cache", "LLM Response Cache"),
+        ("rate_limit", "Rate Limiting"),
+        ("batch_analysis", "Batch Analysis"),
+        ("web_scraper", "Web Scraper"),
+        ("scholar_stub_server", "Scholar Stub Server"),
+        ("scrape_cache", "Scrape Cache"),
+        ("dag_runner", "DAG Runner"),
+        ("analysis_events", "Analysis Events"),
+        ("job_queue", "Job Queue"),
+        ("instrumentation", "Instrumentation"),
+        ("llm_retry", "LLM Retry Policy"),
+        ("fake_gemini", "Fake Gemini Model"),
+        ("benchmark", "Benchmark"),
+        ("context_budget", "Context Budgeting"),
+        ("analysis_result", "Analysis Result"),
+        ("similarity_index", "Similarity Index"),
+        ("paper_index", "Paper Index"),
+        ("stage_memo", "Stage Memo"),
+        ("run_logging", "Run Logging"),
+        ("model_router", "Model Router"),
+        ("keyword_extraction", "Keyword Extraction"),
+        ("analysis_history", "Analysis History"),
+        ("analysis_pipeline", "Analysis Pipeline"),
+        ("api_server", "API Server"),
+        ("analysis_cli", "Analysis CLI"),
+        ("research_providers", "Research Providers"),
+        ("scholar_parser", "Scholar Parser"),
+    ]
+    
+    for module, description in custom_tests:
+        custom_result = test_import(module, description) and custom_result
+    
     # Summary
     print("\n" + "=" * 40)
     print("📊 Test Summary:")
@@ -0,0 +1,58 @@
+import threading
+
+import job_queue
+from analysis_events import STEP, AnalysisEvent
+from analysis_result import AnalysisResult
+from job_queue import DONE, JobQueue
+
+
+class FakePipeline:
+    def analyze(self, description, mode="sequential", on_event=None):
+        for i in range(50):
+            on_event(AnalysisEvent(type=STEP, text=f"{description} step {i}"))
+        return AnalysisResult(summary=description)
+
+
+def make_queue(tmp_path, workers=4):
+    queue = JobQueue(path=str(tmp_path / "jobs.db"), max_workers=workers)
+    queue.pipeline = FakePipeline()
+    return queue
+
+
+def test_job_events_and_result(tmp_path):
+    queue = make_queue(tmp_path)
+    try:
+        job_id = queue.submit("project")
+        assert queue.wait(job_id, timeout=10)["status"] == DONE
+        assert queue.result(job_id).summary == "project"
+        assert [event.text for event in queue.events(job_id)][-1] == "project step 49"
+        assert queue.submit("project") != job_id  # finished jobs are not deduplicated
+    finally:
+        queue.shutdown()
+
+
+def test_concurrent_submissions_keep_buffers_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_queue, "MAX_TRACKED_JOBS", 3)
+    queue = make_queue(tmp_path)
+    job_ids, errors = [], []
+
+    def submit(n):
+        try:
+            for i in range(10):
+                job_ids.append(queue.submit(f"project {n}-{i}"))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=submit, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    try:
+        statuses = [queue.wait(job_id, timeout=10)["status"] for job_id in job_ids]
+    finally:
+        queue.shutdown()
+
+    assert errors == []
+    assert statuses == [DONE] * 40
+    assert len(queue._events) <= 3
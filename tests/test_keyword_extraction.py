@@ -0,0 +1,98 @@
+import pytest
+
+import project_analysis_crew_fixed as crew
+from keyword_extraction import (
+    AUTO_MODE,
+    LLM_MODE,
+    LOCAL_MODE,
+    KeywordCorpus,
+    candidate_phrases,
+    extract_keywords,
+    keyword_mode,
+)
+
+SPECIFIC = """
+Develop an AI-powered energy management system for smart homes that can:
+1. Monitor and analyze real-time energy consumption patterns
+2. Predict energy usage based on historical data and weather conditions
+3. Automatically optimize energy distribution across different home systems
+4. Provide personalized recommendations for energy savings
+5. Integrate with existing smart home devices and solar panel systems
+"""
+VAGUE = "I want an app that does cool stuff with data and helps people."
+OTHERS = [
+    "A federated learning platform that trains diagnostic models across hospitals",
+    "Track solar panel output and forecast battery storage for smart grids",
+]
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    corpus = KeywordCorpus(path=str(tmp_path / "corpus.db"))
+    for description in [SPECIFIC, VAGUE] + OTHERS:
+        corpus.add(description)
+    return corpus
+
+
+def test_phrases_drop_leading_verbs_and_single_characters():
+    assert candidate_phrases("Monitor patient vital signs; build a C compiler") == [
+        ["patient", "vital", "signs"], ["compiler"],
+    ]
+
+
+def test_ranking_is_deterministic(corpus):
+    first = extract_keywords(SPECIFIC, corpus)
+    assert first.keywords[:2] == ["ai-powered energy management", "real-time energy consumption"]
+    assert not any(keyword.split()[0] in ("monitor", "analyze", "predict", "optimize")
+                   for keyword in first.keywords)
+    for _ in range(3):
+        assert extract_keywords(SPECIFIC, corpus) == first
+    reopened = KeywordCorpus(path=corpus.path)
+    assert extract_keywords(SPECIFIC, reopened) == first
+
+
+def test_confidence_falls_on_vague_text_and_unseen_vocabulary(tmp_path, corpus):
+    assert extract_keywords(SPECIFIC, corpus).confidence == 1.0
+    assert extract_keywords(VAGUE, corpus).confidence == 0.0
+    # Without a corpus the IDF weights say nothing about the words
+    assert extract_keywords(SPECIFIC).confidence == 0.0
+    empty = KeywordCorpus(path=str(tmp_path / "empty.db"))
+    assert extract_keywords(SPECIFIC, empty).confidence == 0.0
+
+
+@pytest.fixture
+def stages(monkeypatch, corpus):
+    monkeypatch.setitem(crew._registry, "keyword_corpus", corpus)
+    monkeypatch.setenv("KEYWORD_MIN_CONFIDENCE", "0.5")
+    finished = []
+    monkeypatch.setattr(crew, "_begin_stage", lambda stage: None)
+    monkeypatch.setattr(crew, "_end_stage", lambda stage, output, **attributes:
+                        finished.append((stage, attributes["source"])))
+    return finished
+
+
+def test_auto_falls_back_to_the_agent_on_a_vague_description(stages):
+    assert crew.local_keywords(VAGUE, AUTO_MODE) is None
+    assert stages == []
+    assert crew.local_keywords(VAGUE, LOCAL_MODE) == "app, people, data"
+    assert crew.local_keywords(SPECIFIC, AUTO_MODE).startswith("ai-powered energy management")
+    assert stages == [("keywords", "local"), ("keywords", "local")]
+    assert crew.local_keywords(SPECIFIC, LLM_MODE) is None
+
+
+@pytest.mark.parametrize("value, expected", [
+    (None, LLM_MODE), ("", LLM_MODE), ("local", LOCAL_MODE), (" Auto ", AUTO_MODE),
+])
+def test_keyword_mode_comes_from_the_environment(monkeypatch, value, expected):
+    if value is None:
+        monkeypatch.delenv("KEYWORD_MODE", raising=False)
+    else:
+        monkeypatch.setenv("KEYWORD_MODE", value)
+    assert keyword_mode() == expected
+    assert keyword_mode(LOCAL_MODE) == LOCAL_MODE
+
+
+def test_unknown_keyword_mode_is_rejected(monkeypatch):
+    monkeypatch.setenv("KEYWORD_MODE", "fast")
+    with pytest.raises(ValueError, match="fast"):
+        keyword_mode()
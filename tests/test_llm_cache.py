@@ -0,0 +1,91 @@
+import pytest
+
+import llm_cache
+from llm_cache import ResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(llm_cache, "time", clock)
+    return clock
+
+
+def make_cache(tmp_path, **options):
+    return ResponseCache(path=str(tmp_path / "llm.db"), **options)
+
+
+def test_key_covers_model_temperature_prompt_and_stop():
+    key = ResponseCache.make_key("model", 0.7, "prompt", ["\nObservation"])
+    assert key == ResponseCache.make_key("model", 0.7, "prompt", ["\nObservation"])
+    assert key != ResponseCache.make_key("other", 0.7, "prompt", ["\nObservation"])
+    assert key != ResponseCache.make_key("model", 0.2, "prompt", ["\nObservation"])
+    assert key != ResponseCache.make_key("model", 0.7, "prompt")
+
+
+def test_hits_and_misses_are_counted(tmp_path, clock):
+    cache = make_cache(tmp_path)
+    assert cache.get("model", 0.7, "prompt") is None
+    cache.set("model", 0.7, "prompt", "answer")
+    assert cache.get("model", 0.7, "prompt") == "answer"
+    assert cache.get("model", 0.7, "prompt") == "answer"
+    assert cache.stats == {"hits": 2, "misses": 1, "hit_rate": 2 / 3, "entries": 1}
+
+
+def test_entries_expire_after_the_ttl(tmp_path, clock):
+    cache = make_cache(tmp_path, ttl_seconds=60)
+    cache.set("model", 0.7, "prompt", "answer")
+    clock.now += 59
+    assert cache.get("model", 0.7, "prompt") == "answer"
+    clock.now += 2
+    assert cache.get("model", 0.7, "prompt") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entries_are_evicted_first(tmp_path, clock):
+    cache = make_cache(tmp_path, max_entries=2)
+    cache.set("model", 0.7, "a", "A")
+    clock.now += 1
+    cache.set("model", 0.7, "b", "B")
+    clock.now += 1
+    assert cache.get("model", 0.7, "a") == "A"  # a is now more recent than b
+    clock.now += 1
+    cache.set("model", 0.7, "c", "C")
+
+    assert len(cache) == 2
+    assert cache.get("model", 0.7, "b") is None
+    assert cache.get("model", 0.7, "a") == "A"
+    assert cache.get("model", 0.7, "c") == "C"
+
+
+def test_bypass_never_reads_or_writes(tmp_path):
+    make_cache(tmp_path).set("model", 0.7, "prompt", "stored earlier")
+    bypassed = make_cache(tmp_path, enabled=False)
+    assert bypassed.engine is None
+    assert bypassed.get("model", 0.7, "prompt") is None
+    bypassed.set("model", 0.7, "other", "answer")
+    assert bypassed.stats == {"hits": 0, "misses": 0, "hit_rate": 0.0, "entries": 0}
+    assert make_cache(tmp_path).get("model", 0.7, "other") is None
+
+
+def test_bypassed_cache_creates_no_database(tmp_path):
+    path = tmp_path / "cache" / "llm.db"
+    ResponseCache(path=str(path), enabled=False).set("model", 0.7, "prompt", "answer")
+    assert not path.parent.exists()
+
+
+def test_from_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "env.db"))
+    monkeypatch.setenv("LLM_CACHE_TTL", "30")
+    monkeypatch.setenv("LLM_CACHE_MAX_ENTRIES", "5")
+    monkeypatch.setenv("LLM_CACHE_BYPASS", "true")
+    cache = ResponseCache.from_env()
+    assert (cache.ttl_seconds, cache.max_entries, cache.enabled) == (30.0, 5, False)
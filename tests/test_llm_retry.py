@@ -0,0 +1,242 @@
+import asyncio
+import random
+import threading
+
+import pytest
+from google.api_core import exceptions as api_exceptions
+
+import llm_retry
+from llm_retry import (
+    CircuitBreaker, CircuitOpenError, LatencyTracker, LLMError, RetryPolicy, acall_with_retries,
+    call_with_retries, hedged, is_retryable
+)
+
+
+class FakeClock:
+    """Stands in for the time module inside llm_retry: sleeping advances the clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(llm_retry, "time", clock)
+    return clock
+
+
+def scripted(*outcomes):
+    """A call returning or raising each outcome in turn"""
+    outcomes = list(outcomes)
+    calls = []
+
+    def call():
+        calls.append(len(calls))
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    call.calls = calls
+    return call
+
+
+def policy(**options):
+    return RetryPolicy(rng=random.Random(7), **options)
+
+
+@pytest.mark.parametrize("error, retryable", [
+    (api_exceptions.ResourceExhausted("quota"), True),
+    (api_exceptions.ServiceUnavailable("down"), True),
+    (api_exceptions.DeadlineExceeded("slow"), True),
+    (TimeoutError(), True),
+    (api_exceptions.InvalidArgument("bad"), False),
+    (api_exceptions.PermissionDenied("no"), False),
+    (ValueError("bug"), False),
+])
+def test_error_classification(error, retryable):
+    assert is_retryable(error) is retryable
+
+
+def test_backoff_is_jittered_exponential_and_capped():
+    retry_policy = policy(base_delay=1.0, max_delay=4.0)
+    for retry, ceiling in [(1, 1.0), (2, 2.0), (3, 4.0), (6, 4.0)]:
+        delays = [retry_policy.backoff(retry) for _ in range(200)]
+        assert all(0 <= delay <= ceiling for delay in delays)
+        assert max(delays) > ceiling / 2
+
+
+def test_retryable_errors_are_retried_until_success(clock):
+    call = scripted(api_exceptions.ServiceUnavailable("down"), TimeoutError(), "ok")
+    retries = []
+    result = call_with_retries(call, policy(max_attempts=4),
+                               on_retry=lambda n, error, delay: retries.append((n, type(error))))
+    assert result == "ok"
+    assert retries == [(1, api_exceptions.ServiceUnavailable), (2, TimeoutError)]
+    assert len(clock.sleeps) == 2
+
+
+def test_fatal_error_raises_at_once(clock):
+    call = scripted(api_exceptions.InvalidArgument("bad prompt"), "never")
+    with pytest.raises(LLMError) as raised:
+        call_with_retries(call, policy())
+    assert raised.value.retryable is False
+    assert raised.value.attempts == 1
+    assert isinstance(raised.value.__cause__, api_exceptions.InvalidArgument)
+    assert clock.sleeps == []
+
+
+def test_gives_up_after_max_attempts(clock):
+    call = scripted(*[api_exceptions.ServiceUnavailable("down")] * 3)
+    with pytest.raises(LLMError) as raised:
+        call_with_retries(call, policy(max_attempts=3))
+    assert raised.value.retryable is True
+    assert raised.value.attempts == 3
+    assert len(call.calls) == 3
+
+
+def test_no_retry_starts_past_the_deadline(clock):
+    def slow_failure():
+        clock.now += 4.0
+        raise api_exceptions.ServiceUnavailable("down")
+
+    with pytest.raises(LLMError) as raised:
+        call_with_retries(slow_failure, policy(max_attempts=10, base_delay=0.1, deadline=10.0))
+    # The third attempt starts at ~8s and ends past the deadline: no fourth
+    assert raised.value.attempts == 3
+
+
+def test_breaker_opens_after_consecutive_failures_and_fails_fast(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30.0)
+    with pytest.raises(LLMError):
+        call_with_retries(scripted(*[api_exceptions.ServiceUnavailable("down")] * 2),
+                          policy(max_attempts=2), breaker=breaker)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    call = scripted("ok")
+    with pytest.raises(CircuitOpenError):
+        call_with_retries(call, policy(), breaker=breaker)
+    assert call.calls == []
+
+
+def test_breaker_half_open_lets_one_trial_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+
+    clock.now += 30.0
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # only one trial at a time
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now += 30.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow() and breaker.allow()
+
+
+def test_fatal_errors_do_not_count_against_the_breaker(clock):
+    breaker = CircuitBreaker(failure_threshold=1)
+    with pytest.raises(LLMError):
+        call_with_retries(scripted(api_exceptions.InvalidArgument("bad")), policy(), breaker=breaker)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_latency_tracker_threshold_needs_enough_samples():
+    tracker = LatencyTracker(window=100, min_samples=10, quantile=0.9)
+    for i in range(9):
+        tracker.observe(i / 10)
+    assert tracker.threshold() is None
+    tracker.observe(0.9)
+    assert tracker.threshold() == 0.9
+
+
+def test_hedged_races_a_duplicate_after_the_threshold():
+    release = threading.Event()
+    calls = []
+
+    def call():
+        calls.append(None)
+        if len(calls) == 1:
+            release.wait(2)  # the first request stalls
+            return "slow"
+        return "fast"
+
+    try:
+        assert hedged(call, after=0.05) == "fast"
+        assert len(calls) == 2
+    finally:
+        release.set()
+
+
+def test_hedged_does_not_duplicate_fast_calls():
+    calls = []
+    assert hedged(lambda: calls.append(None) or "done", after=1.0) == "done"
+    assert len(calls) == 1
+
+
+def test_call_with_retries_hedges_once_latency_is_known():
+    tracker = LatencyTracker(min_samples=1)
+    tracker.observe(0.02)
+    release = threading.Event()
+    calls = []
+
+    def call():
+        calls.append(None)
+        if len(calls) == 1:
+            release.wait(2)
+        return len(calls)
+
+    try:
+        assert call_with_retries(call, policy(), latency=tracker) == 2
+    finally:
+        release.set()
+
+
+def test_async_retries():
+    outcomes = [api_exceptions.ServiceUnavailable("down")]
+
+    async def call():
+        if outcomes:
+            raise outcomes.pop()
+        await asyncio.sleep(0)
+        return "ok"
+
+    assert asyncio.run(acall_with_retries(call, policy(base_delay=0.01))) == "ok"
+
+
+def test_async_hedging_cancels_the_loser():
+    tracker = LatencyTracker(min_samples=1)
+    tracker.observe(0.02)
+    started, cancelled = [], []
+
+    async def call():
+        started.append(None)
+        if len(started) == 1:
+            try:
+                await asyncio.sleep(2)
+            except asyncio.CancelledError:
+                cancelled.append(None)
+                raise
+            return "slow"
+        return "fast"
+
+    async def run():
+        result = await acall_with_retries(call, policy(), latency=tracker)
+        await asyncio.sleep(0)  # let the cancellation land
+        return result
+
+    assert asyncio.run(run()) == "fast"
+    assert cancelled == [None]
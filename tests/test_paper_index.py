@@ -0,0 +1,86 @@
+import sqlite3
+
+import pytest
+
+from paper_index import PaperIndex
+
+PAPERS = [
+    {"title": "Federated learning for medical imaging",
+     "snippet": "Privacy preserving federated training of medical imaging models across hospitals"},
+    {"title": "Federated optimisation at scale",
+     "snippet": "Communication efficient federated optimisation for mobile devices"},
+    {"title": "Medical image segmentation with deep networks",
+     "snippet": "Convolutional networks for imaging tasks in radiology"},
+    {"title": "A survey of recommender systems",
+     "snippet": "Collaborative filtering and matrix factorisation for recommendation"},
+]
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = PaperIndex(path=str(tmp_path / "papers.db"))
+    assert index.add(PAPERS, keywords="seed") == len(PAPERS)
+    return index
+
+
+def titles(results):
+    return [result["title"] for result in results]
+
+
+def test_add_skips_papers_already_indexed(index):
+    duplicate = dict(PAPERS[0], title="  FEDERATED learning for medical imaging ")
+    assert index.add([duplicate, {"title": ""}]) == 0
+    assert len(index) == len(PAPERS)
+
+
+def test_bm25_ranks_papers_matching_more_query_terms_first(index):
+    results = index.search("federated medical imaging")
+    assert titles(match.record for match in results)[0] == "Federated learning for medical imaging"
+    assert "A survey of recommender systems" not in titles(match.record for match in results)
+    scores = [match.score for match in results]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_rare_terms_outweigh_common_ones(index):
+    # "optimisation" is in one paper, "federated" in two: the rarer term decides
+    assert index.search("federated optimisation")[0].record["title"] == "Federated optimisation at scale"
+
+
+def test_lookup_needs_limit_papers_covering_every_term(index):
+    assert index.lookup("federated", limit=2) is not None
+    # Only one paper has all three terms, so this goes to the network
+    assert index.lookup("federated medical imaging", limit=2) is None
+    assert (index.hits, index.misses) == (1, 1)
+
+
+def test_lower_coverage_threshold_accepts_partial_matches(index):
+    partial = PaperIndex(path=index.path, min_coverage=0.5)
+    results = partial.lookup("federated medical imaging", limit=2)
+    assert results is not None
+    assert titles(results)[0] == "Federated learning for medical imaging"
+
+
+def test_bypass_never_answers_locally(index):
+    bypassed = PaperIndex(path=index.path, enabled=False)
+    assert bypassed.lookup("federated", limit=1) is None
+    assert bypassed.add(PAPERS) == 0
+
+
+def test_lookup_returns_stored_link_fields_without_scores(tmp_path):
+    index = PaperIndex(path=str(tmp_path / "papers.db"))
+    record = {"title": "Graph neural networks", "snippet": "Message passing on graphs",
+              "url": "https://example.org/gnn", "doi": "10.1000/gnn", "source": "arxiv"}
+    index.add([record])
+    assert index.lookup("graph neural networks", limit=1) == [record]
+    assert index.search("graph", limit=1)[0].record == record
+
+
+def test_databases_without_doi_and_source_columns_are_upgraded(tmp_path):
+    path = tmp_path / "papers.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE papers (id INTEGER PRIMARY KEY, key VARCHAR(512) NOT NULL "
+                     "UNIQUE, title TEXT NOT NULL, snippet TEXT NOT NULL, url TEXT, "
+                     "keywords TEXT, length INTEGER NOT NULL, added_at FLOAT NOT NULL)")
+    index = PaperIndex(path=str(path))
+    index.add([{"title": "Graph neural networks", "snippet": "", "doi": "10.1000/gnn"}])
+    assert index.lookup("graph", limit=1)[0]["doi"] == "10.1000/gnn"
@@ -0,0 +1,28 @@
+import time
+
+import pytest
+
+from rate_limit import RequestsPerMinuteLimiter, TokenBucket
+
+
+def test_requests_beyond_the_budget_wait_for_the_window():
+    limiter = RequestsPerMinuteLimiter(3, window_seconds=0.2)
+    started = time.monotonic()
+    waits = [limiter.acquire() for _ in range(4)]
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3] > 0.1
+    assert time.monotonic() - started >= 0.15
+
+
+def test_token_bucket_allows_a_burst_then_refills():
+    bucket = TokenBucket(rate=50, capacity=2)
+    assert bucket.try_acquire() and bucket.try_acquire()
+    assert not bucket.try_acquire()
+    time.sleep(0.05)
+    assert bucket.try_acquire()
+
+
+@pytest.mark.parametrize("make", [lambda: RequestsPerMinuteLimiter(0), lambda: TokenBucket(0, 1)])
+def test_invalid_budgets_are_rejected(make):
+    with pytest.raises(ValueError):
+        make()
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+from google.api_core import exceptions as api_exceptions
+
+from fake_gemini import FakeResponse
+from llm_retry import LLMError
+from model_router import ModelRouter, Route
+from project_analysis_crew_fixed import RoutedLLM
+
+
+class FlakyStreamModel:
+    """Streams "first " then "rest"; fails the first `failures` calls outright,
+    and breaks every stream after its first chunk when break_midway is set"""
+
+    def __init__(self, failures=0, break_midway=False):
+        self.failures = failures
+        self.break_midway = break_midway
+        self.calls = 0
+
+    def _chunks(self):
+        yield FakeResponse("first ")
+        if self.break_midway:
+            raise api_exceptions.ServiceUnavailable("connection reset mid-stream")
+        yield FakeResponse("rest")
+
+    def generate_content(self, prompt, generation_config=None, stream=False):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise api_exceptions.ServiceUnavailable("overloaded")
+        return self._chunks()
+
+    async def generate_content_async(self, prompt, generation_config=None, stream=False):
+        chunks = self.generate_content(prompt, generation_config, stream)
+
+        async def achunks():
+            for chunk in chunks:
+                yield chunk
+        return achunks()
+
+
+def routed(model):
+    router = ModelRouter(routes={"researcher": Route(("primary-model", "fallback-model"), temperature=0.7)})
+    return RoutedLLM(role="researcher", router=router, llm_options={
+        "model": model, "streaming": True, "response_cache": None, "hedge": False,
+    })
+
+
+def test_stream_failing_before_the_first_chunk_falls_back():
+    model = FlakyStreamModel(failures=2)
+    assert "".join(chunk.text for chunk in routed(model)._stream("prompt")) == "first rest"
+    assert model.calls == 3
+
+
+def test_stream_failing_after_the_first_chunk_raises_llm_error():
+    chunks = routed(FlakyStreamModel(break_midway=True))._stream("prompt")
+    assert next(chunks).text == "first "
+    with pytest.raises(LLMError) as raised:
+        next(chunks)
+    assert raised.value.retryable is True
+    assert isinstance(raised.value.__cause__, api_exceptions.ServiceUnavailable)
+
+
+def test_async_stream_failing_after_the_first_chunk_raises_llm_error():
+    async def consume():
+        return [chunk.text async for chunk in routed(FlakyStreamModel(break_midway=True))._astream("prompt")]
+
+    with pytest.raises(LLMError) as raised:
+        asyncio.run(consume())
+    assert isinstance(raised.value.__cause__, api_exceptions.ServiceUnavailable)
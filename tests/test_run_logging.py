@@ -0,0 +1,96 @@
+import io
+import json
+import logging
+import queue
+
+import pytest
+
+import run_logging
+from run_logging import (
+    LOGGER_NAME,
+    BufferedQueueHandler,
+    JsonFormatter,
+    LogWriter,
+    configure_logging,
+    shutdown_logging,
+)
+
+
+@pytest.fixture(autouse=True)
+def stop_logging():
+    yield
+    shutdown_logging()
+
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_shutdown_writes_everything_queued_and_stops_the_writer(tmp_path):
+    path = tmp_path / "run.log"
+    handler = configure_logging(level="INFO", fmt="json", path=str(path))
+    writer = run_logging._active[1]
+    logger = logging.getLogger(LOGGER_NAME)
+    for i in range(1000):
+        logger.info("step %d", i, extra={"step": i})
+
+    shutdown_logging()
+
+    lines = read_lines(path)
+    assert [line["step"] for line in lines] == list(range(1000))
+    assert lines[0]["message"] == "step 0"
+    assert not writer._thread.is_alive()
+    assert handler not in logger.handlers
+    assert run_logging._active is None
+    shutdown_logging()  # a second call is a no-op
+
+
+def test_reconfiguring_flushes_and_closes_the_previous_file(tmp_path):
+    first, second = tmp_path / "first.log", tmp_path / "second.log"
+    configure_logging(level="INFO", path=str(first))
+    owned = run_logging._active[2]
+    logging.getLogger(LOGGER_NAME).info("before")
+
+    configure_logging(level="INFO", path=str(second))
+    logging.getLogger(LOGGER_NAME).info("after")
+    shutdown_logging()
+
+    assert owned.closed
+    assert [line["message"] for line in read_lines(first)] == ["before"]
+    assert [line["message"] for line in read_lines(second)] == ["after"]
+
+
+def test_full_buffer_drops_records_instead_of_blocking():
+    handler = BufferedQueueHandler(capacity=2)
+    logger = logging.getLogger(f"{LOGGER_NAME}.test_buffer")
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        for i in range(5):
+            logger.warning("record %d", i)
+    finally:
+        logger.removeHandler(handler)
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+
+
+def test_writer_flushes_once_per_batch():
+    class CountingStream(io.StringIO):
+        flushes = 0
+
+        def flush(self):
+            self.flushes += 1
+            super().flush()
+
+    records = queue.Queue()
+    for i in range(10):
+        records.put(logging.makeLogRecord({"name": LOGGER_NAME, "msg": f"line {i}",
+                                           "levelname": "INFO"}))
+    stream = CountingStream()
+    writer = LogWriter(records, stream, JsonFormatter(), batch_size=4).start()
+    writer.stop()
+
+    assert [json.loads(line)["message"] for line in stream.getvalue().splitlines()] == \
+        [f"line {i}" for i in range(10)]
+    assert stream.flushes == 3
@@ -0,0 +1,41 @@
+import os
+
+import pytest
+
+from scholar_parser import available_backends, parse_bs4, parse_results, parse_stream
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "scholar_results.html")
+RESULT_OPENING = 'class="gs_ri"'
+
+
+@pytest.fixture(scope="module")
+def page():
+    with open(FIXTURE, encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("backend", available_backends())
+@pytest.mark.parametrize("limit", [1, 5, 100])
+def test_every_backend_returns_the_reference_records(page, backend, limit):
+    expected = parse_bs4(page, limit)
+    assert len(expected) == min(limit, page.count(RESULT_OPENING))
+    assert parse_results(page, limit, backend) == expected
+
+
+def test_stream_parser_stops_reading_once_limit_results_are_found(page):
+    chunks = [page[i:i + 512] for i in range(0, len(page), 512)]
+    consumed = []
+
+    def feed():
+        for chunk in chunks:
+            consumed.append(chunk)
+            yield chunk
+
+    results = parse_stream(feed(), limit=3)
+
+    assert results == parse_bs4(page, 3)
+    read = "".join(consumed)
+    # Reading stops in the chunk that closes the third result
+    assert read.count(RESULT_OPENING) <= 4
+    assert len(consumed) < len(chunks)
+    assert page.startswith(read)
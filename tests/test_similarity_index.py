@@ -0,0 +1,54 @@
+import time
+
+from sqlalchemy import update
+
+from similarity_index import SimilarityIndex, descriptions_table, description_id
+
+BASE = ("A federated learning platform for hospitals that trains diagnostic models on "
+        "medical images without moving patient data between sites, with secure "
+        "aggregation and differential privacy guarantees for every training round")
+EDITED = BASE + " and an audit log"
+
+
+def make_index(tmp_path, **options):
+    return SimilarityIndex(path=str(tmp_path / "similar.db"), threshold=0.5, **options)
+
+
+def expire(index, description):
+    with index.engine.begin() as conn:
+        conn.execute(
+            update(descriptions_table)
+            .where(descriptions_table.c.id == description_id(description))
+            .values(created_at=time.time() - 2 * index.ttl_seconds)
+        )
+
+
+def test_small_edit_matches_the_earlier_description(tmp_path):
+    index = make_index(tmp_path)
+    index.add(BASE, "federated learning", "research notes", [{"title": "Paper"}])
+    match = index.find(EDITED)
+    assert match is not None and match.entry_id == description_id(BASE)
+    assert 0.5 <= match.similarity < 1.0
+    assert match.papers == [{"title": "Paper"}]
+    assert index.find("A recipe recommendation app for home cooks") is None
+
+
+def test_expired_best_match_falls_through_to_the_next_candidate(tmp_path):
+    index = make_index(tmp_path, ttl_seconds=3600)
+    index.add(BASE, "base keywords", "base research", [])
+    index.add(EDITED, "edited keywords", "edited research", [])
+    expire(index, BASE)
+
+    match = index.find(BASE)
+    assert match is not None
+    assert match.entry_id == description_id(EDITED)
+    assert match.keywords == "edited keywords"
+
+    expire(index, EDITED)
+    assert index.find(BASE) is None
+
+
+def test_bypass_disables_lookups(tmp_path):
+    index = make_index(tmp_path, enabled=False)
+    index.add(BASE, "k", "r", [])
+    assert index.find(BASE) is None
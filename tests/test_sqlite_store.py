@@ -0,0 +1,64 @@
+import time
+
+import pytest
+from sqlalchemy import Column, Float, MetaData, String, Table, select
+
+from sqlite_store import SQLiteStore, env_flag, evict, is_expired
+
+metadata = MetaData()
+rows_table = Table(
+    "rows",
+    metadata,
+    Column("key", String, primary_key=True),
+    Column("created_at", Float, nullable=False),
+    Column("last_used", Float, nullable=False),
+)
+
+
+class RowStore(SQLiteStore):
+    metadata = metadata
+    pragmas = ("journal_mode=WAL",)
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("1", True), ("true", True), ("YES", True), ("0", False), ("", False), ("no", False),
+])
+def test_env_flag(monkeypatch, value, expected):
+    monkeypatch.setenv("STORE_TEST_BYPASS", value)
+    assert env_flag("STORE_TEST_BYPASS") is expected
+
+
+def test_disabled_store_opens_nothing(tmp_path):
+    store = RowStore(str(tmp_path / "nested" / "rows.db"), enabled=False)
+    assert store.engine is None
+    assert not (tmp_path / "nested").exists()
+
+
+def test_enabled_store_creates_tables_and_applies_pragmas(tmp_path):
+    store = RowStore(str(tmp_path / "nested" / "rows.db"))
+    with store.engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.execute(select(rows_table)).all() == []
+
+
+def test_evict_drops_expired_then_least_recently_used(tmp_path):
+    store = RowStore(str(tmp_path / "rows.db"))
+    now = time.time()
+    with store.engine.begin() as conn:
+        conn.execute(rows_table.insert(), [
+            {"key": "expired", "created_at": now - 100, "last_used": now},
+            {"key": "old", "created_at": now, "last_used": now - 3},
+            {"key": "older", "created_at": now, "last_used": now - 5},
+            {"key": "recent", "created_at": now, "last_used": now - 1},
+        ])
+        removed = evict(conn, rows_table, rows_table.c.key, rows_table.c.created_at,
+                        rows_table.c.last_used, now, ttl_seconds=50, max_entries=2)
+        kept = sorted(conn.execute(select(rows_table.c.key)).scalars())
+    assert removed == 2
+    assert kept == ["old", "recent"]
+
+
+def test_is_expired():
+    assert is_expired(10.0, 100.0, 50)
+    assert not is_expired(60.0, 100.0, 50)
+    assert not is_expired(0.0, 100.0, None)
@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy import select
+
+import project_analysis_crew_fixed as crew
+from analysis_history import AnalysisHistory
+from benchmark import OfflineEnvironment
+from keyword_extraction import KeywordCorpus
+from similarity_index import SimilarityIndex
+from stage_memo import StageMemo, stage_outputs_table
+
+DESCRIPTION = "A federated learning platform that trains diagnostic models across hospitals"
+
+
+@pytest.fixture
+def memo(tmp_path, monkeypatch):
+    memo = StageMemo(path=str(tmp_path / "memo.db"))
+    monkeypatch.setitem(crew._registry, "stage_memo", memo)
+    monkeypatch.setitem(crew._registry, "similarity_index",
+                        SimilarityIndex(path=str(tmp_path / "similar.db"), enabled=False))
+    monkeypatch.setitem(crew._registry, "keyword_corpus",
+                        KeywordCorpus(path=str(tmp_path / "corpus.db"), enabled=False))
+    monkeypatch.setitem(crew._registry, "analysis_history",
+                        AnalysisHistory(path=str(tmp_path / "history.db"), enabled=False))
+    return memo
+
+
+@pytest.fixture
+def offline():
+    environment = OfflineEnvironment(llm_latency=0, scrape_latency=0)
+    yield environment
+    environment.close()
+
+
+def memoised_stages(memo):
+    with memo.engine.connect() as conn:
+        return sorted(row.stage for row in conn.execute(select(stage_outputs_table.c.stage)))
+
+
+def test_stages_are_memoised_and_reused(memo, offline):
+    agents = offline.create_agents()
+    crew.analyze_project(DESCRIPTION, agents=agents, keyword_mode="llm")
+    assert memoised_stages(memo) == ["keywords", "research", "summary", "validation"]
+
+    result = crew.analyze_project(DESCRIPTION, agents=agents, keyword_mode="llm")
+    assert result.reused_stages == ["keywords", "research", "summary", "validation"]
+
+
+def test_stage_whose_search_failed_is_not_memoised(memo, offline):
+    offline.server.shutdown()
+    offline.server.server_close()  # every scrape now fails with a connection error
+    crew.analyze_project(DESCRIPTION, agents=offline.create_agents(), keyword_mode="llm")
+    assert "research" not in memoised_stages(memo)
+    assert "keywords" in memoised_stages(memo)
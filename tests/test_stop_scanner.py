@@ -0,0 +1,49 @@
+import pytest
+
+from project_analysis_crew_fixed import StopScanner
+
+
+def scan(chunks, stop):
+    scanner = StopScanner(stop)
+    emitted = []
+    for chunk in chunks:
+        emit, stopped = scanner.feed(chunk)
+        emitted.append(emit)
+        if stopped:
+            return "".join(emitted), True
+    return "".join(emitted) + scanner.flush(), False
+
+
+@pytest.mark.parametrize("chunks", [
+    ["Answer: 42\nObservation: done"],
+    ["Answer: 42\nObs", "ervation: done"],
+    ["Answer: 42\n", "O", "b", "s", "e", "r", "v", "a", "t", "i", "o", "n", ":"],
+    ["Answer: 42\nObservatio", "n: done"],
+])
+def test_stop_sequence_split_across_chunks(chunks):
+    assert scan(chunks, ["\nObservation"]) == ("Answer: 42", True)
+
+
+def test_earliest_of_several_stop_sequences_wins():
+    assert scan(["abc STOP de", "f END"], ["END", "STOP"]) == ("abc ", True)
+
+
+def test_possible_prefix_is_held_back_until_resolved():
+    scanner = StopScanner(["\nObservation"])
+    emit, stopped = scanner.feed("text\nObs")
+    assert not stopped
+    assert "\nObs" not in emit and "text\nObs".startswith(emit)
+    rest, stopped = scanner.feed("cure")  # not a stop sequence after all
+    assert not stopped
+    assert emit + rest + scanner.flush() == "text\nObscure"
+
+
+def test_flush_releases_the_held_tail():
+    assert scan(["ends with \nObserv"], ["\nObservation"]) == ("ends with \nObserv", False)
+
+
+def test_without_stop_sequences_text_passes_straight_through():
+    scanner = StopScanner(None)
+    assert scanner.feed("chunk one ") == ("chunk one ", False)
+    assert scanner.feed("two") == ("two", False)
+    assert scanner.flush() == ""
@@ -0,0 +1,93 @@
+import time
+
+import requests
+
+from research_providers import FixtureProvider
+from scrape_cache import ScrapeCache
+from web_scraper import WebScraperTool
+
+
+class RecordingProvider(FixtureProvider):
+    def __init__(self):
+        super().__init__(name="recording")
+        self.queries = []
+
+    def search(self, session, query, limit):
+        self.queries.append(query)
+        return super().search(session, query, limit)
+
+
+def test_query_is_sent_as_given_and_cached_under_normalised_key():
+    provider = RecordingProvider()
+    tool = WebScraperTool(providers=[provider], cache=ScrapeCache())
+    try:
+        first = tool.scrape_web('"Federated Learning"  privacy')
+        second = tool.scrape_web("federated learning privacy")
+    finally:
+        tool.close()
+
+    assert provider.queries == ['"Federated Learning"  privacy']
+    assert second == first
+
+
+class BlockedProvider(RecordingProvider):
+    def __init__(self, status=429, retry_after=None):
+        super().__init__()
+        self.status = status
+        self.retry_after = retry_after
+
+    def search(self, session, query, limit):
+        self.queries.append(query)
+        response = requests.Response()
+        response.status_code = self.status
+        if self.retry_after is not None:
+            response.headers["Retry-After"] = self.retry_after
+        raise requests.HTTPError(f"{self.status} from host", response=response)
+
+
+def test_rate_limited_host_cools_down_for_every_query(monkeypatch):
+    provider = BlockedProvider(retry_after="120")
+    cache = ScrapeCache(negative_ttl_seconds=60)
+    tool = WebScraperTool(providers=[provider], cache=cache)
+    try:
+        assert "429" in tool.scrape_web("graph neural networks")
+        assert "cooling down" in tool.scrape_web("protein folding")
+        assert provider.queries == ["graph neural networks"]
+        assert cache.stats["blocked_hosts"] == 1
+
+        # The cooldown follows Retry-After, past the negative TTL
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 90)
+        assert "cooling down" in tool.scrape_web("quantum error correction")
+        monkeypatch.setattr(time, "monotonic", lambda: now + 121)
+        tool.scrape_web("reinforcement learning")
+    finally:
+        tool.close()
+
+    assert provider.queries == ["graph neural networks", "reinforcement learning"]
+
+
+def test_healthy_provider_still_answers_while_another_host_cools_down():
+    blocked = BlockedProvider(status=403)
+    healthy = FixtureProvider(name="healthy")
+    tool = WebScraperTool(providers=[blocked, healthy], cache=ScrapeCache())
+    try:
+        first = tool.scrape_web("graph neural networks")
+        second = tool.scrape_web("protein folding")
+    finally:
+        tool.close()
+
+    assert first and second and not isinstance(second, str)
+    assert blocked.queries == ["graph neural networks"]
+
+
+def test_query_specific_failures_do_not_cool_down_the_host():
+    provider = BlockedProvider(status=404)
+    tool = WebScraperTool(providers=[provider], cache=ScrapeCache())
+    try:
+        tool.scrape_web("graph neural networks")
+        tool.scrape_web("protein folding")
+    finally:
+        tool.close()
+
+    assert provider.queries == ["graph neural networks", "protein folding"]